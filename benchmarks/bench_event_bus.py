@@ -0,0 +1,73 @@
+"""Measure EventBus emit throughput for varying subscriber counts and producers.
+
+Usage:
+    python benchmarks/bench_event_bus.py --producers 4 --seconds 1
+"""
+
+from __future__ import annotations
+
+import argparse
+import sys
+import threading
+import time
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).resolve().parents[1] / "src"))
+
+from mate.core.events import EventBus  # noqa: E402
+
+
+def _noop(payload) -> None:  # noqa: ARG001
+    pass
+
+
+def measure(subscribers: int, producers: int, seconds: float) -> float:
+    """Return aggregate emits per second across all producer threads."""
+    bus = EventBus()
+    for _ in range(subscribers):
+        # Distinct callables so the bus keeps every subscription.
+        bus.subscribe("bench.topic", lambda payload: _noop(payload))
+
+    counts = [0] * producers
+    start = threading.Barrier(producers + 1)
+    stop = threading.Event()
+
+    def produce(index: int) -> None:
+        emit = bus.emit
+        start.wait()
+        emitted = 0
+        while not stop.is_set():
+            for _ in range(1000):
+                emit("bench.topic", emitted)
+            emitted += 1000
+        counts[index] = emitted
+
+    threads = [threading.Thread(target=produce, args=(i,)) for i in range(producers)]
+    for thread in threads:
+        thread.start()
+    start.wait()
+    began = time.perf_counter()
+    time.sleep(seconds)
+    stop.set()
+    for thread in threads:
+        thread.join()
+    elapsed = time.perf_counter() - began
+    return sum(counts) / elapsed
+
+
+def main() -> int:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--producers", type=int, default=4)
+    parser.add_argument("--seconds", type=float, default=1.0)
+    args = parser.parse_args()
+
+    print(f"{'subscribers':>12} {'producers':>10} {'emits/s':>14}")
+    for subscribers in (1, 10, 100):
+        for producers in sorted({1, args.producers}):
+            rate = measure(subscribers, producers, args.seconds)
+            print(f"{subscribers:>12} {producers:>10} {rate:>14,.0f}")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,86 @@
+"""End-to-end input latency through the shared InputPipeline on the synthetic backend.
+
+Types prose with snippet triggers and hotkey chords mixed in, with snippets
+and hook-based hotkeys consuming the same pipeline. It reports
+capture-to-handled time per event and per chord, and key-to-expansion time
+for snippets (the injector is a no-op, so this is mate's own overhead).
+
+Usage:
+    python benchmarks/bench_input_pipeline.py --keys 50000
+"""
+
+from __future__ import annotations
+
+import argparse
+import random
+import string
+import sys
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).resolve().parents[1] / "src"))
+
+from mate.config import HotkeyBinding, HotkeySettings, SnippetSettings  # noqa: E402
+from mate.core.events import EventBus  # noqa: E402
+from mate.logging import set_log_levels  # noqa: E402
+from mate.services.hotkeys import HotkeyManager  # noqa: E402
+from mate.services.input_pipeline import InputPipeline, SyntheticBackend  # noqa: E402
+from mate.services.snippet_engine import SnippetEngine  # noqa: E402
+
+_TRIGGERS = ("::sig", "::addr", "//mate", ";date")
+_CHORDS = ("ctrl+shift+z", "ctrl+shift+b", "alt+x")
+
+
+class NullInjector:
+    name = "null"
+
+    def inject(self, erase: int, text: str) -> None:
+        pass
+
+
+def main() -> int:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--keys", type=int, default=50_000)
+    parser.add_argument("--seed", type=int, default=7)
+    args = parser.parse_args()
+
+    set_log_levels({}, context_level="WARNING")
+    rng = random.Random(args.seed)
+    backend = SyntheticBackend()
+    pipeline = InputPipeline(backend)
+    events = EventBus()
+    defaults = [{"trigger": t, "replacement": f"{t} expanded"} for t in _TRIGGERS]
+    settings = SnippetSettings(defaults=defaults, library=False, injection_grace_ms=0)
+    engine = SnippetEngine(settings, events, pipeline=pipeline)
+    engine.injection.injector = NullInjector()
+    bindings = [HotkeyBinding(name=c, shortcut=c, action="hide_window") for c in _CHORDS]
+    hotkeys = HotkeyManager(HotkeySettings(backend="hook", bindings=bindings), events, pipeline)
+    hotkeys.register_callback("hide_window", lambda binding: None)
+    engine.start()
+    hotkeys.start()
+
+    typed = 0
+    while typed < args.keys:
+        words = "".join(rng.choices(string.ascii_lowercase + "  ", k=rng.randint(40, 120)))
+        backend.type_text(words)
+        typed += len(words)
+        if rng.random() < 0.5:
+            backend.type_text(rng.choice(_TRIGGERS))
+            engine.join()  # keep expansions from overlapping the next keys
+        else:
+            backend.chord(rng.choice(_CHORDS))
+    hotkeys.stop()
+    engine.stop()
+    pipeline.stop()
+
+    p, e = pipeline.stats, engine.stats
+    print(f"events {p.events:,}: mean {p.mean_us:.1f} us, max {p.max_ns / 1000:.0f} us")
+    print(f"chords {p.chords:,}: mean {p.chord_mean_us:.1f} us, max {p.chord_max_ns / 1000:.0f} us")
+    print(
+        f"snippets {e.matches:,}: key -> expansion mean {e.expand_mean_ms * 1000:.0f} us, "
+        f"max {e.expand_max_ns / 1000:.0f} us (queue wait mean {e.wait_mean_ms * 1000:.0f} us)"
+    )
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
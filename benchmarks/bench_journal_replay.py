@@ -0,0 +1,45 @@
+"""Replay a recorded event journal segment into an EventBus and report throughput.
+
+Usage:
+    python benchmarks/bench_journal_replay.py ~/.mate/data/journal/events-000001.mjl --speed max
+"""
+
+from __future__ import annotations
+
+import argparse
+import sys
+import time
+from collections import Counter
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).resolve().parents[1] / "src"))
+
+from mate.core.events import EventBus  # noqa: E402
+from mate.core.journal import replay  # noqa: E402
+
+
+def main() -> int:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("segment", type=Path)
+    parser.add_argument(
+        "--speed", default="max", help="'max' for back-to-back, or a factor such as 1 or 10"
+    )
+    args = parser.parse_args()
+    speed = None if args.speed == "max" else float(args.speed)
+
+    bus = EventBus()
+    topics: Counter[str] = Counter()
+    bus.add_tap(lambda topic, payload: topics.update((topic,)))
+
+    began = time.perf_counter()
+    count = replay(bus, args.segment, speed=speed)
+    elapsed = time.perf_counter() - began
+
+    print(f"replayed {count} events in {elapsed:.3f}s ({count / elapsed:,.0f} events/s)")
+    for topic, hits in topics.most_common():
+        print(f"  {topic:<32} {hits:>8}")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,59 @@
+"""Compare cold (no snapshot) and warm (cached snapshot) settings load times.
+
+Each sample runs in a fresh interpreter so module imports are excluded from
+the measurement but process-level caches are not shared.
+
+Usage:
+    python benchmarks/bench_settings.py --runs 10
+"""
+
+from __future__ import annotations
+
+import argparse
+import os
+import statistics
+import subprocess
+import sys
+import tempfile
+from pathlib import Path
+
+SRC = Path(__file__).resolve().parents[1] / "src"
+
+_PROBE = """
+import time
+from mate.config import load_settings
+began = time.perf_counter()
+load_settings()
+print((time.perf_counter() - began) * 1000)
+"""
+
+
+def sample(home: Path) -> float:
+    env = {**os.environ, "MATE_HOME": str(home), "PYTHONPATH": str(SRC)}
+    output = subprocess.run(
+        [sys.executable, "-c", _PROBE], env=env, capture_output=True, text=True, check=True
+    )
+    return float(output.stdout.strip())
+
+
+def main() -> int:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--runs", type=int, default=10)
+    args = parser.parse_args()
+
+    with tempfile.TemporaryDirectory() as tmp:
+        home = Path(tmp) / "mate-home"
+        snapshot = home / "cache" / "settings.pickle"
+        cold = []
+        for _ in range(args.runs):
+            snapshot.unlink(missing_ok=True)
+            cold.append(sample(home))
+        warm = [sample(home) for _ in range(args.runs)]
+
+    for label, values in (("cold", cold), ("warm", warm)):
+        print(f"{label}: median {statistics.median(values):.2f} ms, min {min(values):.2f} ms")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,125 @@
+"""Replay synthetic keystrokes through the snippet hook and count per-key allocations.
+
+Compares ``SnippetEngine._handle_key`` (key ring + early reject) with the old
+string buffer, which rebuilt ``(buffer + char)[-max_buffer:]`` on every key.
+Each key is measured on its own under ``tracemalloc``: the traced peak is reset
+before the call, so anything allocated during the call shows up even if it is
+freed before returning. The overhead of the measurement itself is taken from a
+no-op handler and subtracted. The table reports how many keys allocated at all
+and the mean bytes they allocated, which is a lower bound because an allocation
+that reuses memory freed earlier in the same call does not raise the peak. The
+hook is not allocation-free: its ``perf_counter_ns()`` readings and the stats
+sums are new int objects on every key.
+
+Usage:
+    python benchmarks/bench_snippet_hook.py --keys 10000
+"""
+
+from __future__ import annotations
+
+import argparse
+import random
+import string
+import sys
+import time
+import tracemalloc
+from collections.abc import Callable
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).resolve().parents[1] / "src"))
+
+from mate.config import SnippetSettings  # noqa: E402
+from mate.core.events import EventBus  # noqa: E402
+from mate.services.input_pipeline import KeyEvent  # noqa: E402
+from mate.services.snippet_engine import SnippetEngine  # noqa: E402
+
+_TRIGGERS = ("::sig", "::addr", "//mate", ";date", ";todo")
+
+
+def make_keys(count: int, rng: random.Random) -> str:
+    """Prose with trigger prefixes that never complete, so no expansion is queued."""
+    words = string.ascii_lowercase + "     .,"
+    chunks: list[str] = []
+    size = 0
+    while size < count:
+        trigger = rng.choice(_TRIGGERS)
+        chunk = "".join(rng.choices(words, k=rng.randint(20, 80))) + trigger[:-1] + " "
+        chunks.append(chunk)
+        size += len(chunk)
+    return "".join(chunks)[:count]
+
+
+def legacy_handler(triggers: tuple[str, ...], max_buffer: int) -> Callable[[object], None]:
+    state = {"buffer": ""}
+
+    def handle(event) -> None:
+        buffer = (state["buffer"] + event.name)[-max_buffer:]
+        state["buffer"] = "" if any(buffer.endswith(t) for t in triggers) else buffer
+
+    return handle
+
+
+def _noop(event: object) -> None:
+    pass
+
+
+def _transient_bytes(handle: Callable[[object], None], events: list[KeyEvent]) -> list[int]:
+    """Peak traced bytes above the starting point, one entry per key."""
+    get_traced_memory = tracemalloc.get_traced_memory
+    reset_peak = tracemalloc.reset_peak
+    sizes = [0] * len(events)  # preallocated so storing results stays out of the count
+    tracemalloc.start()
+    for index, event in enumerate(events):
+        reset_peak()
+        base = get_traced_memory()[0]
+        handle(event)
+        sizes[index] = get_traced_memory()[1] - base
+    tracemalloc.stop()
+    return sizes
+
+
+def replay(handle: Callable[[object], None], events: list[KeyEvent]) -> tuple:
+    """Return (allocating keys, mean bytes allocated per key, ns per key) for one replay."""
+    for event in events:  # warm lazily built matcher transitions and caches
+        handle(event)
+    began = time.perf_counter_ns()
+    for event in events:
+        handle(event)
+    ns_per_key = (time.perf_counter_ns() - began) / len(events)
+
+    overhead = _transient_bytes(_noop, events)
+    sizes = _transient_bytes(handle, events)
+    allocated = [max(size - floor, 0) for size, floor in zip(sizes, overhead)]
+    allocating = sum(1 for size in allocated if size)
+    return allocating, sum(allocated) / len(events), ns_per_key
+
+
+def main() -> int:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--keys", type=int, default=10_000)
+    parser.add_argument("--max-buffer", type=int, default=120)
+    parser.add_argument("--seed", type=int, default=7)
+    args = parser.parse_args()
+
+    keys = make_keys(args.keys, random.Random(args.seed))
+    events = [KeyEvent(char, "down") for char in keys]
+    defaults = [{"trigger": t, "replacement": t.upper()} for t in _TRIGGERS]
+    settings = SnippetSettings(defaults=defaults, max_buffer=args.max_buffer, library=False)
+    engine = SnippetEngine(settings, EventBus())
+
+    print(f"{'handler':>8} {'allocating keys':>16} {'B/key':>8} {'ns/key':>8}")
+    for name, handle in (
+        ("ring", engine._handle_key),
+        ("legacy", legacy_handler(_TRIGGERS, args.max_buffer)),
+    ):
+        allocating, bytes_per_key, ns_per_key = replay(handle, events)
+        share = allocating / len(events)
+        print(f"{name:>8} {share:>16.1%} {bytes_per_key:>8.1f} {ns_per_key:>8,.0f}")
+    stats = engine.stats
+    print(f"{stats.rejected / stats.keys:.0%} of keys rejected early")
+    engine.stop()
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,58 @@
+"""Measure end-to-end expansion latency of each snippet injection strategy.
+
+Injects real input: focus a scratch text editor during the countdown. The
+``unicode`` strategy needs Windows.
+
+Usage:
+    python benchmarks/bench_snippet_injection.py --lengths 10 200 2000 --repeat 3
+"""
+
+from __future__ import annotations
+
+import argparse
+import sys
+import time
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).resolve().parents[1] / "src"))
+
+from mate.services.snippet_injection import (  # noqa: E402
+    ClipboardInjector,
+    InjectionRunner,
+    Injector,
+    TypingInjector,
+    UnicodeInjector,
+)
+
+
+def main() -> int:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--lengths", type=int, nargs="+", default=[10, 200, 2000])
+    parser.add_argument("--repeat", type=int, default=3)
+    parser.add_argument("--countdown", type=float, default=5.0)
+    parser.add_argument("--max-typing", type=int, default=500, help="skip typing above this")
+    args = parser.parse_args()
+
+    injectors: list[Injector] = [TypingInjector(), ClipboardInjector()]
+    if sys.platform == "win32":
+        injectors.insert(1, UnicodeInjector())
+    print(f"Focus a text editor; injecting in {args.countdown:.0f} s ...")
+    time.sleep(args.countdown)
+
+    print(f"{'strategy':>10} {'chars':>7} {'mean ms':>10} {'max ms':>10}")
+    for injector in injectors:
+        for length in args.lengths:
+            if injector.name == "typing" and length > args.max_typing:
+                continue
+            runner = InjectionRunner(injector)
+            text = ("lorem ipsum " * (length // 12 + 1))[:length]
+            for _ in range(args.repeat):
+                runner.inject(0, text)
+                injector.inject(length, "")  # erase it again, outside the stats
+            stats = runner.stats[injector.name]
+            print(f"{injector.name:>10} {length:>7} {stats.mean_ms:>10.1f} {stats.max_ms:>10.1f}")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
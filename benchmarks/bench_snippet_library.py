@@ -0,0 +1,73 @@
+"""Measure start-up cost of a large snippet library: trigger load and matcher build.
+
+Usage:
+    python benchmarks/bench_snippet_library.py --snippets 50000
+"""
+
+from __future__ import annotations
+
+import argparse
+import random
+import string
+import sys
+import tempfile
+import time
+import tracemalloc
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).resolve().parents[1] / "src"))
+
+from mate.data.snippets import SnippetRepository  # noqa: E402
+from mate.services.snippet_matcher import TriggerMatcher  # noqa: E402
+
+
+def build(repo: SnippetRepository) -> TriggerMatcher[int]:
+    matcher: TriggerMatcher[int] = TriggerMatcher()
+    for row in repo.triggers(""):
+        matcher.add(row.trigger, row.id)
+    return matcher
+
+
+def main() -> int:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--snippets", type=int, default=50_000)
+    parser.add_argument("--body-chars", type=int, default=800)
+    args = parser.parse_args()
+
+    rng = random.Random(3)
+    with tempfile.TemporaryDirectory() as tmp:
+        repo = SnippetRepository(Path(tmp) / "snippets.db")
+        rows = {
+            "::" + "".join(rng.choices(string.ascii_lowercase, k=8)): "x" * args.body_chars
+            for _ in range(args.snippets)
+        }
+        began = time.perf_counter()
+        repo.add_many((trigger, body, "") for trigger, body in rows.items())
+        print(f"import {len(rows):,} snippets: {time.perf_counter() - began:.2f} s")
+
+        began = time.perf_counter()
+        matcher = build(repo)
+        elapsed = time.perf_counter() - began
+        tracemalloc.start()
+        build(repo)
+        _current, peak = tracemalloc.get_traced_memory()
+        tracemalloc.stop()
+        print(
+            f"load triggers + build matcher: {elapsed * 1000:.0f} ms, "
+            f"peak {peak / 2**20:.1f} MiB"
+        )
+        print(f"matcher holds {len(matcher):,} triggers")
+        print(f"bodies left on disk: {len(rows) * args.body_chars / 2**20:.1f} MiB")
+
+        ids = [rng.randint(1, len(rows)) for _ in range(2_000)]
+        began = time.perf_counter()
+        for snippet_id in ids:
+            repo.body(snippet_id)
+        per_fetch = (time.perf_counter() - began) / len(ids) * 1e6
+        print(f"body fetch: {per_fetch:.0f} us (cache hits {repo.body_hits})")
+        repo.close()
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
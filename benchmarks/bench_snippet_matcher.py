@@ -0,0 +1,89 @@
+"""Compare per-keystroke matching cost of TriggerMatcher and the old endswith scan.
+
+Usage:
+    python benchmarks/bench_snippet_matcher.py --keys 200000
+"""
+
+from __future__ import annotations
+
+import argparse
+import random
+import string
+import sys
+import time
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).resolve().parents[1] / "src"))
+
+from mate.services.snippet_matcher import TriggerMatcher  # noqa: E402
+
+_ALPHABET = string.ascii_lowercase + " .,"
+_SIGILS = ("::", "//", ";")
+
+
+def make_triggers(count: int, rng: random.Random) -> list[str]:
+    """Sigil-prefixed triggers, like the shipped ``::sig`` and ``//mate``."""
+    triggers: set[str] = set()
+    while len(triggers) < count:
+        body = "".join(rng.choices(string.ascii_lowercase, k=rng.randint(2, 8)))
+        triggers.add(rng.choice(_SIGILS) + body)
+    return sorted(triggers)
+
+
+def make_keys(count: int, triggers: list[str], rng: random.Random) -> str:
+    """Prose-like text with a trigger typed roughly every 200 characters."""
+    chunks: list[str] = []
+    size = 0
+    while size < count:
+        chunk = "".join(rng.choices(_ALPHABET, k=200)) + rng.choice(triggers)
+        chunks.append(chunk)
+        size += len(chunk)
+    return "".join(chunks)[:count]
+
+
+def matcher_ns_per_key(triggers: list[str], keys: str) -> float:
+    matcher: TriggerMatcher[str] = TriggerMatcher()
+    for trigger in triggers:
+        matcher.add(trigger, trigger)
+    feed = matcher.feed
+    for char in keys:  # warm the lazily built transitions
+        if feed(char):
+            matcher.reset()
+    began = time.perf_counter_ns()
+    for char in keys:
+        if feed(char):
+            matcher.reset()
+    return (time.perf_counter_ns() - began) / len(keys)
+
+
+def scan_ns_per_key(triggers: list[str], keys: str, max_buffer: int = 120) -> float:
+    buffer = ""
+    began = time.perf_counter_ns()
+    for char in keys:
+        buffer = (buffer + char)[-max_buffer:]
+        if next((t for t in triggers if buffer.endswith(t)), None):
+            buffer = ""
+    return (time.perf_counter_ns() - began) / len(keys)
+
+
+def main() -> int:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--keys", type=int, default=200_000)
+    parser.add_argument("--seed", type=int, default=7)
+    args = parser.parse_args()
+
+    rng = random.Random(args.seed)
+    print(f"{'snippets':>10} {'matcher ns/key':>15} {'scan ns/key':>12}")
+    for count in (2, 100, 1_000, 10_000, 50_000):
+        triggers = make_triggers(count, rng)
+        keys = make_keys(args.keys, triggers, rng)
+        fast = matcher_ns_per_key(triggers, keys)
+        # The scan is linear in the snippet count; keep its sample affordable
+        sample = keys[: max(1_000, args.keys // max(1, count // 100))]
+        slow = scan_ns_per_key(triggers, sample)
+        print(f"{count:>10} {fast:>15,.0f} {slow:>12,.0f}")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,100 @@
+"""Measure how long a snippet pack edit takes to reach the live matcher.
+
+Builds a library of JSON packs, starts ``SnippetPackWatcher`` on it, then
+rewrites one pack at a time and polls until the engine sees the new
+replacement. A thread keeps typing through the hook meanwhile, so the worst
+hook time shows whether applying deltas ever stalls it.
+
+Usage:
+    python benchmarks/bench_snippet_packs.py --files 500 --per-file 20 --edits 20
+"""
+
+from __future__ import annotations
+
+import argparse
+import json
+import statistics
+import sys
+import tempfile
+import threading
+import time
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).resolve().parents[1] / "src"))
+
+from mate.config import SnippetSettings  # noqa: E402
+from mate.core.events import EventBus  # noqa: E402
+from mate.logging import set_log_levels  # noqa: E402
+from mate.services.input_pipeline import KeyEvent  # noqa: E402
+from mate.services.snippet_engine import SnippetEngine  # noqa: E402
+from mate.services.snippet_packs import SnippetPackWatcher  # noqa: E402
+
+
+def write_pack(path: Path, index: int, per_file: int, version: int) -> None:
+    snippets = {f";p{index}s{n}": f"pack {index} snippet {n} v{version}" for n in range(per_file)}
+    path.write_text(json.dumps({"snippets": snippets}))
+
+
+def wait_until(condition, timeout: float = 10.0) -> float:
+    began = time.perf_counter()
+    while not condition():
+        if time.perf_counter() - began > timeout:
+            raise TimeoutError("pack change never reached the matcher")
+        time.sleep(0.0005)
+    return time.perf_counter() - began
+
+
+def main() -> int:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--files", type=int, default=500)
+    parser.add_argument("--per-file", type=int, default=20)
+    parser.add_argument("--edits", type=int, default=20)
+    args = parser.parse_args()
+
+    set_log_levels({}, context_level="WARNING")
+    engine = SnippetEngine(SnippetSettings(defaults=[], library=False), EventBus())
+    with tempfile.TemporaryDirectory() as tmp:
+        directory = Path(tmp)
+        for index in range(args.files):
+            write_pack(directory / f"pack{index:04d}.json", index, args.per_file, 0)
+        watcher = SnippetPackWatcher(directory, engine)
+        last = f";p{args.files - 1}s{args.per_file - 1}"
+        watcher.start()
+        initial = wait_until(lambda: engine._matcher.get(last) is not None)
+        print(f"initial load of {args.files * args.per_file} snippets: {initial * 1000:.0f} ms")
+
+        typing = True
+
+        def type_keys() -> None:
+            events = [KeyEvent(char, "down") for char in ";p1s zq p2 "]
+            while typing:
+                for event in events:
+                    engine._handle_key(event)
+                time.sleep(0.0001)
+
+        typist = threading.Thread(target=type_keys, daemon=True)
+        typist.start()
+        engine.stats.hook_max_ns = 0
+        latencies: list[float] = []
+        for edit in range(1, args.edits + 1):
+            index = (edit * 37) % args.files
+            write_pack(directory / f"pack{index:04d}.json", index, args.per_file, edit)
+            trigger, expected = f";p{index}s0", f"pack {index} snippet 0 v{edit}"
+            latencies.append(
+                wait_until(lambda: engine._matcher.get(trigger).replacement == expected)
+            )
+        typing = False
+        typist.join()
+        watcher.stop()
+
+    ms = sorted(latency * 1000 for latency in latencies)
+    print(
+        f"edit -> live: median {statistics.median(ms):.1f} ms, max {ms[-1]:.1f} ms "
+        f"over {len(ms)} edits"
+    )
+    print(f"worst hook callback while editing: {engine.stats.hook_max_ns / 1000:.0f} us")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,63 @@
+"""Compare rendering a compiled template with a dozen placeholders to a static string.
+
+Both go through ``Template.render``; parsing happens once, up front. The
+template mixes dates (memoized per visible field) and nested snippets
+(memoized per session); ``{clipboard}`` is left out because it is read from
+the system on every expansion.
+
+Usage:
+    python benchmarks/bench_snippet_templates.py --renders 200000
+"""
+
+from __future__ import annotations
+
+import argparse
+import sys
+import time
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).resolve().parents[1] / "src"))
+
+from mate.services.snippet_templates import compile_template  # noqa: E402
+
+_BODIES = {";name": "Mate", ";team": "the {snippet:;name} team", ";sig": "Best regards"}
+_TEMPLATE = (
+    "Report {date:%Y-%m-%d} ({date:%A}, week {date:%W}) for {snippet:;team}.\n"
+    "Owner: {snippet:;name} / {snippet:;name} / {snippet:;team}\n"
+    "Period: {date:%B %Y}, generated {date}\n"
+    "{cursor}\n-- {snippet:;sig}, {snippet:;name}"
+)
+
+
+def ns_per_render(template, renders: int) -> float:
+    render = template.render
+    render()
+    began = time.perf_counter_ns()
+    for _ in range(renders):
+        render()
+    return (time.perf_counter_ns() - began) / renders
+
+
+def main() -> int:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--renders", type=int, default=200_000)
+    args = parser.parse_args()
+
+    dynamic = compile_template(_TEMPLATE, _BODIES.get)
+    text, _caret = dynamic.render()
+    static = compile_template(text.replace("{", "{{").replace("}", "}}"))
+
+    began = time.perf_counter_ns()
+    for _ in range(1_000):
+        compile_template(_TEMPLATE, _BODIES.get).render()
+    compile_us = (time.perf_counter_ns() - began) / 1_000 / 1e3
+
+    print(f"placeholders: {_TEMPLATE.count('{')}, expansion: {len(text)} chars")
+    print(f"parse + first render: {compile_us:,.1f} us (paid once, at registration)")
+    print(f"static   render: {ns_per_render(static, args.renders):>8,.0f} ns")
+    print(f"template render: {ns_per_render(dynamic, args.renders):>8,.0f} ns")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -1,15 +1,18 @@
-"""Typer CLI for mate."""
+"""Typer CLI for mate.
+
+Only ``typer`` and the settings models load at import time; each command
+imports what it needs, so ``doctor`` and ``settings`` never pull in Qt,
+``keyboard`` or the Win32 bindings.
+"""
 
 from __future__ import annotations
 
 import json
-import platform
+import os
 
 import typer
 
 from mate.config import load_settings
-from mate.logging import configure_logging
-from mate.main import main as launch
 
 app = typer.Typer(no_args_is_help=True)
 
@@ -18,6 +21,8 @@ app = typer.Typer(no_args_is_help=True)
 def run() -> None:
     """Launch the GUI."""
 
+    from mate.main import main as launch
+
     launch()
 
 
@@ -25,6 +30,10 @@ def run() -> None:
 def doctor() -> None:
     """Print environment diagnostics."""
 
+    import platform
+
+    from mate.logging import configure_logging
+
     settings = load_settings()
     configure_logging(settings)
     info = {
@@ -46,3 +55,81 @@ def settings(key: str | None = typer.Argument(None)) -> None:
     if key:
         data = data.get(key, {})
     typer.echo(json.dumps(data, indent=2, default=str))
+
+
+@app.command("profile-startup")
+def profile_startup(
+    gui: bool = typer.Option(True, help="Include Qt, MainWindow and first paint."),
+    min_ms: float = typer.Option(5.0, help="Hide imports cheaper than this (cumulative)."),
+    depth: int = typer.Option(4, help="Import tree depth to show."),
+    as_json: bool = typer.Option(False, "--json", help="Emit machine-readable output."),
+) -> None:
+    """Profile a cold start: per-phase timings and the import-time tree."""
+
+    from dataclasses import asdict
+
+    from mate.utils.startup_profile import format_import_tree
+    from mate.utils.startup_profile import profile_startup as run_profile
+
+    profile = run_profile(gui=gui)
+    if as_json:
+        typer.echo(json.dumps(asdict(profile), indent=2))
+        return
+    typer.echo("Phases:")
+    for phase in profile.phases:
+        typer.echo(f"{phase.ms:10.1f} ms  {phase.name}")
+    typer.echo(f"{sum(p.ms for p in profile.phases):10.1f} ms  total")
+    if profile.error:
+        typer.echo(f"Profiling stopped early: {profile.error}", err=True)
+    typer.echo("\nImports (cumulative, self):")
+    for line in format_import_tree(profile.imports, min_ms=min_ms, max_depth=depth):
+        typer.echo(line)
+
+
+@app.command("log-level")
+def log_level(
+    context: str | None = typer.Argument(None, help="Logger context, e.g. win32_hotkeys."),
+    level: str | None = typer.Argument(None, help="TRACE/DEBUG/INFO/WARNING/ERROR or 'default'."),
+) -> None:
+    """Show or change per-context log levels.
+
+    Only ``logging.levels`` in ``config/settings.json`` is rewritten; a running
+    mate picks the change up through settings hot-reload without restarting.
+    """
+
+    settings = load_settings(use_cache=False)
+    levels = dict(settings.logging.levels)
+    if context is None or level is None:
+        typer.echo(json.dumps({"default": settings.logging.context_level, **levels}, indent=2))
+        return
+
+    from loguru import logger
+
+    from mate.config import SETTINGS_FILE, SettingsFileError, read_settings_file
+
+    path = settings.paths.config_dir / SETTINGS_FILE
+    try:
+        stored = read_settings_file(path)
+    except SettingsFileError as e:
+        # Rewriting a file we could not parse would drop every other setting in it
+        typer.echo(f"Not changing log levels: {e}", err=True)
+        raise typer.Exit(1) from None
+    section = stored.get("logging")
+    if not isinstance(section, dict):
+        section = stored["logging"] = {}
+    levels = section.get("levels")
+    if not isinstance(levels, dict):
+        levels = section["levels"] = {}
+    if level.lower() == "default":
+        levels.pop(context, None)
+    else:
+        try:
+            logger.level(level.upper())
+        except ValueError:
+            raise typer.BadParameter(f"Unknown log level {level!r}") from None
+        levels[context] = level.upper()
+    # Dot-prefixed so the settings watcher ignores the temporary file
+    tmp = path.with_name(f".{path.name}.tmp")
+    tmp.write_text(json.dumps(stored, indent=2, sort_keys=True), encoding="utf-8")
+    os.replace(tmp, path)
+    typer.echo(f"{context}: {levels.get(context, settings.logging.context_level)}")
@@ -2,43 +2,66 @@
 
 from __future__ import annotations
 
+import hashlib
+import json
 import os
+import pickle
+import typing
+from functools import cache
 from pathlib import Path
 from typing import Any, Literal
 
-from dotenv import load_dotenv
-from pydantic import BaseModel, Field
+from pydantic import BaseModel, ConfigDict, Field, PrivateAttr, ValidationError, model_validator
 
+SETTINGS_FILE = "settings.json"
 
-class AppPaths(BaseModel):
-    """Resolved directories for mate runtime assets."""
+
+class _SettingsModel(BaseModel):
+    # Validators are built on first use rather than at import, which keeps
+    # CLI commands and cached settings loads from paying for them.
+    model_config = ConfigDict(defer_build=True)
+
+
+class AppPaths(_SettingsModel):
+    """Resolved directories for mate runtime assets.
+
+    Directories are created on first access rather than up front, so commands
+    that never touch a path never pay for its ``mkdir``.
+    """
 
     base_dir: Path = Field(
         default_factory=lambda: Path(os.getenv("MATE_HOME", Path.home() / ".mate"))
     )
+    _ensured: set[Path] = PrivateAttr(default_factory=set)
 
     @property
     def config_dir(self) -> Path:
-        return self.base_dir / "config"
+        return self._materialise(self.base_dir / "config")
 
     @property
     def logs_dir(self) -> Path:
-        return self.base_dir / "logs"
+        return self._materialise(self.base_dir / "logs")
 
     @property
     def cache_dir(self) -> Path:
-        return self.base_dir / "cache"
+        return self._materialise(self.base_dir / "cache")
 
     @property
     def data_dir(self) -> Path:
-        return self.base_dir / "data"
+        return self._materialise(self.base_dir / "data")
 
     def ensure(self) -> None:
         for path in (self.base_dir, self.config_dir, self.logs_dir, self.cache_dir, self.data_dir):
             path.mkdir(parents=True, exist_ok=True)
 
+    def _materialise(self, path: Path) -> Path:
+        if path not in self._ensured:
+            path.mkdir(parents=True, exist_ok=True)
+            self._ensured.add(path)
+        return path
+
 
-class UISettings(BaseModel):
+class UISettings(_SettingsModel):
     theme: Literal["light", "dark"] = "light"
     opacity: float = Field(default=0.5, ge=0.2, le=1.0)
     animation_ms: int = Field(default=320, ge=60, le=2000)
@@ -48,9 +71,25 @@ class UISettings(BaseModel):
 
 
 
-class SnippetSettings(BaseModel):
+class SnippetSettings(_SettingsModel):
     enabled: bool = True
     max_buffer: int = Field(default=120, ge=10, le=400)
+    # Which trigger wins when several end on the same keystroke
+    match_rule: Literal["first", "longest"] = "first"
+    # Persist registered snippets in data/snippets.db and load its triggers on start
+    library: bool = True
+    body_cache: int = Field(default=256, ge=0, le=100_000)
+    # auto: unicode SendInput up to clipboard_threshold chars, clipboard paste above
+    injection: Literal["auto", "typing", "unicode", "clipboard"] = "auto"
+    clipboard_threshold: int = Field(default=200, ge=0, le=1_000_000)
+    type_delay_ms: float = Field(default=5.0, ge=0, le=100)
+    # Keys seen this long after an expansion are treated as its own synthetic echo
+    injection_grace_ms: float = Field(default=30.0, ge=0, le=1000)
+    # Process names (code.exe) or window classes where no snippet fires
+    excluded_apps: list[str] = Field(default_factory=list)
+    # Watch JSON/TOML/YAML snippet packs in packs_dir (default: <config>/snippets)
+    packs: bool = True
+    packs_dir: Path | None = None
     defaults: list[dict[str, str]] = Field(
         default_factory=lambda: [
             {"trigger": "//mate", "replacement": "Mate is alive"},
@@ -59,7 +98,7 @@ class SnippetSettings(BaseModel):
     )
 
 
-class HotkeyBinding(BaseModel):
+class HotkeyBinding(_SettingsModel):
     name: str
     shortcut: str
     action: Literal[
@@ -75,8 +114,10 @@ class HotkeyBinding(BaseModel):
     payload: dict[str, Any] | None = None
 
 
-class HotkeySettings(BaseModel):
+class HotkeySettings(_SettingsModel):
     enabled: bool = True
+    # win32: RegisterHotKey (swallows the chord); hook: chords in the shared input pipeline
+    backend: Literal["win32", "hook"] = "win32"
     bindings: list[HotkeyBinding] = Field(
         default_factory=lambda: [
             HotkeyBinding(
@@ -111,25 +152,75 @@ class HotkeySettings(BaseModel):
     )
 
 
-class PrivacySettings(BaseModel):
+class PrivacySettings(_SettingsModel):
     prevent_capture: bool = True
     hide_from_taskbar: bool = True
     stealth_mode: bool = True
 
 
-class WebSettings(BaseModel):
+class CoalesceSettings(_SettingsModel):
+    window_ms: int = Field(default=0, ge=0, le=60000)
+    max_rate_hz: float | None = Field(default=None, gt=0)
+    leading: bool = False
+    trailing: bool = True
+
+    @model_validator(mode="after")
+    def _check_policy(self) -> CoalesceSettings:
+        # Mirrors EventBus.coalesce, so a bad policy fails here instead of at startup
+        if self.window_ms <= 0 and self.max_rate_hz is None:
+            raise ValueError("coalescing needs a positive window_ms or max_rate_hz")
+        if not (self.leading or self.trailing):
+            raise ValueError("coalescing needs leading or trailing delivery")
+        return self
+
+
+class EventSettings(_SettingsModel):
+    async_topics: list[str] = Field(default_factory=list)
+    queue_size: int = Field(default=256, ge=1, le=65536)
+    overflow: Literal["block", "drop_oldest", "drop_newest"] = "drop_oldest"
+    coalesce: dict[str, CoalesceSettings] = Field(default_factory=dict)
+    journal: bool = False
+    journal_segment_mb: int = Field(default=16, ge=1, le=1024)
+    journal_max_segments: int = Field(default=8, ge=1, le=1000)
+    remote_topics: list[str] = Field(default_factory=list)
+    remote_address: str | None = None
+
+
+class LogSettings(_SettingsModel):
+    level: str = "INFO"
+    # "queued" hands records to a background writer; "direct" writes on the caller's thread
+    pipeline: Literal["queued", "direct"] = "queued"
+    queue_size: int = Field(default=8192, ge=16, le=1_000_000)
+    json_lines: bool = False
+    file_max_mb: int = Field(default=10, ge=1, le=1024)
+    file_backups: int = Field(default=4, ge=0, le=100)
+    # context -> max records per second below WARNING (burst of the same size)
+    rate_limits: dict[str, float] = Field(default_factory=dict)
+    # context -> fraction of records below WARNING to keep
+    sample: dict[str, float] = Field(default_factory=dict)
+    ring_size: int = Field(default=512, ge=0, le=100_000)
+    diagnose: bool = False
+    # Minimum level per logger context (e.g. {"win32_hotkeys": "WARNING"}); others use context_level
+    levels: dict[str, str] = Field(default_factory=dict)
+    context_level: str = "DEBUG"
+
+
+class WebSettings(_SettingsModel):
     start_url: str = "https://www.chatgpt.com"
     allow_navigation: bool = True
 
 
-class MateSettings(BaseModel):
+class MateSettings(_SettingsModel):
     app_name: str = "mate"
+    hot_reload: bool = True
     paths: AppPaths = Field(default_factory=AppPaths)
     ui: UISettings = Field(default_factory=UISettings)
     snippets: SnippetSettings = Field(default_factory=SnippetSettings)
     hotkeys: HotkeySettings = Field(default_factory=HotkeySettings)
     privacy: PrivacySettings = Field(default_factory=PrivacySettings)
     web: WebSettings = Field(default_factory=WebSettings)
+    events: EventSettings = Field(default_factory=EventSettings)
+    logging: LogSettings = Field(default_factory=LogSettings)
 
 
 def _maybe_float(value: str | None) -> float | None:
@@ -152,13 +243,163 @@ def _maybe_bool(value: str | None) -> bool | None:
     return None
 
 
-def load_settings(env_path: Path | None = None) -> MateSettings:
-    """Load user settings from environment variables and defaults."""
+_SETTINGS_CACHE_VERSION = 2  # bump when validation changes without a field change
+# MATE_* variables this process loaded from a .env file; they are an effect of
+# the file (already covered by its stat) rather than part of the environment.
+_DOTENV_INJECTED: set[str] = set()
 
-    env_file = env_path or Path('.env')
+
+@cache
+def _schema_fingerprint() -> str:
+    """Field names and types of every settings model, so an upgrade invalidates the cache."""
+
+    fields: list[str] = []
+    seen: set[type] = set()
+
+    def walk(annotation: Any) -> None:
+        if isinstance(annotation, type) and issubclass(annotation, BaseModel):
+            if annotation in seen:
+                return
+            seen.add(annotation)
+            for name, field in annotation.model_fields.items():
+                fields.append(f"{annotation.__qualname__}.{name}:{field.annotation!r}")
+                walk(field.annotation)
+        for argument in typing.get_args(annotation):
+            walk(argument)
+
+    walk(MateSettings)
+    return hashlib.blake2b("\n".join(fields).encode(), digest_size=8).hexdigest()
+
+
+def _settings_cache_key(env_file: Path) -> str:
+    digest = hashlib.blake2b(digest_size=16)
+    digest.update(f"v{_SETTINGS_CACHE_VERSION}:{_schema_fingerprint()}\0".encode())
+    for source in (env_file, _settings_file_path()):
+        try:
+            stat = source.stat()
+            digest.update(f"{source.resolve()}:{stat.st_mtime_ns}:{stat.st_size}\0".encode())
+        except OSError:
+            digest.update(b"missing\0")
+    for key in sorted(os.environ):
+        if key.startswith("MATE_") and key not in _DOTENV_INJECTED:
+            digest.update(f"{key}={os.environ[key]}\0".encode())
+    return digest.hexdigest()
+
+
+def _mate_home() -> Path:
+    return Path(os.getenv("MATE_HOME", Path.home() / ".mate"))
+
+
+def _settings_cache_path() -> Path:
+    # Resolved after .env is loaded, so a MATE_HOME set there is honoured; the key
+    # covers .env itself, so editing it invalidates the snapshot either way.
+    return _mate_home() / "cache" / "settings.pickle"
+
+
+def _settings_file_path() -> Path:
+    return _mate_home() / "config" / SETTINGS_FILE
+
+
+class SettingsFileError(ValueError):
+    """``settings.json`` exists but cannot be read, parsed or validated."""
+
+
+def read_settings_file(path: Path) -> dict[str, Any]:
+    """The raw JSON object in ``path``, or ``{}`` when there is no such file.
+
+    Raises:
+        SettingsFileError: If the file is unreadable, not JSON or not an object
+    """
+    try:
+        text = path.read_text(encoding="utf-8")
+    except FileNotFoundError:
+        return {}
+    except OSError as e:
+        raise SettingsFileError(f"Cannot read {path}: {e}") from e
+    try:
+        data = json.loads(text)
+    except ValueError as e:
+        raise SettingsFileError(f"{path} is not valid JSON: {e}") from e
+    if not isinstance(data, dict):
+        raise SettingsFileError(f"{path} must contain a JSON object")
+    return data
+
+
+def check_settings_file(path: Path) -> dict[str, Any]:
+    """Like :func:`read_settings_file`, but also validate the content against ``MateSettings``."""
+    data = read_settings_file(path)
+    try:
+        MateSettings(**{k: v for k, v in data.items() if k != "paths"})
+    except ValidationError as e:
+        raise SettingsFileError(f"{path} has invalid settings: {e}") from e
+    return data
+
+
+def _merge(base: dict[str, Any], overrides: dict[str, Any]) -> dict[str, Any]:
+    merged = dict(base)
+    for key, value in overrides.items():
+        if isinstance(value, dict) and isinstance(merged.get(key), dict):
+            merged[key] = _merge(merged[key], value)
+        else:
+            merged[key] = value
+    return merged
+
+
+def _is_complete(value: Any) -> bool:
+    """Whether every field of every nested model was restored by the unpickler."""
+
+    if isinstance(value, BaseModel):
+        state = value.__dict__
+        return all(
+            name in state and _is_complete(state[name]) for name in type(value).model_fields
+        )
+    if isinstance(value, (list, tuple)):
+        return all(_is_complete(item) for item in value)
+    if isinstance(value, dict):
+        return all(_is_complete(item) for item in value.values())
+    return True
+
+
+def _read_settings_cache(path: Path, key: str) -> MateSettings | None:
+    # The key lives inside the pickle, so a snapshot referring to a renamed class or
+    # module fails before it can be rejected; any failure here is just a miss.
+    try:
+        with path.open("rb") as handle:
+            cached_key, settings = pickle.load(handle)
+        if cached_key != key or not isinstance(settings, MateSettings):
+            return None
+        if not _is_complete(settings):
+            return None
+    except Exception as e:
+        from mate.logging import get_logger
+
+        get_logger("config").debug("Ignoring unreadable settings cache {}: {!r}", path, e)
+        return None
+    settings.paths._ensured.clear()
+    return settings
+
+
+def _write_settings_cache(path: Path, key: str, settings: MateSettings) -> None:
+    try:
+        path.parent.mkdir(parents=True, exist_ok=True)
+        tmp = path.with_suffix(".tmp")
+        with tmp.open("wb") as handle:
+            pickle.dump((key, settings), handle, protocol=pickle.HIGHEST_PROTOCOL)
+        os.replace(tmp, path)
+    except OSError:
+        pass  # The cache is an optimisation only
+
+
+def _load_env_file(env_file: Path) -> None:
     if env_file.exists():
+        from dotenv import load_dotenv
+
+        before = set(os.environ)
         load_dotenv(env_file)
+        _DOTENV_INJECTED.update(k for k in os.environ.keys() - before if k.startswith("MATE_"))
+
 
+def _env_overrides() -> dict[str, dict[str, Any]]:
     overrides: dict[str, Any] = {}
 
     if theme := os.getenv('MATE_THEME'):
@@ -176,7 +417,144 @@ def load_settings(env_path: Path | None = None) -> MateSettings:
     if start_url := os.getenv('MATE_START_URL'):
         overrides.setdefault('web', {})['start_url'] = start_url
 
+    return overrides
+
+
+def _build_settings() -> MateSettings:
+    """Validate the settings file under the environment overrides.
+
+    Raises:
+        SettingsFileError: If the file cannot be parsed or fails validation
+    """
+    overrides = _env_overrides()
+    path = _settings_file_path()
+    stored = read_settings_file(path)
+    stored.pop("paths", None)
+    try:
+        return MateSettings(**_merge(stored, overrides))
+    except ValidationError as e:
+        raise SettingsFileError(f"{path} has invalid settings: {e}") from e
+
+
+def _build_lenient_settings() -> MateSettings:
+    """Settings without the sections that fail validation, so a bad edit cannot stop mate."""
+    from mate.logging import get_logger
+
+    logger = get_logger("config")
+    overrides = _env_overrides()
+    try:
+        stored = read_settings_file(_settings_file_path())
+    except SettingsFileError as e:
+        logger.error("Ignoring settings file: {}", e)
+        stored = {}
+    stored.pop("paths", None)
+    while True:
+        try:
+            return MateSettings(**_merge(stored, overrides))
+        except ValidationError as e:
+            sections = {str(error["loc"][0]) for error in e.errors() if error["loc"]}
+            # Drop the file's copy of a failing section first, then the override
+            source = stored if sections & stored.keys() else overrides
+            dropped = sections & source.keys()
+            if not dropped:
+                raise
+            logger.error("Ignoring invalid settings in {}: {}", sorted(dropped), e)
+            for section in dropped:
+                del source[section]
+
+
+def reload_settings(env_path: Path | None = None) -> MateSettings:
+    """Load settings again after ``.env`` or config files changed on disk.
+
+    Variables previously injected from ``.env`` are dropped first so edited or
+    removed entries take effect, while real environment variables still win.
+
+    Raises:
+        SettingsFileError: If the settings file cannot be parsed or fails
+            validation, so the caller can keep its current settings
+    """
+
+    for key in _DOTENV_INJECTED:
+        os.environ.pop(key, None)
+    _DOTENV_INJECTED.clear()
+    return load_settings(env_path, strict=True)
+
+
+def diff_settings(old: MateSettings, new: MateSettings) -> set[str]:
+    """Dotted paths of values that differ, e.g. ``{"ui.theme", "hotkeys.bindings"}``.
+
+    Nested models are compared field by field; lists and dicts are compared
+    as a whole and reported by their own path.
+    """
+
+    changed: set[str] = set()
+
+    def walk(before: Any, after: Any, path: str) -> None:
+        if isinstance(before, BaseModel) and type(before) is type(after):
+            for name in type(before).model_fields:
+                child = f"{path}.{name}" if path else name
+                walk(getattr(before, name), getattr(after, name), child)
+        elif before != after:
+            changed.add(path)
+
+    walk(old, new, "")
+    return changed
+
+
+def dump_settings(settings: MateSettings, stored: dict[str, Any] | None = None) -> dict[str, Any]:
+    """JSON-ready settings that differ from the defaults, as stored in ``settings.json``.
+
+    A value still equal to its ``MATE_*`` override came from the environment,
+    so it keeps its value from ``stored`` (the file's current content) or is
+    left out; a value edited away from the override is the user's and is kept.
+    """
+
+    data = settings.model_dump(mode="json", exclude={"paths"}, exclude_defaults=True)
+    stored = stored or {}
+    for section, values in _env_overrides().items():
+        for name, value in values.items():
+            if getattr(getattr(settings, section), name) != value:
+                continue
+            dumped = data.setdefault(section, {})
+            file_section = stored.get(section)
+            if isinstance(file_section, dict) and name in file_section:
+                dumped[name] = file_section[name]
+            else:
+                dumped.pop(name, None)
+            if not dumped:
+                del data[section]
+    return data
+
+
+def load_settings(
+    env_path: Path | None = None, *, use_cache: bool = True, strict: bool = False
+) -> MateSettings:
+    """Load user settings from ``config/settings.json``, environment variables and defaults.
+
+    Environment variables (including ``.env``) override the settings file,
+    which overrides the model defaults. A file that cannot be parsed, or
+    sections of it that fail validation, are logged and left out unless
+    ``strict`` is set, in which case ``SettingsFileError`` is raised.
+
+    The validated model is snapshotted to ``cache/settings.pickle`` keyed by the
+    settings schema, the ``.env`` and settings file stats and the ``MATE_*``
+    environment, so later loads with the same inputs skip pydantic validation.
+    ``.env`` is still loaded into ``os.environ`` on every call.
+    """
 
-    settings = MateSettings(**overrides)
-    settings.paths.ensure()
+    env_file = env_path or Path('.env')
+    # The key ignores variables injected here, so it is the same before and after
+    _load_env_file(env_file)
+    cache_path = _settings_cache_path()
+    key = _settings_cache_key(env_file) if use_cache else ""
+    if use_cache and (settings := _read_settings_cache(cache_path, key)) is not None:
+        return settings
+    try:
+        settings = _build_settings()
+    except SettingsFileError:
+        if strict:
+            raise
+        return _build_lenient_settings()  # never cached, so fixing the file takes effect
+    if use_cache:
+        _write_settings_cache(cache_path, key, settings)
     return settings
@@ -1,15 +1,31 @@
-"""Mate application composition root."""
+"""Mate application composition root.
+
+Service modules pull in Qt, ``keyboard`` and Win32 bindings, so they are
+imported inside :func:`build_context`; importing this module stays cheap for
+CLI commands that never build a context.
+"""
 
 from __future__ import annotations
 
+import time
 from dataclasses import dataclass
+from typing import TYPE_CHECKING
 
-from mate.config import MateSettings
+from mate.config import SETTINGS_FILE, MateSettings, diff_settings
 from mate.core.events import EventBus
-from mate.core.state import RuntimeState
-from mate.logging import get_logger
-from mate.services.hotkeys import HotkeyManager
-from mate.services.snippet_engine import SnippetEngine
+from mate.core.state import RuntimeState, UIState
+from mate.logging import apply_log_settings, get_logger
+
+if TYPE_CHECKING:
+    from mate.core.journal import EventJournal
+    from mate.core.transport import RemoteHub
+    from mate.data.settings_store import SettingsStore
+    from mate.services.hotkeys import HotkeyManager
+    from mate.services.input_pipeline import InputPipeline
+    from mate.services.snippet_engine import SnippetEngine
+    from mate.services.snippet_packs import SnippetPackWatcher
+
+_logger = get_logger("bootstrap")
 
 
 @dataclass(slots=True)
@@ -19,27 +35,129 @@ class MateContext:
     state: RuntimeState
     snippet_engine: SnippetEngine
     hotkeys: HotkeyManager
+    journal: EventJournal | None = None
+    remote: RemoteHub | None = None
+    settings_store: SettingsStore | None = None
+    snippet_packs: SnippetPackWatcher | None = None
+    input: InputPipeline | None = None
 
     def start(self) -> None:
         # caption_engine removed
         self.snippet_engine.start()
+        if self.snippet_packs:
+            self.snippet_packs.start()
         self.hotkeys.start()
 
     def stop(self) -> None:
         # caption_engine removed
+        if self.snippet_packs:
+            self.snippet_packs.stop()
         self.snippet_engine.stop()
+        if self.snippet_engine.repository:
+            self.snippet_engine.repository.close()
         self.hotkeys.stop()
+        if self.input:
+            self.input.stop()
+        self.events.close()
+        if self.remote:
+            self.remote.close()
+        if self.journal:
+            self.journal.close()
+        if self.settings_store:
+            self.settings_store.close()
+
+    def apply_settings(self, settings: MateSettings) -> set[str]:
+        """Apply reloaded settings in place and return the changed paths.
+
+        Changed sections are swapped into the shared settings object, so
+        holders of ``ctx.settings`` see them; only services whose section
+        changed are touched. Subscribers of ``settings.changed`` receive the
+        changed paths. Event bus wiring is applied at startup only.
+        """
+        changed = diff_settings(self.settings, settings)
+        if not changed:
+            return changed
+        started = time.perf_counter()
+        sections = {path.split(".", 1)[0] for path in changed}
+        for section in sections:
+            setattr(self.settings, section, getattr(settings, section))
+        if "hotkeys" in sections:
+            self.hotkeys.apply_settings(self.settings.hotkeys)
+        if "snippets" in sections:
+            self.snippet_engine.apply_settings(self.settings.snippets)
+        if "logging" in sections:
+            apply_log_settings(self.settings.logging)
+        if "events" in sections:
+            _logger.warning("Event bus settings changed; restart mate to apply them")
+        self.events.emit("settings.changed", changed)
+        elapsed = (time.perf_counter() - started) * 1000
+        _logger.info(
+            "Applied settings change to {} in {:.1f} ms", ", ".join(sorted(changed)), elapsed
+        )
+        return changed
 
 
 def build_context(settings: MateSettings) -> MateContext:
+    from mate.data.settings_store import SettingsStore
+    from mate.data.snippets import SnippetRepository
+    from mate.services.hotkeys import HotkeyManager
+    from mate.services.input_pipeline import InputPipeline, KeyboardBackend
+    from mate.services.snippet_engine import SnippetEngine
+
     events = EventBus()
-    state = RuntimeState()
+    for topic in settings.events.async_topics:
+        events.configure_topic(
+            topic, maxsize=settings.events.queue_size, overflow=settings.events.overflow
+        )
+    for topic, policy in settings.events.coalesce.items():
+        events.coalesce(
+            topic,
+            window=policy.window_ms / 1000,
+            max_rate_hz=policy.max_rate_hz,
+            leading=policy.leading,
+            trailing=policy.trailing,
+        )
+    journal: EventJournal | None = None
+    if settings.events.journal:
+        from mate.core.journal import EventJournal
+
+        journal = EventJournal(
+            settings.paths.data_dir / "journal",
+            segment_bytes=settings.events.journal_segment_mb * 1024 * 1024,
+            max_segments=settings.events.journal_max_segments,
+        )
+        journal.attach(events)
+    remote: RemoteHub | None = None
+    if settings.events.remote_topics:
+        from mate.core.transport import RemoteHub
+
+        # Worker processes read the address and authkey from data/remote.json
+        # (owner-only) with read_connection_file and pass them to connect_bus.
+        remote = RemoteHub(
+            events,
+            settings.events.remote_topics,
+            address=settings.events.remote_address,
+            connection_file=settings.paths.data_dir / "remote.json",
+        )
+    state = RuntimeState(ui=UIState(opacity=settings.ui.opacity, theme=settings.ui.theme))
     # audio_capture and caption_engine removed
-    snippet_engine = SnippetEngine(settings.snippets, events)
-    hotkeys = HotkeyManager(settings.hotkeys, events)
+    repository: SnippetRepository | None = None
+    if settings.snippets.library:
+        repository = SnippetRepository(
+            settings.paths.data_dir / "snippets.db", body_cache_size=settings.snippets.body_cache
+        )
+    # One keyboard hook, installed on first use, for snippets and hook-based hotkeys
+    input_pipeline = InputPipeline(KeyboardBackend())
+    snippet_engine = SnippetEngine(settings.snippets, events, repository, input_pipeline)
+    snippet_packs: SnippetPackWatcher | None = None
+    if settings.snippets.packs:
+        from mate.services.snippet_packs import SnippetPackWatcher
+
+        packs_dir = settings.snippets.packs_dir or settings.paths.config_dir / "snippets"
+        snippet_packs = SnippetPackWatcher(packs_dir, snippet_engine)
+    hotkeys = HotkeyManager(settings.hotkeys, events, input_pipeline)
 
-    logger = get_logger("bootstrap")
-    logger.info("Mate context ready")
+    _logger.info("Mate context ready")
 
     return MateContext(
         settings=settings,
@@ -47,4 +165,9 @@ def build_context(settings: MateSettings) -> MateContext:
         state=state,
         snippet_engine=snippet_engine,
         hotkeys=hotkeys,
+        journal=journal,
+        remote=remote,
+        settings_store=SettingsStore(settings.paths.config_dir / SETTINGS_FILE),
+        snippet_packs=snippet_packs,
+        input=input_pipeline,
     )
@@ -0,0 +1,209 @@
+"""Fixed-budget history of live caption frames.
+
+Frames are stored column-wise: timestamps, sources, confidences and text
+offsets live in preallocated ``array`` columns indexed by ``seq % max_frames``,
+and UTF-8 text is written into one circular byte arena. Appending evicts the
+oldest frames whenever either budget would be exceeded, so memory stays
+constant however long the session runs. :class:`CaptionFrame` objects are only
+built for query results.
+"""
+
+from __future__ import annotations
+
+import re
+import threading
+from array import array
+from collections import deque
+from collections.abc import Iterable
+from dataclasses import dataclass
+from enum import IntEnum
+
+_WORD = re.compile(r"\w+")
+
+
+class CaptionSource(IntEnum):
+    MIC = 0
+    SPEAKER = 1
+
+
+@dataclass(slots=True)
+class CaptionFrame:
+    seq: int
+    timestamp: float
+    source: CaptionSource
+    confidence: float
+    text: str
+
+
+def _tokens(text: str) -> set[str]:
+    return set(_WORD.findall(text.lower()))
+
+
+class CaptionHistory:
+    """Caption ring buffer with time-range slicing and an incremental word index."""
+
+    def __init__(self, max_frames: int = 65536, text_bytes: int = 4 * 1024 * 1024) -> None:
+        if max_frames < 1 or text_bytes < 1:
+            raise ValueError("max_frames and text_bytes must be positive")
+        self.max_frames = max_frames
+        self.text_bytes = text_bytes
+        self._timestamps = array("d", bytes(8 * max_frames))
+        self._sources = array("B", bytes(max_frames))
+        self._confidences = array("f", bytes(4 * max_frames))
+        self._offsets = array("q", bytes(8 * max_frames))
+        self._lengths = array("I", bytes(4 * max_frames))
+        self._arena = bytearray(text_bytes)
+        self._arena_end = 0  # logical offset; physical position is modulo text_bytes
+        self._head = 0  # next sequence number
+        self._tail = 0  # oldest live sequence number
+        self._postings: dict[str, deque[int]] = {}
+        self._lock = threading.RLock()
+
+    def __len__(self) -> int:
+        return self._head - self._tail
+
+    def append(
+        self,
+        text: str,
+        timestamp: float,
+        source: CaptionSource = CaptionSource.MIC,
+        confidence: float = 1.0,
+    ) -> int:
+        """Store a frame and return its sequence number.
+
+        Timestamps are kept non-decreasing (an earlier one is clamped to the
+        previous frame's) so time slicing can binary-search.
+        """
+        data = text.encode("utf-8")
+        if len(data) > self.text_bytes:
+            raise ValueError("caption text exceeds the history text budget")
+        with self._lock:
+            while len(self) >= self.max_frames or (
+                len(self) and self._arena_end + len(data) - self._oldest_offset() > self.text_bytes
+            ):
+                self._evict()
+            if len(self):
+                timestamp = max(timestamp, self._timestamps[self._slot(self._head - 1)])
+            seq = self._head
+            slot = self._slot(seq)
+            self._timestamps[slot] = timestamp
+            self._sources[slot] = source
+            self._confidences[slot] = confidence
+            self._offsets[slot] = self._arena_end
+            self._lengths[slot] = len(data)
+            self._write_text(self._arena_end, data)
+            self._arena_end += len(data)
+            self._head += 1
+            for token in _tokens(text):
+                postings = self._postings.get(token)
+                if postings is None:
+                    postings = self._postings[token] = deque()
+                postings.append(seq)
+            return seq
+
+    def frame(self, seq: int) -> CaptionFrame:
+        with self._lock:
+            if not self._tail <= seq < self._head:
+                raise IndexError(f"caption frame {seq} is no longer in history")
+            slot = self._slot(seq)
+            return CaptionFrame(
+                seq=seq,
+                timestamp=self._timestamps[slot],
+                source=CaptionSource(self._sources[slot]),
+                confidence=self._confidences[slot],
+                text=self._text(seq),
+            )
+
+    def between(self, start: float, end: float | None = None) -> list[CaptionFrame]:
+        """Frames with ``start <= timestamp < end`` (``end=None`` means up to now)."""
+        with self._lock:
+            first = self._first_at_or_after(start)
+            last = self._head if end is None else self._first_at_or_after(end)
+            return [self.frame(seq) for seq in range(first, last)]
+
+    def search(self, query: str, since: float | None = None) -> list[CaptionFrame]:
+        """Frames containing every word of ``query`` as a whole word."""
+        words = _tokens(query)
+        if not words:
+            return []
+        with self._lock:
+            postings = [self._postings.get(word) for word in words]
+            if not all(postings):
+                return []
+            return self._collect(_intersect(postings), since)
+
+    def find(self, substring: str, since: float | None = None) -> list[CaptionFrame]:
+        """Frames whose text contains ``substring`` (case-insensitive).
+
+        Candidates come from indexed words containing each query word, so only
+        matching frames are decoded; the vocabulary is scanned, never the text.
+        """
+        needle = substring.lower()
+        words = _tokens(needle)
+        if not words:
+            return []
+        with self._lock:
+            candidates: set[int] | None = None
+            for word in words:
+                hits: set[int] = set()
+                for token, postings in self._postings.items():
+                    if word in token:
+                        hits.update(postings)
+                candidates = hits if candidates is None else candidates & hits
+                if not candidates:
+                    return []
+            seqs = sorted(seq for seq in candidates if needle in self._text(seq).lower())
+            return self._collect(seqs, since)
+
+    def _collect(self, seqs: Iterable[int], since: float | None) -> list[CaptionFrame]:
+        first = self._tail if since is None else self._first_at_or_after(since)
+        return [self.frame(seq) for seq in seqs if seq >= first]
+
+    def _first_at_or_after(self, timestamp: float) -> int:
+        low, high = self._tail, self._head
+        while low < high:
+            mid = (low + high) // 2
+            if self._timestamps[self._slot(mid)] < timestamp:
+                low = mid + 1
+            else:
+                high = mid
+        return low
+
+    def _evict(self) -> None:
+        seq = self._tail
+        for token in _tokens(self._text(seq)):
+            postings = self._postings[token]
+            postings.popleft()
+            if not postings:
+                del self._postings[token]
+        self._tail += 1
+
+    def _oldest_offset(self) -> int:
+        return self._offsets[self._slot(self._tail)]
+
+    def _slot(self, seq: int) -> int:
+        return seq % self.max_frames
+
+    def _text(self, seq: int) -> str:
+        slot = self._slot(seq)
+        start = self._offsets[slot] % self.text_bytes
+        length = self._lengths[slot]
+        end = start + length
+        if end <= self.text_bytes:
+            return self._arena[start:end].decode("utf-8")
+        wrapped = end - self.text_bytes
+        return (self._arena[start:] + self._arena[:wrapped]).decode("utf-8")
+
+    def _write_text(self, offset: int, data: bytes) -> None:
+        start = offset % self.text_bytes
+        split = min(len(data), self.text_bytes - start)
+        self._arena[start : start + split] = data[:split]
+        self._arena[: len(data) - split] = data[split:]
+
+
+def _intersect(postings: list[deque[int]]) -> list[int]:
+    ordered = sorted(postings, key=len)
+    result = set(ordered[0])
+    for other in ordered[1:]:
+        result.intersection_update(other)
+    return sorted(result)
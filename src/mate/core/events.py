@@ -2,33 +2,524 @@
 
 from __future__ import annotations
 
+import heapq
+import itertools
 import threading
-from collections import defaultdict
+import time
+import weakref
+from collections import deque
 from collections.abc import Callable
-from typing import Any
+from dataclasses import dataclass
+from typing import Any, Literal
+
+from mate.logging import get_logger
 
 EventHandler = Callable[[Any], None]
+EventTap = Callable[[str, Any], None]
+OverflowPolicy = Literal["block", "drop_oldest", "drop_newest"]
+
+logger = get_logger("events")
+
+
+@dataclass(slots=True)
+class TopicStats:
+    """Snapshot of an asynchronous topic queue."""
+
+    depth: int
+    dropped: int
+    delivered: int
+
+
+class _TopicQueue:
+    """Bounded FIFO for one topic, drained by dedicated worker threads."""
+
+    def __init__(
+        self,
+        topic: str,
+        deliver: Callable[[str, Any], None],
+        maxsize: int,
+        overflow: OverflowPolicy,
+        workers: int,
+    ) -> None:
+        self.topic = topic
+        self.maxsize = maxsize
+        self.overflow = overflow
+        self.dropped = 0
+        self.delivered = 0
+        self._deliver = deliver
+        self._items: deque[Any] = deque()
+        self._lock = threading.Lock()
+        self._not_empty = threading.Condition(self._lock)
+        self._not_full = threading.Condition(self._lock)
+        self._closed = False
+        self._threads = [
+            threading.Thread(target=self._run, name=f"mate-events-{topic}-{index}", daemon=True)
+            for index in range(workers)
+        ]
+        for thread in self._threads:
+            thread.start()
+
+    def put(self, payload: Any) -> None:
+        with self._lock:
+            if self._closed:
+                self.dropped += 1
+                return
+            if len(self._items) >= self.maxsize:
+                if self.overflow == "drop_newest":
+                    self.dropped += 1
+                    return
+                if self.overflow == "drop_oldest":
+                    self._items.popleft()
+                    self.dropped += 1
+                else:
+                    while len(self._items) >= self.maxsize and not self._closed:
+                        self._not_full.wait()
+                    if self._closed:
+                        self.dropped += 1
+                        return
+            self._items.append(payload)
+            self._not_empty.notify()
+
+    def stats(self) -> TopicStats:
+        with self._lock:
+            return TopicStats(
+                depth=len(self._items), dropped=self.dropped, delivered=self.delivered
+            )
+
+    def close(self, timeout: float | None = None) -> None:
+        """Stop accepting events and wait for workers to drain what is queued."""
+        with self._lock:
+            self._closed = True
+            self._not_empty.notify_all()
+            self._not_full.notify_all()
+        for thread in self._threads:
+            if thread is not threading.current_thread():
+                thread.join(timeout)
+
+    def _run(self) -> None:
+        while True:
+            with self._lock:
+                while not self._items and not self._closed:
+                    self._not_empty.wait()
+                if not self._items:
+                    return
+                payload = self._items.popleft()
+                self._not_full.notify()
+            try:
+                self._deliver(self.topic, payload)
+            except Exception:
+                logger.exception("Error in async handler for {}", self.topic)
+            with self._lock:
+                self.delivered += 1
+
+
+@dataclass(slots=True, frozen=True)
+class CoalescePolicy:
+    """Latest-wins rate limit applied to a topic before delivery.
+
+    Events are grouped into windows of ``interval`` seconds, the larger of
+    ``window`` and ``1 / max_rate_hz``. ``leading`` delivers the first event of
+    a window immediately, ``trailing`` delivers the most recent one when the
+    window closes; everything in between is discarded.
+    """
+
+    window: float = 0.0
+    max_rate_hz: float | None = None
+    leading: bool = False
+    trailing: bool = True
+
+    @property
+    def interval(self) -> float:
+        if self.max_rate_hz:
+            return max(self.window, 1.0 / self.max_rate_hz)
+        return self.window
+
+
+class _Scheduler:
+    """Single timer thread shared by all coalesced topics of a bus."""
+
+    def __init__(self) -> None:
+        self._heap: list[tuple[float, int, Callable[[], None]]] = []
+        self._counter = itertools.count()
+        self._cond = threading.Condition()
+        self._closed = False
+        self._thread = threading.Thread(target=self._run, name="mate-events-timer", daemon=True)
+        self._thread.start()
+
+    def call_at(self, deadline: float, callback: Callable[[], None]) -> None:
+        with self._cond:
+            heapq.heappush(self._heap, (deadline, next(self._counter), callback))
+            self._cond.notify()
+
+    def close(self) -> None:
+        with self._cond:
+            self._closed = True
+            self._cond.notify()
+        if self._thread is not threading.current_thread():
+            self._thread.join(1.0)
+
+    def _run(self) -> None:
+        while True:
+            with self._cond:
+                while not self._closed:
+                    if not self._heap:
+                        self._cond.wait()
+                        continue
+                    delay = self._heap[0][0] - time.monotonic()
+                    if delay <= 0:
+                        break
+                    self._cond.wait(delay)
+                if self._closed:
+                    return
+                _, _, callback = heapq.heappop(self._heap)
+            try:
+                callback()
+            except Exception:
+                logger.exception("Error in coalesced delivery")
+
+
+_EMPTY = object()
+
+
+class _Coalescer:
+    """Window state for one coalesced topic."""
+
+    def __init__(
+        self,
+        policy: CoalescePolicy,
+        forward: Callable[[Any], None],
+        scheduler: _Scheduler,
+    ) -> None:
+        self.policy = policy
+        self.coalesced = 0
+        self._forward = forward
+        self._scheduler = scheduler
+        self._lock = threading.Lock()
+        self._pending: Any = _EMPTY
+        self._window_open = False
+
+    def offer(self, payload: Any) -> None:
+        with self._lock:
+            if self._window_open:
+                if self._pending is not _EMPTY or not self.policy.trailing:
+                    self.coalesced += 1
+                self._pending = payload if self.policy.trailing else _EMPTY
+                return
+            self._open_window()
+            if not self.policy.leading:
+                self._pending = payload
+                return
+        self._forward(payload)
+
+    def _open_window(self) -> None:
+        self._window_open = True
+        self._scheduler.call_at(time.monotonic() + self.policy.interval, self._close_window)
+
+    def _close_window(self) -> None:
+        with self._lock:
+            payload, self._pending = self._pending, _EMPTY
+            if payload is _EMPTY:
+                self._window_open = False
+                return
+            # Keep the rate bounded: a trailing delivery starts the next window.
+            self._open_window()
+        self._forward(payload)
+
+
+class _WeakHandler:
+    """Handler that does not keep its target (or the target's owner) alive."""
+
+    __slots__ = ("_ref", "__weakref__")
+
+    def __init__(self, handler: EventHandler, on_dead: Callable[[_WeakHandler], None]) -> None:
+        reference = weakref.WeakMethod if hasattr(handler, "__self__") else weakref.ref
+        self._ref = reference(handler, lambda _ref: on_dead(self))
+
+    def __call__(self, payload: Any) -> None:
+        handler = self._ref()
+        if handler is not None:
+            handler(payload)
+
+    def __eq__(self, other: object) -> bool:
+        if isinstance(other, _WeakHandler):
+            other = other._ref()
+        handler = self._ref()
+        return handler is not None and handler == other
+
+    __hash__ = object.__hash__
+
+
+class Subscription:
+    """Handle returned by :meth:`EventBus.subscribe`; usable as a context manager."""
+
+    __slots__ = ("_bus", "topic", "handler", "active")
+
+    def __init__(self, bus: EventBus, topic: str, handler: EventHandler) -> None:
+        self._bus = bus
+        self.topic = topic
+        self.handler = handler
+        self.active = True
+
+    def unsubscribe(self) -> None:
+        if self.active:
+            self.active = False
+            self._bus.unsubscribe(self.topic, self.handler)
+
+    def __enter__(self) -> Subscription:
+        return self
+
+    def __exit__(self, exc_type, exc, tb) -> None:
+        self.unsubscribe()
+
+
+class _TopicTrie:
+    """Subscription patterns split on ``.`` for wildcard resolution.
+
+    ``*`` matches exactly one segment and ``#`` matches zero or more.
+    """
+
+    __slots__ = ("children", "handlers")
+
+    def __init__(self) -> None:
+        self.children: dict[str, _TopicTrie] = {}
+        self.handlers: tuple[EventHandler, ...] = ()
+
+    @classmethod
+    def build(cls, subscribers: dict[str, tuple[Any, ...]]) -> _TopicTrie:
+        root = cls()
+        for pattern, handlers in subscribers.items():
+            node = root
+            for segment in pattern.split("."):
+                node = node.children.setdefault(segment, cls())
+            node.handlers = handlers
+        return root
+
+    def resolve(self, topic: str) -> tuple[EventHandler, ...]:
+        """Return matching handlers, de-duplicated, in trie match order.
+
+        At each segment the exact name is followed before ``*`` and ``#``;
+        handlers of one pattern keep their subscription order.
+        """
+        matched: list[tuple[EventHandler, ...]] = []
+        self._match(topic.split("."), 0, matched)
+        handlers: list[EventHandler] = []
+        for group in matched:
+            for handler in group:
+                if handler not in handlers:
+                    handlers.append(handler)
+        return tuple(handlers)
+
+    def _match(self, segments: list[str], index: int, matched: list) -> None:
+        if index == len(segments):
+            if self.handlers:
+                matched.append(self.handlers)
+        else:
+            child = self.children.get(segments[index])
+            if child is not None:
+                child._match(segments, index + 1, matched)
+            star = self.children.get("*")
+            if star is not None:
+                star._match(segments, index + 1, matched)
+        hash_node = self.children.get("#")
+        if hash_node is not None:
+            for end in range(index, len(segments) + 1):
+                hash_node._match(segments, end, matched)
+
+
+class TopicFilter:
+    """Cached yes/no match of topics against a set of wildcard patterns."""
+
+    def __init__(self, patterns: list[str] | tuple[str, ...]) -> None:
+        for pattern in patterns:
+            _validate_pattern(pattern)
+        self.patterns = tuple(patterns)
+        self._trie = _TopicTrie.build({pattern: (pattern,) for pattern in self.patterns})
+        self._cache: dict[str, bool] = {}
+
+    def __contains__(self, topic: str) -> bool:
+        hit = self._cache.get(topic)
+        if hit is None:
+            hit = self._cache[topic] = bool(self._trie.resolve(topic))
+        return hit
+
+
+def _validate_pattern(pattern: str) -> None:
+    for segment in pattern.split("."):
+        if segment != "*" and segment != "#" and ("*" in segment or "#" in segment):
+            raise ValueError(f"Wildcards must span a whole topic segment: {pattern!r}")
 
 
 class EventBus:
-    """Minimal event bus supporting background threads."""
+    """Minimal event bus supporting background threads.
+
+    Subscriptions may use ``*`` (one segment) and ``#`` (any number of
+    segments) wildcards, e.g. ``hotkey.*`` or ``caption.#``. Topics are
+    delivered synchronously on the emitting thread unless they were switched
+    to asynchronous delivery with :meth:`configure_topic`.
+    """
+
+    _ROUTE_CACHE_LIMIT = 4096
 
     def __init__(self) -> None:
-        self._subscribers: defaultdict[str, list[EventHandler]] = defaultdict(list)
+        # Copy-on-write: writers replace whole tuples under the lock, so
+        # emitters can read the table without locking or copying.
+        self._subscribers: dict[str, tuple[EventHandler, ...]] = {}
+        # (pattern trie, topic -> handlers cache); replaced as one tuple whenever
+        # subscriptions change so readers never see a trie/cache mismatch.
+        self._routing: tuple[_TopicTrie, dict[str, tuple[EventHandler, ...]]] = (_TopicTrie(), {})
+        self._queues: dict[str, _TopicQueue] = {}
+        self._coalescers: dict[str, _Coalescer] = {}
+        self._taps: tuple[EventTap, ...] = ()
+        self._scheduler: _Scheduler | None = None
         self._lock = threading.RLock()
 
-    def subscribe(self, topic: str, handler: EventHandler) -> None:
+    def subscribe(self, topic: str, handler: EventHandler, *, weak: bool = False) -> Subscription:
+        """Register ``handler`` for ``topic`` (a topic name or wildcard pattern).
+
+        With ``weak=True`` the bus only holds a weak reference (a ``WeakMethod``
+        for bound methods) and drops the subscription once the target is
+        garbage collected, so subscribing does not extend a widget's lifetime.
+        """
+        _validate_pattern(topic)
+        if weak:
+            handler = _WeakHandler(handler, lambda dead: self.unsubscribe(topic, dead))
         with self._lock:
-            if handler not in self._subscribers[topic]:
-                self._subscribers[topic].append(handler)
+            handlers = self._subscribers.get(topic, ())
+            if handler not in handlers:
+                self._subscribers[topic] = (*handlers, handler)
+                self._rebuild_routes()
+        return Subscription(self, topic, handler)
 
     def unsubscribe(self, topic: str, handler: EventHandler) -> None:
         with self._lock:
-            if handler in self._subscribers[topic]:
-                self._subscribers[topic].remove(handler)
+            handlers = self._subscribers.get(topic, ())
+            if handler in handlers:
+                remaining = tuple(h for h in handlers if not (h is handler or h == handler))
+                if remaining:
+                    self._subscribers[topic] = remaining
+                else:
+                    del self._subscribers[topic]
+                self._rebuild_routes()
 
-    def emit(self, topic: str, payload: Any) -> None:
+    def add_tap(self, tap: EventTap) -> None:
+        """Observe every emit as ``tap(topic, payload)``, before coalescing or queueing."""
+        with self._lock:
+            if tap not in self._taps:
+                self._taps = (*self._taps, tap)
+
+    def remove_tap(self, tap: EventTap) -> None:
+        with self._lock:
+            self._taps = tuple(t for t in self._taps if t != tap)
+
+    def handlers_for(self, topic: str) -> tuple[EventHandler, ...]:
+        """Handlers an emit on ``topic`` would reach, wildcard matches included."""
+        trie, routes = self._routing
+        handlers = routes.get(topic)
+        if handlers is None:
+            handlers = trie.resolve(topic)
+            if len(routes) >= self._ROUTE_CACHE_LIMIT:
+                routes.clear()
+            routes[topic] = handlers
+        return handlers
+
+    def configure_topic(
+        self,
+        topic: str,
+        *,
+        maxsize: int = 256,
+        overflow: OverflowPolicy = "block",
+        workers: int = 1,
+    ) -> None:
+        """Deliver ``topic`` from a bounded queue drained by worker threads.
+
+        ``overflow`` decides what happens when the queue is full: ``block`` waits
+        for room, ``drop_oldest`` evicts the oldest queued event and
+        ``drop_newest`` discards the event being emitted. A single worker keeps
+        events in emit order.
+        """
+        if maxsize < 1 or workers < 1:
+            raise ValueError("maxsize and workers must be positive")
+        with self._lock:
+            if topic in self._queues:
+                raise ValueError(f"Topic {topic!r} already dispatches asynchronously")
+            self._queues[topic] = _TopicQueue(topic, self._deliver, maxsize, overflow, workers)
+
+    def coalesce(
+        self,
+        topic: str,
+        *,
+        window: float = 0.0,
+        max_rate_hz: float | None = None,
+        leading: bool = False,
+        trailing: bool = True,
+    ) -> None:
+        """Deliver only the latest value of ``topic`` per window (see :class:`CoalescePolicy`).
+
+        Trailing deliveries run on the bus timer thread, or on the topic queue
+        when ``topic`` is also asynchronous.
+        """
+        policy = CoalescePolicy(
+            window=window, max_rate_hz=max_rate_hz, leading=leading, trailing=trailing
+        )
+        if policy.interval <= 0:
+            raise ValueError("coalescing needs a positive window or max_rate_hz")
+        if not (leading or trailing):
+            raise ValueError("coalescing needs a leading or trailing edge")
         with self._lock:
-            handlers = list(self._subscribers.get(topic, ()))
+            if topic in self._coalescers:
+                raise ValueError(f"Topic {topic!r} is already coalesced")
+            if self._scheduler is None:
+                self._scheduler = _Scheduler()
+            self._coalescers[topic] = _Coalescer(
+                policy, lambda payload: self._dispatch(topic, payload), self._scheduler
+            )
+
+    def coalesced_counts(self) -> dict[str, int]:
+        """Number of events discarded by coalescing, per topic."""
+        with self._lock:
+            return {topic: c.coalesced for topic, c in self._coalescers.items()}
+
+    def stats(self) -> dict[str, TopicStats]:
+        """Queue depth and drop counters for every asynchronous topic."""
+        with self._lock:
+            queues = list(self._queues.values())
+        return {queue.topic: queue.stats() for queue in queues}
+
+    def close(self, timeout: float | None = 1.0) -> None:
+        """Stop the coalescing timer, then drain and stop asynchronous topic workers."""
+        with self._lock:
+            scheduler, self._scheduler = self._scheduler, None
+            self._coalescers.clear()
+            queues = list(self._queues.values())
+            self._queues.clear()
+        if scheduler is not None:
+            scheduler.close()
+        for queue in queues:
+            queue.close(timeout)
+
+    def emit(self, topic: str, payload: Any) -> None:
+        for tap in self._taps:
+            tap(topic, payload)
+        coalescer = self._coalescers.get(topic)
+        if coalescer is not None:
+            coalescer.offer(payload)
+            return
+        self._dispatch(topic, payload)
+
+    def _dispatch(self, topic: str, payload: Any) -> None:
+        queue = self._queues.get(topic)
+        if queue is not None:
+            queue.put(payload)
+            return
+        self._deliver(topic, payload)
+
+    def _deliver(self, topic: str, payload: Any) -> None:
+        handlers = self._routing[1].get(topic)
+        if handlers is None:
+            handlers = self.handlers_for(topic)
         for handler in handlers:
             handler(payload)
+
+    def _rebuild_routes(self) -> None:
+        """Recompile the pattern trie and start an empty route cache (lock held)."""
+        self._routing = (_TopicTrie.build(self._subscribers), {})
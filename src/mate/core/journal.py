@@ -0,0 +1,218 @@
+"""Append-only binary journal of bus events with mmap-backed replay.
+
+Segment layout::
+
+    MAGIC (8 bytes)
+    record*: <timestamp f64><topic_len u16><payload_len u32><topic utf-8><payload pickle>
+
+Timestamps come from ``time.monotonic`` so replays preserve relative timing
+only; payloads are pickled, which covers the dataclasses and pydantic models
+currently emitted on the bus. Pickling and writing happen on a writer thread,
+so, as with async subscribers, payloads must not be mutated after ``emit``.
+"""
+
+from __future__ import annotations
+
+import mmap
+import pickle
+import queue
+import re
+import struct
+import threading
+import time
+from collections.abc import Iterator
+from dataclasses import dataclass
+from pathlib import Path
+from typing import IO, Any
+
+from mate.core.events import EventBus
+from mate.logging import get_logger
+
+MAGIC = b"MATEJNL1"
+SEGMENT_SUFFIX = ".mjl"
+_RECORD = struct.Struct("<dHI")
+_SEGMENT_NAME = re.compile(r"events-(\d+)\.mjl$")
+
+
+@dataclass(slots=True)
+class JournalRecord:
+    timestamp: float
+    topic: str
+    payload: Any
+
+
+class EventJournal:
+    """Bus tap that appends every emitted event to rotating segment files.
+
+    The tap only enqueues; one writer thread pickles and writes in batches.
+    Events arriving while ``queue_size`` are already waiting are dropped.
+    """
+
+    def __init__(
+        self,
+        directory: Path,
+        segment_bytes: int = 16 * 1024 * 1024,
+        max_segments: int = 8,
+        queue_size: int = 4096,
+    ) -> None:
+        self.directory = directory
+        self.segment_bytes = segment_bytes
+        self.max_segments = max_segments
+        self.logger = get_logger("journal")
+        self.recorded = 0
+        self.skipped = 0  # unpicklable payloads
+        self.dropped = 0  # queue full
+        self._lock = threading.Lock()
+        self._file: IO[bytes] | None = None
+        self._size = 0
+        self._events: EventBus | None = None
+        existing = segments(directory)
+        self._index = _segment_index(existing[-1]) if existing else 0
+        self._queue: queue.Queue[tuple[float, str, Any] | None] = queue.Queue(queue_size)
+        self._thread = threading.Thread(target=self._run, name="mate-journal", daemon=True)
+        self._thread.start()
+
+    def attach(self, events: EventBus) -> None:
+        self._events = events
+        events.add_tap(self.record)
+
+    def close(self, timeout: float = 2.0) -> None:
+        if self._events is not None:
+            self._events.remove_tap(self.record)
+            self._events = None
+        if self._thread.is_alive():
+            try:
+                self._queue.put(None, timeout=timeout)
+            except queue.Full:
+                pass
+            self._thread.join(timeout)
+        with self._lock:
+            if self._file is not None:
+                self._file.close()
+                self._file = None
+
+    def flush(self) -> None:
+        """Wait until every queued event is written and flushed."""
+        if self._thread.is_alive():
+            self._queue.join()
+
+    def record(self, topic: str, payload: Any) -> None:
+        try:
+            self._queue.put_nowait((time.monotonic(), topic, payload))
+        except queue.Full:
+            with self._lock:
+                self.dropped += 1
+
+    def _run(self) -> None:
+        while True:
+            batch = [self._queue.get()]
+            # Drain whatever else is waiting so each wake-up flushes once
+            while len(batch) < 512:
+                try:
+                    batch.append(self._queue.get_nowait())
+                except queue.Empty:
+                    break
+            stop = False
+            with self._lock:
+                for item in batch:
+                    if item is None:
+                        stop = True
+                    else:
+                        self._write(*item)
+                if self._file is not None:
+                    self._file.flush()
+            for _ in batch:
+                self._queue.task_done()
+            if stop:
+                return
+
+    def _write(self, timestamp: float, topic: str, payload: Any) -> None:
+        """Append one record (lock held)."""
+        try:
+            body = pickle.dumps(payload, protocol=pickle.HIGHEST_PROTOCOL)
+        except Exception as e:
+            self.skipped += 1
+            self.logger.debug("Skipping unpicklable payload on {}: {}", topic, e)
+            return
+        name = topic.encode("utf-8")
+        header = _RECORD.pack(timestamp, len(name), len(body))
+        size = len(header) + len(name) + len(body)
+        try:
+            if self._file is None or self._size + size > self.segment_bytes:
+                self._rotate()
+            self._file.write(header)
+            self._file.write(name)
+            self._file.write(body)
+        except OSError as e:
+            self.logger.error("Event journal write failed: {}", e)
+            return
+        self._size += size
+        self.recorded += 1
+
+    def _rotate(self) -> None:
+        """Start a new segment and prune the oldest ones (lock held)."""
+        if self._file is not None:
+            self._file.close()
+        self.directory.mkdir(parents=True, exist_ok=True)
+        self._index += 1
+        path = self.directory / f"events-{self._index:06d}{SEGMENT_SUFFIX}"
+        self._file = path.open("wb")
+        self._file.write(MAGIC)
+        self._size = len(MAGIC)
+        for stale in segments(self.directory)[: -self.max_segments]:
+            stale.unlink(missing_ok=True)
+
+
+def segments(directory: Path) -> list[Path]:
+    """Journal segments in ``directory``, oldest first."""
+    if not directory.exists():
+        return []
+    return sorted(
+        (path for path in directory.iterdir() if _SEGMENT_NAME.search(path.name)),
+        key=_segment_index,
+    )
+
+
+def _segment_index(path: Path) -> int:
+    match = _SEGMENT_NAME.search(path.name)
+    return int(match.group(1)) if match else 0
+
+
+def read_segment(path: Path) -> Iterator[JournalRecord]:
+    """Yield records from a memory-mapped segment; a torn trailing record ends iteration."""
+    with path.open("rb") as handle, mmap.mmap(handle.fileno(), 0, access=mmap.ACCESS_READ) as view:
+        if view[: len(MAGIC)] != MAGIC:
+            raise ValueError(f"Not a mate event journal: {path}")
+        offset = len(MAGIC)
+        end = len(view)
+        while offset + _RECORD.size <= end:
+            timestamp, topic_len, payload_len = _RECORD.unpack_from(view, offset)
+            offset += _RECORD.size
+            if offset + topic_len + payload_len > end:
+                break
+            topic = view[offset : offset + topic_len].decode("utf-8")
+            offset += topic_len
+            payload = pickle.loads(view[offset : offset + payload_len])
+            offset += payload_len
+            yield JournalRecord(timestamp, topic, payload)
+
+
+def replay(events: EventBus, path: Path, speed: float | None = 1.0) -> int:
+    """Re-emit a segment on ``events`` and return the number of events replayed.
+
+    ``speed`` scales the recorded inter-event gaps (``2.0`` replays twice as
+    fast); ``None`` emits back to back at maximum speed.
+    """
+    count = 0
+    first: float | None = None
+    started = time.monotonic()
+    for record in read_segment(path):
+        if speed is not None:
+            if first is None:
+                first = record.timestamp
+            delay = (record.timestamp - first) / speed - (time.monotonic() - started)
+            if delay > 0:
+                time.sleep(delay)
+        events.emit(record.topic, record.payload)
+        count += 1
+    return count
@@ -2,7 +2,12 @@
 
 from __future__ import annotations
 
+import threading
+from collections.abc import Callable
 from dataclasses import dataclass, field
+from typing import Any, ClassVar
+
+StateObserver = Callable[["StateDiff"], None]
 
 
 @dataclass(slots=True)
@@ -12,6 +17,107 @@ class RuntimeFlags:
     stealth_mode: bool = True
 
 
+@dataclass(slots=True)
+class StateDiff:
+    """Net changes since the previous flush: field -> (old, new)."""
+
+    version: int
+    changes: dict[str, tuple[Any, Any]]
+
+    def __contains__(self, name: str) -> bool:
+        return name in self.changes
+
+    def new(self, name: str) -> Any:
+        return self.changes[name][1]
+
+
+class ObservableState:
+    """Versioned store whose writes are batched into one diff per flush.
+
+    Subclasses declare their fields in ``__slots__`` and defaults in
+    ``_defaults``. Assigning a field records it in the pending change-set; the
+    first write after a flush asks the scheduler (e.g. ``QtBridge.call_soon``)
+    to run :meth:`flush` once, so observers see a single diff per event-loop
+    tick no matter how many writes happened. Writes that end up back at the
+    original value cancel out.
+    """
+
+    __slots__ = ("_pending", "_observers", "_schedule", "_lock", "version", "writes", "flushes")
+    _defaults: ClassVar[dict[str, Any]] = {}
+
+    def __init__(self, **values: Any) -> None:
+        object.__setattr__(self, "_pending", {})
+        object.__setattr__(self, "_observers", ())
+        object.__setattr__(self, "_schedule", None)
+        object.__setattr__(self, "_lock", threading.Lock())
+        object.__setattr__(self, "version", 0)
+        object.__setattr__(self, "writes", 0)
+        object.__setattr__(self, "flushes", 0)
+        unknown = values.keys() - self._defaults.keys()
+        if unknown:
+            raise TypeError(f"Unknown state fields: {', '.join(sorted(unknown))}")
+        for name, default in self._defaults.items():
+            object.__setattr__(self, name, values.get(name, default))
+
+    def __setattr__(self, name: str, value: Any) -> None:
+        if name not in self._defaults:
+            raise AttributeError(f"{type(self).__name__} has no state field {name!r}")
+        with self._lock:
+            old = getattr(self, name)
+            object.__setattr__(self, name, value)
+            object.__setattr__(self, "writes", self.writes + 1)
+            first = not self._pending
+            original = self._pending.setdefault(name, old)
+            if original == value:
+                del self._pending[name]
+            schedule = self._schedule if first and self._pending else None
+        if schedule is not None:
+            schedule(self.flush)
+
+    def set_scheduler(self, schedule: Callable[[Callable[[], None]], None] | None) -> None:
+        """Choose how a pending flush is scheduled; ``None`` means flush manually."""
+        object.__setattr__(self, "_schedule", schedule)
+
+    def subscribe(self, observer: StateObserver) -> None:
+        with self._lock:
+            if observer not in self._observers:
+                object.__setattr__(self, "_observers", (*self._observers, observer))
+
+    def unsubscribe(self, observer: StateObserver) -> None:
+        with self._lock:
+            remaining = tuple(o for o in self._observers if o != observer)
+            object.__setattr__(self, "_observers", remaining)
+
+    def flush(self) -> StateDiff | None:
+        """Deliver the pending change-set to observers as one diff."""
+        with self._lock:
+            if not self._pending:
+                return None
+            pending = self._pending
+            object.__setattr__(self, "_pending", {})
+            object.__setattr__(self, "version", self.version + 1)
+            object.__setattr__(self, "flushes", self.flushes + 1)
+            diff = StateDiff(
+                self.version, {name: (old, getattr(self, name)) for name, old in pending.items()}
+            )
+            observers = self._observers
+        for observer in observers:
+            observer(diff)
+        return diff
+
+
+class UIState(ObservableState):
+    """Window presentation state shared by the shell's input handlers."""
+
+    __slots__ = ("opacity", "theme", "view_mode")
+    _defaults: ClassVar[dict[str, Any]] = {
+        "opacity": 0.5,
+        "theme": "light",
+        "view_mode": "chatgpt",
+    }
+
+
 @dataclass(slots=True)
 class RuntimeState:
     flags: RuntimeFlags = field(default_factory=RuntimeFlags)
+    ui: UIState = field(default_factory=UIState)
@@ -0,0 +1,290 @@
+"""Forward bus topics to and from other processes over local sockets.
+
+Messages travel over ``multiprocessing.connection`` (Unix-domain sockets on
+POSIX, named pipes on Windows). Payloads are pickled with protocol 5 and any
+buffer of at least ``oob_threshold`` bytes (numpy arrays, ``bytearray``) is
+sent out-of-band straight from its memory instead of being copied into the
+pickle stream. Out-of-band buffers arrive as read-only ``bytes``-backed
+objects.
+
+``RemoteHub`` can publish its address and authkey to an owner-only
+connection file that workers pass to ``read_connection_file``.
+"""
+
+from __future__ import annotations
+
+import json
+import os
+import pickle
+import queue
+import secrets
+import socket
+import struct
+import sys
+import tempfile
+import threading
+from collections.abc import Callable, Iterable
+from multiprocessing.connection import Client, Connection, Listener
+from pathlib import Path
+from typing import Any
+
+from mate.core.events import EventBus, TopicFilter
+from mate.logging import get_logger
+
+_FRAME = struct.Struct("<I")
+
+logger = get_logger("transport")
+
+
+def default_address(name: str) -> str:
+    """Platform-appropriate local socket address for ``name``."""
+    if sys.platform == "win32":
+        return rf"\\.\pipe\mate-{name}"
+    return str(Path(tempfile.gettempdir()) / f"mate-{name}.sock")
+
+
+class SocketTransport:
+    """Framed topic/payload messages over one local connection."""
+
+    def __init__(self, connection: Connection, oob_threshold: int = 64 * 1024) -> None:
+        self.oob_threshold = oob_threshold
+        self._connection = connection
+        self._send_lock = threading.Lock()
+
+    @classmethod
+    def connect(cls, address: str, authkey: bytes, **kwargs: Any) -> SocketTransport:
+        return cls(Client(address, authkey=authkey), **kwargs)
+
+    def send(self, topic: str, payload: Any) -> None:
+        buffers: list[pickle.PickleBuffer] = []
+
+        def out_of_band(buffer: pickle.PickleBuffer) -> bool:
+            # Returning False keeps the buffer out of the pickle stream.
+            if buffer.raw().nbytes < self.oob_threshold:
+                return True
+            buffers.append(buffer)
+            return False
+
+        frame = pickle.dumps((topic, payload), protocol=5, buffer_callback=out_of_band)
+        with self._send_lock:
+            self._connection.send_bytes(_FRAME.pack(len(buffers)) + frame)
+            for buffer in buffers:
+                self._connection.send_bytes(buffer.raw())
+
+    def recv(self) -> tuple[str, Any]:
+        """Block for the next message; raises ``EOFError`` once the peer is gone."""
+        header = self._connection.recv_bytes()
+        (count,) = _FRAME.unpack_from(header)
+        buffers = [self._connection.recv_bytes() for _ in range(count)]
+        topic, payload = pickle.loads(memoryview(header)[_FRAME.size :], buffers=buffers)
+        return topic, payload
+
+    def close(self) -> None:
+        if sys.platform != "win32":
+            # Closing the descriptor alone neither wakes a recv() blocked on it in
+            # another thread nor tells the peer; shutting the socket down does both.
+            try:
+                fd = self._connection.fileno()
+                with socket.socket(fileno=os.dup(fd)) as sock:
+                    sock.shutdown(socket.SHUT_RDWR)
+            except OSError:
+                pass  # already closed, or the peer is gone
+        self._connection.close()
+
+
+class RemoteLink:
+    """Bridge one transport to a local bus.
+
+    Local emits on ``outbound`` patterns are sent to the peer; messages from
+    the peer on ``inbound`` patterns are emitted locally. Events received from
+    the peer are never sent back to it, so subscribe/emit code does not need
+    to know which side of the link it runs on.
+
+    Outbound events are queued and sent by the link's own thread, so a slow
+    peer never blocks the emitter; once ``queue_size`` events are waiting,
+    further ones are dropped. When the peer goes away the link shuts itself
+    down and calls ``on_lost`` once.
+    """
+
+    def __init__(
+        self,
+        events: EventBus,
+        transport: SocketTransport,
+        outbound: Iterable[str],
+        inbound: Iterable[str] = ("#",),
+        queue_size: int = 1024,
+        on_lost: Callable[[RemoteLink], None] | None = None,
+    ) -> None:
+        self.events = events
+        self.on_lost = on_lost
+        self.transport = transport
+        self.outbound = TopicFilter(tuple(outbound))
+        self.inbound = TopicFilter(tuple(inbound))
+        self.sent = 0
+        self.received = 0
+        self.dropped = 0
+        self._receiving = threading.local()
+        self._closed = False
+        self._lost = False
+        self._lost_lock = threading.Lock()
+        self._outgoing: queue.Queue[tuple[str, Any] | None] = queue.Queue(queue_size)
+        self._thread = threading.Thread(target=self._run, name="mate-transport-rx", daemon=True)
+        self._sender = threading.Thread(target=self._send, name="mate-transport-tx", daemon=True)
+
+    def start(self) -> RemoteLink:
+        self.events.add_tap(self._forward)
+        self._thread.start()
+        self._sender.start()
+        return self
+
+    def close(self) -> None:
+        self._closed = True
+        self.events.remove_tap(self._forward)
+        try:
+            self._outgoing.put_nowait(None)
+        except queue.Full:
+            pass  # the sender sees _closed after its current send
+        self.transport.close()
+
+    def _forward(self, topic: str, payload: Any) -> None:
+        if topic not in self.outbound or getattr(self._receiving, "active", False):
+            return
+        try:
+            self._outgoing.put_nowait((topic, payload))
+        except queue.Full:
+            self.dropped += 1
+
+    def _send(self) -> None:
+        while (item := self._outgoing.get()) is not None and not self._closed:
+            topic, payload = item
+            try:
+                self.transport.send(topic, payload)
+                self.sent += 1
+            except (OSError, EOFError) as e:
+                if not self._closed:
+                    logger.warning("Remote peer gone, stopped sending after {}: {}", topic, e)
+                self._disconnected()
+                return
+
+    def _run(self) -> None:
+        self._receiving.active = True
+        while not self._closed:
+            try:
+                topic, payload = self.transport.recv()
+            except (OSError, EOFError):
+                break
+            if topic in self.inbound:
+                self.received += 1
+                try:
+                    self.events.emit(topic, payload)
+                except Exception as e:
+                    logger.error("Error handling remote event {}: {}", topic, e)
+        self._disconnected()
+
+    def _disconnected(self) -> None:
+        """Stop forwarding and both threads once either side of the link fails."""
+        with self._lost_lock:
+            if self._lost:
+                return
+            self._lost = True
+        self.events.remove_tap(self._forward)
+        try:
+            self._outgoing.put_nowait(None)  # stop the sender too
+        except queue.Full:
+            self._closed = True  # the sender sees it after its current send
+        self.transport.close()  # and wakes a receiver still blocked in recv
+        if self.on_lost is not None:
+            self.on_lost(self)
+
+
+class RemoteHub:
+    """Accept worker processes on a local address and link each to the bus.
+
+    With ``connection_file`` the address and authkey are written there,
+    readable by the owner only, and the file is removed again on close.
+    """
+
+    def __init__(
+        self,
+        events: EventBus,
+        outbound: Iterable[str],
+        address: str | None = None,
+        authkey: bytes | None = None,
+        connection_file: Path | None = None,
+    ) -> None:
+        self.events = events
+        self.outbound = tuple(outbound)
+        self.address = address or default_address(f"events-{os.getpid()}")
+        self.authkey = authkey or secrets.token_bytes(16)
+        self.connection_file = connection_file
+        self.links: list[RemoteLink] = []
+        self._links_lock = threading.Lock()
+        self._listener = Listener(self.address, authkey=self.authkey)
+        self._closed = False
+        if connection_file is not None:
+            _write_connection_file(connection_file, self.address, self.authkey)
+        self._thread = threading.Thread(target=self._accept, name="mate-transport-hub", daemon=True)
+        self._thread.start()
+        logger.info("Remote event hub listening on {}", self.address)
+
+    def close(self) -> None:
+        self._closed = True
+        with self._links_lock:
+            links = list(self.links)
+        for link in links:
+            link.close()
+        self._listener.close()
+        if self.connection_file is not None:
+            self.connection_file.unlink(missing_ok=True)
+
+    def _accept(self) -> None:
+        while not self._closed:
+            try:
+                connection = self._listener.accept()
+            except (OSError, EOFError) as e:
+                if not self._closed:
+                    logger.warning("Remote event hub stopped accepting: {}", e)
+                return
+            except Exception as e:  # failed handshake, e.g. wrong authkey
+                logger.warning("Rejected remote event peer: {}", e)
+                continue
+            link = RemoteLink(
+                self.events, SocketTransport(connection), self.outbound, on_lost=self._drop
+            )
+            with self._links_lock:
+                self.links.append(link)
+            link.start()
+
+    def _drop(self, link: RemoteLink) -> None:
+        with self._links_lock:
+            if link in self.links:
+                self.links.remove(link)
+
+
+def _write_connection_file(path: Path, address: str, authkey: bytes) -> None:
+    path.parent.mkdir(parents=True, exist_ok=True)
+    tmp = path.with_name(f".{path.name}.tmp")
+    tmp.unlink(missing_ok=True)
+    # Created owner-only, so the authkey is never readable by other users
+    fd = os.open(tmp, os.O_WRONLY | os.O_CREAT | os.O_EXCL, 0o600)
+    with os.fdopen(fd, "w", encoding="utf-8") as handle:
+        json.dump({"address": address, "authkey": authkey.hex()}, handle)
+    os.replace(tmp, path)
+
+
+def read_connection_file(path: Path) -> tuple[str, bytes]:
+    """``(address, authkey)`` of a running hub, as published to its connection file."""
+    data = json.loads(path.read_text(encoding="utf-8"))
+    return data["address"], bytes.fromhex(data["authkey"])
+
+
+def connect_bus(
+    events: EventBus,
+    address: str,
+    authkey: bytes,
+    outbound: Iterable[str],
+    inbound: Iterable[str] = ("#",),
+) -> RemoteLink:
+    """Link a worker process's bus to the hub at ``address``."""
+    transport = SocketTransport.connect(address, authkey)
+    return RemoteLink(events, transport, outbound, inbound).start()
@@ -0,0 +1,124 @@
+"""Debounced, atomic persistence of user settings."""
+
+from __future__ import annotations
+
+import json
+import os
+import threading
+import time
+from pathlib import Path
+
+from mate.config import MateSettings, SettingsFileError, check_settings_file, dump_settings
+from mate.logging import get_logger
+
+
+class SettingsStore:
+    """Write settings to ``settings.json`` once changes have gone quiet.
+
+    :meth:`save` only records the request and returns immediately; a
+    background thread waits until no save has arrived for ``delay`` seconds,
+    snapshots the settings and writes them to a temporary file that is then
+    renamed over the target, so readers never see a partial file. A burst of
+    opacity-wheel updates therefore costs a single write.
+    """
+
+    def __init__(self, path: Path, delay: float = 0.5) -> None:
+        self.path = path
+        self.delay = delay
+        self.logger = get_logger("settings-store")
+        self.requests = 0
+        self.writes = 0
+        self._pending: MateSettings | None = None
+        self._deadline = 0.0
+        self._closed = False
+        self._cond = threading.Condition()
+        self._write_lock = threading.Lock()
+        self._written: tuple[int, int] | None = None
+        self._thread: threading.Thread | None = None
+
+    def save(self, settings: MateSettings) -> None:
+        with self._cond:
+            if self._closed:
+                return
+            self.requests += 1
+            self._pending = settings
+            self._deadline = time.monotonic() + self.delay
+            if self._thread is None:
+                self._thread = threading.Thread(
+                    target=self._run, name="mate-settings-store", daemon=True
+                )
+                self._thread.start()
+            self._cond.notify()
+
+    def flush(self) -> None:
+        """Write any pending settings now."""
+        with self._cond:
+            settings, self._pending = self._pending, None
+        if settings is not None:
+            self._write(settings)
+
+    def close(self) -> None:
+        with self._cond:
+            self._closed = True
+            self._cond.notify()
+        if self._thread is not None:
+            self._thread.join(timeout=2)
+        self.flush()
+
+    def wrote(self, path: Path) -> bool:
+        """Whether ``path`` is currently exactly the file this store last wrote.
+
+        Waits for a write in progress, so a watcher notified right after the
+        rename still recognises the file as ours.
+        """
+        if Path(path).resolve() != self.path.resolve():
+            return False
+        with self._write_lock:
+            if self._written is None:
+                return False
+            try:
+                stat = self.path.stat()
+            except OSError:
+                return False
+            return (stat.st_mtime_ns, stat.st_size) == self._written
+
+    def _run(self) -> None:
+        while True:
+            with self._cond:
+                while self._pending is None and not self._closed:
+                    self._cond.wait()
+                if self._closed:
+                    return  # close() flushes whatever is left
+                remaining = self._deadline - time.monotonic()
+                if remaining > 0:
+                    self._cond.wait(remaining)
+                    continue
+                settings, self._pending = self._pending, None
+            self._write(settings)
+
+    def _write(self, settings: MateSettings) -> None:
+        # Environment overrides are not persisted; their keys keep the file's value
+        try:
+            stored = check_settings_file(self.path)
+        except SettingsFileError as e:
+            # Whatever failed to load is not in memory; writing would lose it for good
+            self.logger.error("Not saving settings over a file that failed to load: {}", e)
+            return
+        data = json.dumps(dump_settings(settings, stored), indent=2, sort_keys=True)
+        # Dot-prefixed so the settings watcher ignores the temporary file
+        tmp = self.path.with_name(f".{self.path.name}.tmp")
+        with self._write_lock:
+            try:
+                self.path.parent.mkdir(parents=True, exist_ok=True)
+                with tmp.open("w", encoding="utf-8") as handle:
+                    handle.write(data)
+                    handle.flush()
+                    os.fsync(handle.fileno())
+                os.replace(tmp, self.path)
+                stat = self.path.stat()
+            except OSError as e:
+                self.logger.error("Failed to save settings to {}: {}", self.path, e)
+                return
+            self._written = (stat.st_mtime_ns, stat.st_size)
+            self.writes += 1
+        self.logger.debug("Saved settings to {}", self.path)
@@ -0,0 +1,204 @@
+"""SQLite-backed snippet library.
+
+Only the compact ``(id, trigger, scope)`` rows are loaded to build matchers;
+replacement bodies stay on disk and are fetched by id when a snippet fires,
+through a small LRU cache. The database runs in WAL mode so usage-count
+updates never block readers.
+"""
+
+from __future__ import annotations
+
+import threading
+import time
+from collections import OrderedDict
+from collections.abc import Iterable, Iterator
+from dataclasses import dataclass
+from pathlib import Path
+
+from sqlalchemy import (
+    Column,
+    Float,
+    Index,
+    Integer,
+    MetaData,
+    Table,
+    Text,
+    create_engine,
+    delete,
+    event,
+    func,
+    select,
+    update,
+)
+from sqlalchemy.dialects.sqlite import insert
+
+from mate.logging import get_logger
+
+GLOBAL_SCOPE = ""
+_BULK_LOOKUP = 64  # above this many rows, ids are read back with one scan of their scopes
+
+metadata = MetaData()
+
+snippets_table = Table(
+    "snippets",
+    metadata,
+    Column("id", Integer, primary_key=True),
+    Column("trigger", Text, nullable=False),
+    Column("scope", Text, nullable=False, default=GLOBAL_SCOPE),
+    Column("replacement", Text, nullable=False),
+    Column("usage_count", Integer, nullable=False, default=0),
+    Column("last_used", Float),
+    Column("created", Float, nullable=False),
+    Index("ix_snippets_scope_trigger", "scope", "trigger", unique=True),
+    Index("ix_snippets_usage", "usage_count"),
+)
+
+
+@dataclass(slots=True, frozen=True)
+class TriggerRow:
+    id: int
+    trigger: str
+    scope: str
+
+
+class SnippetRepository:
+    """Snippet storage with indexed trigger lookup and lazily loaded bodies."""
+
+    def __init__(self, path: Path, body_cache_size: int = 256) -> None:
+        self.path = path
+        self.body_cache_size = body_cache_size
+        self.logger = get_logger("snippet-repository")
+        path.parent.mkdir(parents=True, exist_ok=True)
+        # Connections are handed between the UI, hook and worker threads
+        self._engine = create_engine(f"sqlite:///{path}", connect_args={"check_same_thread": False})
+        event.listen(self._engine, "connect", _configure_connection)
+        metadata.create_all(self._engine)
+        self._bodies: OrderedDict[int, str] = OrderedDict()
+        self._lock = threading.Lock()
+        self.body_hits = 0
+        self.body_misses = 0
+
+    def close(self) -> None:
+        self._engine.dispose()
+
+    def __len__(self) -> int:
+        with self._engine.connect() as connection:
+            query = select(func.count()).select_from(snippets_table)
+            return connection.execute(query).scalar_one()
+
+    def triggers(self, scope: str | None = None) -> Iterator[TriggerRow]:
+        """Stream trigger rows (all scopes unless ``scope`` is given) without bodies."""
+        query = select(snippets_table.c.id, snippets_table.c.trigger, snippets_table.c.scope)
+        if scope is not None:
+            query = query.where(snippets_table.c.scope == scope)
+        with self._engine.connect() as connection:
+            for row in connection.execute(query.order_by(snippets_table.c.id)):
+                yield TriggerRow(row.id, row.trigger, row.scope)
+
+    def body(self, snippet_id: int) -> str | None:
+        with self._lock:
+            body = self._bodies.get(snippet_id)
+            if body is not None:
+                self._bodies.move_to_end(snippet_id)
+                self.body_hits += 1
+                return body
+            self.body_misses += 1
+        query = select(snippets_table.c.replacement).where(snippets_table.c.id == snippet_id)
+        with self._engine.connect() as connection:
+            body = connection.execute(query).scalar_one_or_none()
+        if body is not None:
+            self._remember(snippet_id, body)
+        return body
+
+    def find(self, trigger: str, scope: str = GLOBAL_SCOPE) -> int | None:
+        query = select(snippets_table.c.id).where(
+            snippets_table.c.scope == scope, snippets_table.c.trigger == trigger
+        )
+        with self._engine.connect() as connection:
+            return connection.execute(query).scalar_one_or_none()
+
+    def add(self, trigger: str, replacement: str, scope: str = GLOBAL_SCOPE) -> int:
+        """Insert or update a snippet and return its id."""
+        return self.add_many([(trigger, replacement, scope)])[0]
+
+    def add_many(self, snippets: Iterable[tuple[str, str, str]]) -> list[int]:
+        """Upsert ``(trigger, replacement, scope)`` rows in one transaction; return their ids."""
+        now = time.time()
+        rows = [
+            {"trigger": trigger, "replacement": replacement, "scope": scope, "created": now}
+            for trigger, replacement, scope in snippets
+        ]
+        if not rows:
+            return []
+        statement = insert(snippets_table)
+        statement = statement.on_conflict_do_update(
+            index_elements=["scope", "trigger"],
+            set_={"replacement": statement.excluded.replacement},
+        )
+        columns = snippets_table.c
+        with self._engine.begin() as connection:
+            connection.execute(statement, rows)
+            if len(rows) <= _BULK_LOOKUP:
+                # Small batches: one indexed lookup per row
+                result = [
+                    connection.execute(
+                        select(columns.id).where(
+                            columns.scope == row["scope"], columns.trigger == row["trigger"]
+                        )
+                    ).scalar_one()
+                    for row in rows
+                ]
+            else:
+                query = select(columns.id, columns.scope, columns.trigger).where(
+                    columns.scope.in_({row["scope"] for row in rows})
+                )
+                ids = {(scope, trigger): id_ for id_, scope, trigger in connection.execute(query)}
+                result = [ids[(row["scope"], row["trigger"])] for row in rows]
+        with self._lock:
+            for snippet_id in result:
+                self._bodies.pop(snippet_id, None)
+        return result
+
+    def remove(self, trigger: str, scope: str = GLOBAL_SCOPE) -> int | None:
+        """Delete a snippet and return the id it had."""
+        statement = (
+            delete(snippets_table)
+            .where(snippets_table.c.scope == scope, snippets_table.c.trigger == trigger)
+            .returning(snippets_table.c.id)
+        )
+        with self._engine.begin() as connection:
+            snippet_id = connection.execute(statement).scalar_one_or_none()
+        if snippet_id is not None:
+            with self._lock:
+                self._bodies.pop(snippet_id, None)
+        return snippet_id
+
+    def record_use(self, snippet_id: int) -> None:
+        statement = (
+            update(snippets_table)
+            .where(snippets_table.c.id == snippet_id)
+            .values(usage_count=snippets_table.c.usage_count + 1, last_used=time.time())
+        )
+        with self._engine.begin() as connection:
+            connection.execute(statement)
+
+    def usage(self, snippet_id: int) -> int:
+        query = select(snippets_table.c.usage_count).where(snippets_table.c.id == snippet_id)
+        with self._engine.connect() as connection:
+            return connection.execute(query).scalar_one_or_none() or 0
+
+    def _remember(self, snippet_id: int, body: str) -> None:
+        if self.body_cache_size <= 0:
+            return
+        with self._lock:
+            self._bodies[snippet_id] = body
+            self._bodies.move_to_end(snippet_id)
+            while len(self._bodies) > self.body_cache_size:
+                self._bodies.popitem(last=False)
+
+
+def _configure_connection(dbapi_connection, _record) -> None:
+    cursor = dbapi_connection.cursor()
+    cursor.execute("PRAGMA journal_mode=WAL")
+    cursor.execute("PRAGMA synchronous=NORMAL")
+    cursor.close()
@@ -1,45 +1,421 @@
-"""Central logging configuration using loguru."""
+"""Central logging configuration using loguru.
+
+In the default ``queued`` pipeline, loguru has a single sink that copies each
+record into a bounded queue and returns. A background writer formats records
+for the console and the rotating log files, so input threads never block on
+I/O; when the queue is full, records are dropped and counted. Per-context rate
+limits and sampling run before anything is queued, and a ring of recent
+records can be dumped when the process crashes.
+
+:func:`get_logger` hands out one :class:`ContextLogger` per context whose
+minimum level is resolved from ``LogSettings.levels`` and cached as a number,
+so a disabled call returns after a single comparison. Pass arguments
+brace-style (``log.debug("id={}", hotkey_id)``) rather than as f-strings so
+they are only formatted when the line is actually emitted.
+"""
 
 from __future__ import annotations
 
+import atexit
+import json
+import os
+import queue
+import random
+import sys
+import threading
+import time
+import traceback
+from collections import deque
+from collections.abc import Mapping
+from datetime import datetime
 from pathlib import Path
+from typing import IO, Any
+
 from loguru import logger
 
-from mate.config import MateSettings
+from mate.config import LogSettings, MateSettings
 
 _LOGGER_CONFIGURED = False
+_PIPELINE: LogPipeline | None = None
+_ALWAYS_KEEP = 30  # WARNING and above bypass rate limits and sampling
+_CONTEXTS: dict[str, ContextLogger] = {}
+_LEVELS: dict[str, str] = {}
+_CONTEXT_LEVEL = "DEBUG"
+
+
+class _RateLimiter:
+    """Per-context token buckets and sampling, checked on the emitting thread."""
+
+    def __init__(self, rate_limits: dict[str, float], sample: dict[str, float]) -> None:
+        self.rate_limits = dict(rate_limits)
+        self.sample = dict(sample)
+        self.suppressed: dict[str, int] = {}
+        self._buckets: dict[str, list[float]] = {}  # context -> [tokens, last refill]
+        self._lock = threading.Lock()
+
+    def allow(self, record: dict[str, Any]) -> bool:
+        if record["level"].no >= _ALWAYS_KEEP:
+            return True
+        context = record["extra"].get("context", "mate")
+        ratio = self.sample.get(context)
+        if ratio is not None and random.random() >= ratio:
+            return self._suppress(context)
+        rate = self.rate_limits.get(context)
+        if rate is None:
+            return True
+        now = time.monotonic()
+        with self._lock:
+            bucket = self._buckets.setdefault(context, [rate, now])
+            bucket[0] = min(rate, bucket[0] + (now - bucket[1]) * rate)
+            bucket[1] = now
+            if bucket[0] >= 1:
+                bucket[0] -= 1
+                return True
+        return self._suppress(context)
+
+    def _suppress(self, context: str) -> bool:
+        with self._lock:
+            self.suppressed[context] = self.suppressed.get(context, 0) + 1
+        return False
+
+
+class _RotatingFile:
+    """Size-based rotation: ``mate.log`` -> ``mate.log.1`` ... ``mate.log.<backups>``."""
+
+    def __init__(self, path: Path, max_bytes: int, backups: int) -> None:
+        self.path = path
+        self.max_bytes = max_bytes
+        self.backups = backups
+        self._handle: IO[str] = path.open("a", encoding="utf-8")
+        self._size = self._handle.tell()
+
+    def write(self, text: str) -> None:
+        if self._size + len(text) > self.max_bytes and self._size:
+            self._rotate()
+        self._handle.write(text)
+        self._size += len(text)
+
+    def flush(self) -> None:
+        self._handle.flush()
+
+    def close(self) -> None:
+        self._handle.close()
+
+    def _rotate(self) -> None:
+        self._handle.close()
+        for index in range(self.backups, 0, -1):
+            source = self.path if index == 1 else self._backup(index - 1)
+            if source.exists():
+                os.replace(source, self._backup(index))
+        if not self.backups:
+            self.path.unlink(missing_ok=True)
+        self._handle = self.path.open("a", encoding="utf-8")
+        self._size = 0
+
+    def _backup(self, index: int) -> Path:
+        return self.path.with_name(f"{self.path.name}.{index}")
+
+
+def _format_exception(record: dict[str, Any]) -> str:
+    exception = record["exception"]
+    if exception is None or exception.type is None:
+        return ""
+    return "".join(traceback.format_exception(exception.type, exception.value, exception.traceback))
+
+
+def _format_text(record: dict[str, Any]) -> str:
+    line = (
+        f"{record['time']:%Y-%m-%d %H:%M:%S.%f} | {record['level'].name: <8} | "
+        f"{record['extra'].get('context', 'mate')} | {record['message']}\n"
+    )
+    return line + _format_exception(record)
+
+
+def _format_json(record: dict[str, Any]) -> str:
+    entry: dict[str, Any] = {
+        "ts": record["time"].timestamp(),
+        "level": record["level"].name,
+        "ctx": record["extra"].get("context", "mate"),
+        "msg": record["message"],
+        "mod": record["name"],
+        "line": record["line"],
+        "thread": record["thread"].name,
+    }
+    if exc := _format_exception(record):
+        entry["exc"] = exc
+    return json.dumps(entry, separators=(",", ":"), default=str) + "\n"
+
+
+class LogPipeline:
+    """Bounded queue between loguru and the sinks, drained by one writer thread."""
+
+    def __init__(
+        self, settings: LogSettings, log_dir: Path, console: IO[str] | None = None
+    ) -> None:
+        self.settings = settings
+        self.log_dir = log_dir
+        self.console = console if console is not None else sys.stdout
+        self.console_level = logger.level(settings.level.upper()).no
+        self.limiter = _RateLimiter(settings.rate_limits, settings.sample)
+        self.recent: deque[dict[str, Any]] = deque(maxlen=settings.ring_size)
+        self.queued = 0
+        self.dropped = 0
+        self.written = 0
+        self._queue: queue.Queue[dict[str, Any] | None] = queue.Queue(settings.queue_size)
+        max_bytes = settings.file_max_mb * 1024 * 1024
+        self._text = _RotatingFile(log_dir / "mate.log", max_bytes, settings.file_backups)
+        self._json = (
+            _RotatingFile(log_dir / "mate.jsonl", max_bytes, settings.file_backups)
+            if settings.json_lines
+            else None
+        )
+        self._thread = threading.Thread(target=self._run, name="mate-log-writer", daemon=True)
+        self._thread.start()
+
+    def filter(self, record: dict[str, Any]) -> bool:
+        return self.limiter.allow(record)
+
+    def sink(self, message: Any) -> None:
+        record = message.record
+        self.recent.append(record)
+        try:
+            self._queue.put_nowait(record)
+            self.queued += 1
+        except queue.Full:
+            self.dropped += 1
+
+    def close(self, timeout: float = 2.0) -> None:
+        try:
+            self._queue.put(None, timeout=timeout)
+        except queue.Full:
+            pass
+        self._thread.join(timeout)
+        self._text.close()
+        if self._json is not None:
+            self._json.close()
+
+    def dump_recent(self, path: Path | None = None) -> Path:
+        """Write the ring of recent records to ``path`` (default: a timestamped crash log)."""
+        path = path or self.log_dir / f"crash-{datetime.now():%Y%m%d-%H%M%S}.log"
+        with path.open("w", encoding="utf-8") as handle:
+            for record in list(self.recent):
+                handle.write(_format_text(record))
+        return path
+
+    def _run(self) -> None:
+        while True:
+            record = self._queue.get()
+            batch = [record]
+            # Drain whatever else is waiting so each wake-up flushes once
+            while len(batch) < 512:
+                try:
+                    batch.append(self._queue.get_nowait())
+                except queue.Empty:
+                    break
+            stop = False
+            for item in batch:
+                if item is None:
+                    stop = True
+                    continue
+                self._write(item)
+            self._text.flush()
+            if self._json is not None:
+                self._json.flush()
+            try:
+                self.console.flush()
+            except (OSError, ValueError):
+                pass
+            if stop:
+                return
+
+    def _write(self, record: dict[str, Any]) -> None:
+        try:
+            text = _format_text(record)
+            self._text.write(text)
+            if self._json is not None:
+                self._json.write(_format_json(record))
+            if record["level"].no >= self.console_level:
+                self.console.write(text)
+            self.written += 1
+        except Exception as e:  # never let a bad record kill the writer
+            try:
+                sys.stderr.write(f"mate logging: failed to write record: {e}\n")
+            except (OSError, ValueError):
+                pass
+
+
+def _install_crash_dump(pipeline: LogPipeline) -> None:
+    previous_hook = sys.excepthook
+    previous_thread_hook = threading.excepthook
 
+    def dump(exc_type: type[BaseException], exc: BaseException, tb: Any) -> None:
+        try:
+            logger.opt(exception=(exc_type, exc, tb)).critical("Unhandled exception")
+            path = pipeline.dump_recent()
+            sys.stderr.write(f"mate crashed; recent log records saved to {path}\n")
+        except Exception:
+            pass
 
-def configure_logging(settings: MateSettings, level: str = "INFO") -> None:
-    """Route logs to stderr and rotating file only once."""
+    def excepthook(exc_type: type[BaseException], exc: BaseException, tb: Any) -> None:
+        dump(exc_type, exc, tb)
+        previous_hook(exc_type, exc, tb)
 
-    global _LOGGER_CONFIGURED
+    def thread_excepthook(args: threading.ExceptHookArgs) -> None:
+        if args.exc_type is not SystemExit:
+            dump(args.exc_type, args.exc_value, args.exc_traceback)
+        previous_thread_hook(args)
+
+    sys.excepthook = excepthook
+    threading.excepthook = thread_excepthook
+
+
+def configure_logging(settings: MateSettings, level: str | None = None) -> None:
+    """Route logs to stdout and rotating files only once."""
+
+    global _LOGGER_CONFIGURED, _PIPELINE
     if _LOGGER_CONFIGURED:
         return
 
+    log_settings = settings.logging
+    if level is not None:
+        log_settings = log_settings.model_copy(update={"level": level})
     log_dir: Path = settings.paths.logs_dir
     log_dir.mkdir(parents=True, exist_ok=True)
 
+    set_log_levels(log_settings.levels, log_settings.context_level)
     logger.remove()
-    logger.add(
-        sink=lambda msg: print(msg, end=""),
-        level=level,
-        colorize=True,
-        format="<green>{time:HH:mm:ss}</green> | <level>{level: <8}</level> | {message}",
-    )
-    logger.add(
-        log_dir / "mate.log",
-        level="DEBUG",
-        rotation="1 week",
-        retention=4,
-        compression="zip",
-        enqueue=True,
-        backtrace=True,
-        diagnose=True,
-    )
+    if log_settings.pipeline == "queued":
+        _PIPELINE = LogPipeline(log_settings, log_dir)
+        logger.add(_PIPELINE.sink, level="TRACE", format="{message}", filter=_PIPELINE.filter)
+        _install_crash_dump(_PIPELINE)
+        atexit.register(_PIPELINE.close)
+    else:
+        logger.add(
+            sink=lambda msg: print(msg, end=""),
+            level=log_settings.level,
+            colorize=True,
+            format="<green>{time:HH:mm:ss}</green> | <level>{level: <8}</level> | {message}",
+        )
+        logger.add(
+            log_dir / "mate.log",
+            level="DEBUG",
+            rotation=f"{log_settings.file_max_mb} MB",
+            retention=log_settings.file_backups,
+            enqueue=True,
+            backtrace=log_settings.diagnose,
+            diagnose=log_settings.diagnose,
+        )
 
     _LOGGER_CONFIGURED = True
 
 
-def get_logger(name: str | None = None):
-    return logger.bind(context=name or "mate")
+def apply_log_settings(settings: LogSettings) -> None:
+    """Apply reloaded log settings: context levels, rate limits and sampling."""
+    set_log_levels(settings.levels, settings.context_level)
+    if _PIPELINE is not None:
+        _PIPELINE.console_level = logger.level(settings.level.upper()).no
+        _PIPELINE.limiter.rate_limits = dict(settings.rate_limits)
+        _PIPELINE.limiter.sample = dict(settings.sample)
+
+
+def log_pipeline() -> LogPipeline | None:
+    """The active queued pipeline, if logging runs in ``queued`` mode."""
+    return _PIPELINE
+
+
+class ContextLogger:
+    """Logger handle for one context with a cached minimum level number.
+
+    Calls below the level return before loguru is involved; enabled calls are
+    forwarded with ``depth=1`` so records point at the caller. ``exc_info=True``
+    attaches the current exception, as in the standard library.
+    """
+
+    __slots__ = ("context", "no", "_logger")
+
+    def __init__(self, context: str, no: int) -> None:
+        self.context = context
+        self.no = no
+        self._logger = logger.bind(context=context)
+
+    def enabled(self, level: str) -> bool:
+        return logger.level(level).no >= self.no
+
+    def bind(self, **extra: Any):
+        return self._logger.bind(**extra)
+
+    def opt(self, **options: Any):
+        return self._logger.opt(**options)
+
+    def trace(self, message: str, *args: Any, **kwargs: Any) -> None:
+        if self.no <= 5:
+            self._log("TRACE", message, args, kwargs)
+
+    def debug(self, message: str, *args: Any, **kwargs: Any) -> None:
+        if self.no <= 10:
+            self._log("DEBUG", message, args, kwargs)
+
+    def info(self, message: str, *args: Any, **kwargs: Any) -> None:
+        if self.no <= 20:
+            self._log("INFO", message, args, kwargs)
+
+    def success(self, message: str, *args: Any, **kwargs: Any) -> None:
+        if self.no <= 25:
+            self._log("SUCCESS", message, args, kwargs)
+
+    def warning(self, message: str, *args: Any, **kwargs: Any) -> None:
+        if self.no <= 30:
+            self._log("WARNING", message, args, kwargs)
+
+    def error(self, message: str, *args: Any, **kwargs: Any) -> None:
+        if self.no <= 40:
+            self._log("ERROR", message, args, kwargs)
+
+    def critical(self, message: str, *args: Any, **kwargs: Any) -> None:
+        if self.no <= 50:
+            self._log("CRITICAL", message, args, kwargs)
+
+    def exception(self, message: str, *args: Any, **kwargs: Any) -> None:
+        if self.no <= 40:
+            kwargs["exc_info"] = True
+            self._log("ERROR", message, args, kwargs)
+
+    def _log(self, level: str, message: str, args: tuple[Any, ...], kwargs: dict[str, Any]) -> None:
+        exc_info = kwargs.pop("exc_info", False)
+        # depth=2 skips this helper and the level method
+        self._logger.opt(depth=2, exception=exc_info or None).log(level, message, *args, **kwargs)
+
+
+def _level_no(context: str) -> int:
+    return logger.level(_LEVELS.get(context, _CONTEXT_LEVEL).upper()).no
+
+
+def set_log_levels(levels: Mapping[str, str], context_level: str | None = None) -> None:
+    """Replace per-context levels and re-resolve every existing handle."""
+    global _CONTEXT_LEVEL
+    for level in (*levels.values(), context_level or _CONTEXT_LEVEL):
+        logger.level(level.upper())  # raises ValueError for unknown levels
+    _LEVELS.clear()
+    _LEVELS.update(levels)
+    if context_level is not None:
+        _CONTEXT_LEVEL = context_level
+    for handle in _CONTEXTS.values():
+        handle.no = _level_no(handle.context)
+
+
+def set_log_level(context: str, level: str | None) -> None:
+    """Change one context's level at runtime; ``None`` falls back to the default."""
+    levels = dict(_LEVELS)
+    if level is None:
+        levels.pop(context, None)
+    else:
+        levels[context] = level
+    set_log_levels(levels)
+
+
+def get_logger(name: str | None = None) -> ContextLogger:
+    context = name or "mate"
+    handle = _CONTEXTS.get(context)
+    if handle is None:
+        handle = _CONTEXTS.setdefault(context, ContextLogger(context, _level_no(context)))
+    return handle
@@ -21,7 +21,7 @@ chromium_flags = (
 )
 os.environ.setdefault("QTWEBENGINE_CHROMIUM_FLAGS", chromium_flags)
 
-from PySide6 import QtCore, QtWidgets
+from PySide6 import QtWidgets
 
 from mate.config import MateSettings, load_settings
 from mate.core.app import build_context
@@ -29,6 +29,18 @@ from mate.logging import configure_logging, get_logger
 from mate.ui.shell import MainWindow
 from mate.utils.process import SingleInstance
 
+# Hotkey action -> MainWindow slot run on the Qt main thread.
+HOTKEY_SLOTS: dict[str, str] = {
+    "hide_window": "_hideWindowSafe",
+    "show_window": "_showWindowSafe",
+    "panic_hide": "_panicQuitSafe",
+    "mute_audio": "_muteAudioSafe",
+    "unmute_audio": "_unmuteAudioSafe",
+    "increase_opacity": "_increaseOpacitySafe",
+    "decrease_opacity": "_decreaseOpacitySafe",
+    "toggle_view": "_toggleViewSafe",
+}
+
 
 def main() -> None:
     settings: MateSettings = load_settings()
@@ -42,78 +54,35 @@ def main() -> None:
 
         window = MainWindow(settings, ctx.events, ctx.state, ctx)
 
-        def hide_window(binding) -> None:  # noqa: ARG001
-            QtCore.QMetaObject.invokeMethod(
-                window,
-                "_hideWindowSafe",
-                QtCore.Qt.ConnectionType.QueuedConnection,
-            )
-
-        def show_window(binding) -> None:  # noqa: ARG001
-            QtCore.QMetaObject.invokeMethod(
-                window,
-                "_showWindowSafe",
-                QtCore.Qt.ConnectionType.QueuedConnection,
-            )
-
-        def panic_hide(binding) -> None:  # noqa: ARG001
-            QtCore.QMetaObject.invokeMethod(
-                window,
-                "_panicQuitSafe",
-                QtCore.Qt.ConnectionType.QueuedConnection,
-            )
-
-        def mute_audio(binding) -> None:  # noqa: ARG001
-            QtCore.QMetaObject.invokeMethod(
-                window,
-                "_muteAudioSafe",
-                QtCore.Qt.ConnectionType.QueuedConnection,
-            )
-
-        def unmute_audio(binding) -> None:  # noqa: ARG001
-            QtCore.QMetaObject.invokeMethod(
-                window,
-                "_unmuteAudioSafe",
-                QtCore.Qt.ConnectionType.QueuedConnection,
-            )
+        # Hotkeys fire off the main thread; the dispatcher hands each one to the
+        # window bridge once, and the callback then runs its slot directly.
+        for action, name in HOTKEY_SLOTS.items():
+            method = getattr(window, name)
+            ctx.hotkeys.register_callback(action, lambda _binding, method=method: method())
+        ctx.hotkeys.set_dispatcher(window.bridge.call_soon)
 
-        def increase_opacity(binding) -> None:  # noqa: ARG001
-            QtCore.QMetaObject.invokeMethod(
-                window,
-                "_increaseOpacitySafe",
-                QtCore.Qt.ConnectionType.QueuedConnection,
-            )
+        # Set Qt app for thread-safe hotkey callbacks
+        ctx.hotkeys.set_qt_app(app)
 
-        def decrease_opacity(binding) -> None:  # noqa: ARG001
-            QtCore.QMetaObject.invokeMethod(
-                window,
-                "_decreaseOpacitySafe",
-                QtCore.Qt.ConnectionType.QueuedConnection,
-            )
+        # Reloaded settings are applied on the main thread, which owns the hotkeys.
+        from mate.services.settings_watcher import SettingsWatcher
 
-        def toggle_view(binding) -> None:  # noqa: ARG001
-            QtCore.QMetaObject.invokeMethod(
-                window,
-                "_toggleViewSafe",
-                QtCore.Qt.ConnectionType.QueuedConnection,
+        watcher: SettingsWatcher | None = None
+        if settings.hot_reload:
+            watcher = SettingsWatcher(
+                settings.paths.config_dir,
+                lambda new: window.bridge.call_soon(lambda: ctx.apply_settings(new)),
+                ignore=ctx.settings_store.wrote,
             )
-
-        ctx.hotkeys.register_callback("hide_window", hide_window)
-        ctx.hotkeys.register_callback("show_window", show_window)
-        ctx.hotkeys.register_callback("panic_hide", panic_hide)
-        ctx.hotkeys.register_callback("mute_audio", mute_audio)
-        ctx.hotkeys.register_callback("unmute_audio", unmute_audio)
-        ctx.hotkeys.register_callback("increase_opacity", increase_opacity)
-        ctx.hotkeys.register_callback("decrease_opacity", decrease_opacity)
-        ctx.hotkeys.register_callback("toggle_view", toggle_view)
-
-        # Set Qt app for thread-safe hotkey callbacks
-        ctx.hotkeys.set_qt_app(app)
+            watcher.start()
 
         ctx.start()
         window.show()
         logger.info("mate ready")
-        sys.exit(app.exec())
+        exit_code = app.exec()
+        if watcher:
+            watcher.stop()
+        sys.exit(exit_code)
 
 
 if __name__ == "__main__":
@@ -0,0 +1,120 @@
+"""Track which application has keyboard focus.
+
+The identity is resolved once per focus change, from a
+``SetWinEventHook(EVENT_SYSTEM_FOREGROUND)`` notification, and cached, so
+keystroke handlers can read ``ForegroundTracker.current`` for free.
+"""
+
+from __future__ import annotations
+
+import sys
+import threading
+from collections.abc import Callable
+from dataclasses import dataclass
+
+import psutil
+
+from mate.logging import get_logger
+
+logger = get_logger("foreground")
+
+
+@dataclass(slots=True, frozen=True)
+class AppIdentity:
+    """Process image name and top-level window class, both lower-cased."""
+
+    process: str
+    window_class: str = ""
+
+
+class ForegroundTracker:
+    """Call ``on_change`` with the new ``AppIdentity`` whenever focus moves to another app.
+
+    On Windows a daemon thread owns the WinEvent hook and its message loop.
+    Elsewhere there are no notifications and ``current`` stays ``None``
+    unless ``update`` is called.
+    """
+
+    def __init__(self, on_change: Callable[[AppIdentity | None], None]) -> None:
+        self.on_change = on_change
+        self.current: AppIdentity | None = None
+        self._thread: threading.Thread | None = None
+        self._thread_id = 0
+        self._ready = threading.Event()  # set once the hook thread can take WM_QUIT
+
+    def start(self) -> None:
+        if self._thread is not None:
+            return
+        if sys.platform != "win32":
+            logger.debug("Foreground tracking needs Windows; snippets use the global scope")
+            return
+        self._ready.clear()
+        self._thread_id = 0
+        self._thread = threading.Thread(target=self._run, name="mate-foreground", daemon=True)
+        self._thread.start()
+
+    def stop(self) -> None:
+        thread, self._thread = self._thread, None
+        if thread is None:
+            return
+        from mate.utils import win32
+
+        # A WM_QUIT posted before the thread has a message queue would be lost
+        self._ready.wait(timeout=2.0)
+        if self._thread_id:
+            win32.user32.PostThreadMessageW(self._thread_id, win32.WM_QUIT, 0, 0)
+        thread.join(timeout=2.0)
+
+    def update(self, identity: AppIdentity | None) -> None:
+        if identity == self.current:
+            return
+        self.current = identity
+        logger.debug("Foreground app is now {}", identity)
+        self.on_change(identity)
+
+    def _run(self) -> None:
+        import ctypes
+        from ctypes import wintypes
+
+        from mate.utils import win32
+
+        def on_event(_hook, _event, hwnd, _object, _child, _thread, _time) -> None:
+            if hwnd:
+                self.update(_identify(hwnd))
+
+        # Keep a reference: the hook calls back through this thunk until unhooked
+        callback = win32.WinEventProc(on_event)
+        hook = win32.user32.SetWinEventHook(
+            win32.EVENT_SYSTEM_FOREGROUND,
+            win32.EVENT_SYSTEM_FOREGROUND,
+            0,
+            callback,
+            0,
+            0,
+            win32.WINEVENT_OUTOFCONTEXT,
+        )
+        if not hook:
+            logger.warning("SetWinEventHook failed; snippets use the global scope")
+            self._ready.set()
+            return
+        self.update(_identify(win32.user32.GetForegroundWindow()))
+        message = wintypes.MSG()
+        # The user32 calls above gave this thread its message queue
+        self._thread_id = ctypes.windll.kernel32.GetCurrentThreadId()
+        self._ready.set()
+        while win32.user32.GetMessageW(ctypes.byref(message), 0, 0, 0) > 0:
+            win32.user32.TranslateMessage(ctypes.byref(message))
+            win32.user32.DispatchMessageW(ctypes.byref(message))
+        win32.user32.UnhookWinEvent(hook)
+
+
+def _identify(hwnd: int) -> AppIdentity | None:
+    from mate.utils import win32
+
+    if not hwnd:
+        return None
+    try:
+        process = psutil.Process(win32.window_process_id(hwnd)).name()
+    except (psutil.Error, ValueError):
+        process = ""
+    return AppIdentity(process.lower(), win32.window_class(hwnd).lower())
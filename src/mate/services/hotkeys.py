@@ -1,31 +1,49 @@
-"""Global hotkey layer."""
+"""Global hotkey layer.
+
+Bindings are registered either with ``RegisterHotKey`` (``backend="win32"``,
+which also keeps the chord from reaching the focused app) or as chords in the
+shared ``InputPipeline`` (``backend="hook"``).
+"""
 
 from __future__ import annotations
 
 import threading
 from collections.abc import Callable
-
-from PySide6 import QtCore
+from typing import TYPE_CHECKING
 
 from mate.config import HotkeyBinding, HotkeySettings
 from mate.core.events import EventBus
 from mate.logging import get_logger
-from mate.services.win32_hotkeys import Win32HotkeyService
-from mate.utils.hotkey_parser import parse_hotkey
+from mate.utils.hotkey_parser import parse_chord, parse_hotkey
+
+if TYPE_CHECKING:
+    from PySide6 import QtCore
+
+    from mate.services.input_pipeline import Chord, InputPipeline
+    from mate.services.win32_hotkeys import Win32HotkeyService
 
 HotkeyCallback = Callable[[HotkeyBinding], None]
 
 
 class HotkeyManager:
-    def __init__(self, settings: HotkeySettings, events: EventBus) -> None:
+    def __init__(
+        self,
+        settings: HotkeySettings,
+        events: EventBus,
+        pipeline: InputPipeline | None = None,
+    ) -> None:
         self.settings = settings
         self.events = events
+        self.pipeline = pipeline
         self.logger = get_logger("hotkeys")
         self._callbacks: dict[str, HotkeyCallback] = {}
         self._lock = threading.RLock()
-        self._registered: dict[str, int] = {}
+        self._active = False
+        # shortcut -> Win32 hotkey id, or the pipeline chord for the hook backend
+        self._registered: dict[str, int | Chord] = {}
         self._win32_service: Win32HotkeyService | None = None
         self._qt_app: QtCore.QCoreApplication | None = None
+        self._dispatch: Callable[[Callable[[], None]], None] | None = None
 
     def set_qt_app(self, app: QtCore.QCoreApplication) -> None:
         """Set the Qt application instance for thread-safe operations."""
@@ -33,6 +51,12 @@ class HotkeyManager:
         if self._win32_service:
             self._win32_service.set_qt_app(app)
 
+    def set_dispatcher(self, dispatch: Callable[[Callable[[], None]], None]) -> None:
+        """Set how hotkey callbacks are handed to the Qt main thread."""
+        self._dispatch = dispatch
+        if self._win32_service:
+            self._win32_service.set_dispatcher(dispatch)
+
     def register_callback(self, action: str, callback: HotkeyCallback) -> None:
         self._callbacks[action] = callback
 
@@ -41,43 +65,106 @@ class HotkeyManager:
             self.logger.info("Hotkeys disabled in settings")
             return
 
-        self._win32_service = Win32HotkeyService()
-        if self._qt_app:
-            self._win32_service.set_qt_app(self._qt_app)
-        self._win32_service.start()
-
-        registered_count = 0
-        for binding in self.settings.bindings:
-            try:
-                parsed = parse_hotkey(binding.shortcut)
-                hotkey_id = self._win32_service.register_hotkey(
-                    parsed.modifiers, parsed.vk_code, lambda b=binding: self._trigger(b)
-                )
-
-                if hotkey_id is not None:
-                    self._registered[binding.shortcut] = hotkey_id
-                    registered_count += 1
-                    self.logger.debug(f"Registered hotkey: {binding.name} ({binding.shortcut})")
-                else:
-                    self.logger.warning(f"Failed to register hotkey: {binding.name} ({binding.shortcut}) - may be in use")
-            except ValueError as e:
-                self.logger.error(f"Invalid hotkey format '{binding.shortcut}': {e}")
-            except Exception as e:
-                self.logger.error(f"Error registering hotkey '{binding.shortcut}': {e}", exc_info=True)
-
-        self.logger.info(f"Hotkey manager started: {registered_count}/{len(self.settings.bindings)} hotkeys registered")
+        if self.settings.backend == "hook":
+            if self.pipeline is None:
+                self.logger.error("Hook hotkeys need an input pipeline; none was given")
+                return
+            self.pipeline.start()
+        else:
+            from mate.services.win32_hotkeys import Win32HotkeyService
+
+            self._win32_service = Win32HotkeyService()
+            if self._qt_app:
+                self._win32_service.set_qt_app(self._qt_app)
+            if self._dispatch:
+                self._win32_service.set_dispatcher(self._dispatch)
+            self._win32_service.start()
+        self._active = True
+
+        registered_count = sum(self._register(binding) for binding in self.settings.bindings)
+        self.logger.info(
+            "Hotkey manager started: {}/{} hotkeys registered",
+            registered_count,
+            len(self.settings.bindings),
+        )
+
+    def apply_settings(self, settings: HotkeySettings) -> None:
+        """Switch to new hotkey settings, re-registering only the bindings that changed.
+
+        Must run on the thread that started the manager: Win32 hotkeys belong
+        to the thread that owns their message window.
+        """
+        with self._lock:
+            previous, self.settings = self.settings, settings
+            restart = settings.enabled != previous.enabled or settings.backend != previous.backend
+            if restart or not self._active:
+                if self._active:
+                    self.stop()
+                self.start()
+                return
+            old = {_binding_key(b): b for b in previous.bindings}
+            new = {_binding_key(b): b for b in settings.bindings}
+            removed = [old[key] for key in old.keys() - new.keys()]
+            added = [new[key] for key in new.keys() - old.keys()]
+            for binding in removed:
+                self._unregister(binding.shortcut)
+            registered = sum(self._register(binding) for binding in added)
+        self.logger.info(
+            "Hotkeys updated: {} removed, {}/{} added", len(removed), registered, len(added)
+        )
+
+    def _register(self, binding: HotkeyBinding) -> bool:
+        try:
+            if self.settings.backend == "hook":
+                chord = parse_chord(binding.shortcut)
+                self.pipeline.bind_chord(chord, lambda b=binding: self._fire(b))
+                self._registered[binding.shortcut] = chord
+                self.logger.debug("Bound hotkey chord: {} ({})", binding.name, binding.shortcut)
+                return True
+            parsed = parse_hotkey(binding.shortcut)
+            hotkey_id = self._win32_service.register_hotkey(
+                parsed.modifiers, parsed.vk_code, lambda b=binding: self._trigger(b)
+            )
+
+            if hotkey_id is not None:
+                self._registered[binding.shortcut] = hotkey_id
+                self.logger.debug("Registered hotkey: {} ({})", binding.name, binding.shortcut)
+                return True
+            self.logger.warning(
+                "Failed to register hotkey: {} ({}) - may be in use", binding.name, binding.shortcut
+            )
+        except ValueError as e:
+            self.logger.error("Invalid hotkey format '{}': {}", binding.shortcut, e)
+        except Exception as e:
+            self.logger.error(
+                "Error registering hotkey '{}': {}", binding.shortcut, e, exc_info=True
+            )
+        return False
+
+    def _unregister(self, shortcut: str) -> None:
+        handle = self._registered.pop(shortcut, None)
+        if isinstance(handle, tuple):
+            self.pipeline.unbind_chord(handle)
+        elif handle is not None and self._win32_service:
+            self._win32_service.unregister_hotkey(handle)
 
     def stop(self) -> None:
         with self._lock:
+            for shortcut in list(self._registered):
+                self._unregister(shortcut)
             if self._win32_service:
-                for shortcut, hotkey_id in self._registered.items():
-                    self._win32_service.unregister_hotkey(hotkey_id)
                 self._win32_service.stop()
                 self._win32_service = None
-
-            self._registered.clear()
+            self._active = False
             self.logger.info("Hotkey manager stopped")
 
+    def _fire(self, binding: HotkeyBinding) -> None:
+        """Chord callback on the hook thread; hand it to the UI thread when possible."""
+        if self._dispatch:
+            self._dispatch(lambda: self._trigger(binding))
+        else:
+            self._trigger(binding)
+
     def _trigger(self, binding: HotkeyBinding) -> None:
         """Trigger hotkey callback (thread-safe)."""
         self.events.emit("hotkey.triggered", binding)
@@ -86,4 +173,10 @@ class HotkeyManager:
             try:
                 callback(binding)
             except Exception as e:
-                self.logger.error(f"Error in hotkey callback for {binding.action}: {e}", exc_info=True)
+                self.logger.error(
+                    "Error in hotkey callback for {}: {}", binding.action, e, exc_info=True
+                )
+
+
+def _binding_key(binding: HotkeyBinding) -> str:
+    return binding.model_dump_json()
@@ -0,0 +1,306 @@
+"""Single low-level keyboard input path shared by snippets, hotkeys and other consumers.
+
+A backend delivers raw key events; ``InputPipeline`` decodes each one once
+into a ``KeyEvent`` (with the current modifier mask) and fans it out through
+dispatch tables that are rebuilt on (un)subscribe rather than consulted
+under a lock:
+
+* every event to general consumers,
+* printable key-downs without Ctrl/Alt/Win to character consumers (snippets);
+  AltGr, which Windows reports as Ctrl+Alt, still produces text,
+* ``(modifiers, key)`` lookups to chord actions (hook-based hotkeys).
+
+``KeyboardBackend`` installs the one global hook through the ``keyboard``
+library; ``SyntheticBackend`` feeds events from memory for tests and
+benchmarks on any platform.
+"""
+
+from __future__ import annotations
+
+import sys
+import threading
+import time
+from collections.abc import Callable
+from dataclasses import dataclass
+from typing import Protocol
+
+from mate.logging import get_logger
+from mate.utils.hotkey_parser import MOD_ALT, MOD_CONTROL, MOD_SHIFT, MOD_WIN
+
+logger = get_logger("input")
+
+Chord = tuple[int, str]  # (MOD_* mask, key name)
+KeyHandler = Callable[["KeyEvent"], None]
+
+_MODIFIER_FLAGS = {
+    "ctrl": MOD_CONTROL,
+    "left ctrl": MOD_CONTROL,
+    "right ctrl": MOD_CONTROL,
+    "shift": MOD_SHIFT,
+    "left shift": MOD_SHIFT,
+    "right shift": MOD_SHIFT,
+    "alt": MOD_ALT,
+    "left alt": MOD_ALT,
+    "right alt": MOD_ALT,
+    "alt gr": MOD_CONTROL | MOD_ALT,  # what Windows reports for AltGr
+    "windows": MOD_WIN,
+    "left windows": MOD_WIN,
+    "right windows": MOD_WIN,
+    "command": MOD_WIN,
+}
+_NO_TEXT = MOD_CONTROL | MOD_ALT | MOD_WIN
+_ALT_GR = MOD_CONTROL | MOD_ALT
+# Virtual-key codes for asking Windows whether a modifier is really down
+_MODIFIER_VKS = {
+    "ctrl": 0x11,
+    "left ctrl": 0xA2,
+    "right ctrl": 0xA3,
+    "shift": 0x10,
+    "left shift": 0xA0,
+    "right shift": 0xA1,
+    "alt": 0x12,
+    "left alt": 0xA4,
+    "right alt": 0xA5,
+    "alt gr": 0xA5,
+    "windows": 0x5B,
+    "left windows": 0x5B,
+    "right windows": 0x5C,
+    "command": 0x5B,
+}
+
+
+@dataclass(slots=True)
+class KeyEvent:
+    """A decoded key event; ``name``/``event_type`` match ``keyboard.KeyboardEvent``."""
+
+    name: str
+    event_type: str  # "down" or "up"
+    time_ns: int = 0  # perf_counter_ns() when the backend received it
+    modifiers: int = 0
+
+
+@dataclass(slots=True)
+class PipelineStats:
+    """Capture-to-handled latency for all events and for fired chords."""
+
+    events: int = 0
+    total_ns: int = 0
+    max_ns: int = 0
+    chords: int = 0
+    chord_total_ns: int = 0
+    chord_max_ns: int = 0
+
+    @property
+    def mean_us(self) -> float:
+        return self.total_ns / self.events / 1e3 if self.events else 0.0
+
+    @property
+    def chord_mean_us(self) -> float:
+        return self.chord_total_ns / self.chords / 1e3 if self.chords else 0.0
+
+
+class InputBackend(Protocol):
+    def start(self, sink: KeyHandler) -> None: ...
+
+    def stop(self) -> None: ...
+
+    def is_pressed(self, name: str) -> bool:
+        """Whether the key is physically down, independent of the events seen so far."""
+        ...
+
+
+class KeyboardBackend:
+    """The global hook of the ``keyboard`` library, installed once."""
+
+    def __init__(self) -> None:
+        self._hook: Callable[[], None] | None = None
+        self._user32 = None
+
+    def start(self, sink: KeyHandler) -> None:
+        import keyboard
+
+        if sys.platform == "win32":
+            from mate.utils import win32
+
+            self._user32 = win32.user32
+
+        def on_event(event: keyboard.KeyboardEvent) -> None:
+            name = event.name
+            if name is not None:
+                sink(KeyEvent(name, event.event_type, time.perf_counter_ns()))
+
+        self._hook = keyboard.hook(on_event)
+
+    def stop(self) -> None:
+        if self._hook is not None:
+            import keyboard
+
+            keyboard.unhook(self._hook)
+            self._hook = None
+
+    def is_pressed(self, name: str) -> bool:
+        vk = _MODIFIER_VKS.get(name)
+        if self._user32 is not None and vk is not None:
+            return bool(self._user32.GetAsyncKeyState(vk) & 0x8000)
+        import keyboard
+
+        return keyboard.is_pressed(name)
+
+
+class SyntheticBackend:
+    """In-memory input: events are dispatched synchronously on the caller's thread.
+
+    ``pressed`` is the simulated physical key state; discarding a name from it
+    stands in for a key-up the hook never delivered.
+    """
+
+    def __init__(self) -> None:
+        self._sink: KeyHandler | None = None
+        self.pressed: set[str] = set()
+
+    def start(self, sink: KeyHandler) -> None:
+        self._sink = sink
+
+    def stop(self) -> None:
+        self._sink = None
+
+    def is_pressed(self, name: str) -> bool:
+        return name in self.pressed
+
+    def send(self, name: str, event_type: str = "down") -> None:
+        if event_type == "down":
+            self.pressed.add(name)
+        else:
+            self.pressed.discard(name)
+        if self._sink is not None:
+            self._sink(KeyEvent(name, event_type, time.perf_counter_ns()))
+
+    def tap(self, name: str) -> None:
+        self.send(name, "down")
+        self.send(name, "up")
+
+    def chord(self, shortcut: str) -> None:
+        """Press ``ctrl+shift+z`` style shortcuts: modifiers down, key tap, modifiers up."""
+        *modifiers, key = [part.strip() for part in shortcut.split("+")]
+        for modifier in modifiers:
+            self.send(modifier, "down")
+        self.tap(key)
+        for modifier in reversed(modifiers):
+            self.send(modifier, "up")
+
+    def type_text(self, text: str) -> None:
+        for char in text:
+            self.tap(char)
+
+
+class InputPipeline:
+    def __init__(self, backend: InputBackend) -> None:
+        self.backend = backend
+        self.stats = PipelineStats()
+        self._lock = threading.Lock()
+        self._running = False
+        self._modifiers = 0
+        self._held: dict[str, int] = {}  # modifier key name -> MOD_* flags
+        self._consumers: tuple[KeyHandler, ...] = ()
+        self._char_consumers: tuple[KeyHandler, ...] = ()
+        self._chords: dict[Chord, Callable[[], None]] = {}
+
+    def start(self) -> None:
+        """Install the backend's hook; safe to call from every consumer."""
+        with self._lock:
+            if self._running:
+                return
+            self.backend.start(self.dispatch)
+            self._running = True
+        logger.info("Input pipeline started on {}", type(self.backend).__name__)
+
+    def stop(self) -> None:
+        with self._lock:
+            if not self._running:
+                return
+            self.backend.stop()
+            self._running = False
+            self._modifiers = 0
+            self._held = {}
+
+    def subscribe(self, handler: KeyHandler, chars_only: bool = False) -> None:
+        with self._lock:
+            if chars_only:
+                self._char_consumers = (*self._char_consumers, handler)
+            else:
+                self._consumers = (*self._consumers, handler)
+
+    def unsubscribe(self, handler: KeyHandler) -> None:
+        with self._lock:
+            self._consumers = tuple(h for h in self._consumers if h != handler)
+            self._char_consumers = tuple(h for h in self._char_consumers if h != handler)
+
+    def bind_chord(self, chord: Chord, action: Callable[[], None]) -> None:
+        with self._lock:
+            self._chords = {**self._chords, chord: action}
+
+    def unbind_chord(self, chord: Chord) -> None:
+        with self._lock:
+            chords = dict(self._chords)
+            chords.pop(chord, None)
+            self._chords = chords
+
+    def dispatch(self, event: KeyEvent) -> None:
+        """Decode modifiers and fan ``event`` out; runs on the backend's thread."""
+        name = event.name
+        down = event.event_type == "down"
+        flag = _MODIFIER_FLAGS.get(name)
+        if flag is not None:
+            if down:
+                self._held[name] = flag
+            else:
+                self._held.pop(name, None)
+            self._modifiers = self._mask()
+        elif down and self._held:
+            self._drop_stale_modifiers()
+        modifiers = event.modifiers = self._modifiers
+        stats = self.stats
+        for consumer in self._consumers:
+            self._call(consumer, event)
+        if down and flag is None:
+            action = self._chords.get((modifiers, name.lower()))
+            if action is not None:
+                try:
+                    action()
+                except Exception:
+                    logger.exception("Chord action failed on {}", name)
+                elapsed = time.perf_counter_ns() - event.time_ns
+                stats.chords += 1
+                stats.chord_total_ns += elapsed
+                stats.chord_max_ns = max(stats.chord_max_ns, elapsed)
+            elif len(name) == 1 and modifiers & _NO_TEXT in (0, _ALT_GR):
+                for consumer in self._char_consumers:
+                    self._call(consumer, event)
+        elapsed = time.perf_counter_ns() - event.time_ns
+        stats.events += 1
+        stats.total_ns += elapsed
+        if elapsed > stats.max_ns:
+            stats.max_ns = elapsed
+
+    def _mask(self) -> int:
+        mask = 0
+        for flag in self._held.values():
+            mask |= flag
+        return mask
+
+    def _drop_stale_modifiers(self) -> None:
+        # A key-up lost to a secure desktop or another hook would otherwise
+        # leave e.g. Ctrl "held" and silence every character consumer.
+        stale = [name for name in self._held if not self.backend.is_pressed(name)]
+        if stale:
+            logger.debug("Dropping modifiers released behind the hook: {}", stale)
+            for name in stale:
+                del self._held[name]
+            self._modifiers = self._mask()
+
+    @staticmethod
+    def _call(consumer: KeyHandler, event: KeyEvent) -> None:
+        try:
+            consumer(event)
+        except Exception:
+            logger.exception("Input consumer {} failed on {}", consumer, event.name)
@@ -0,0 +1,113 @@
+"""Reload settings when ``.env`` or the config directory changes on disk."""
+
+from __future__ import annotations
+
+import threading
+from collections.abc import Callable
+from pathlib import Path
+
+from watchdog.events import FileSystemEvent, FileSystemEventHandler
+from watchdog.observers import Observer
+
+from mate.config import MateSettings, reload_settings
+from mate.logging import get_logger
+
+SettingsCallback = Callable[[MateSettings], None]
+
+
+class SettingsWatcher(FileSystemEventHandler):
+    """Watch settings sources and hand freshly validated settings to a callback.
+
+    Editors tend to write a file several times per save, so filesystem events
+    are debounced and only the last one triggers a reload. ``ignore`` filters
+    out files mate wrote itself, such as the persisted ``settings.json``; it is
+    asked again when the debounce expires, so a save whose event arrived
+    mid-write is still recognised.
+    Settings that fail validation are logged and ignored; the running
+    configuration is kept.
+    """
+
+    def __init__(
+        self,
+        config_dir: Path,
+        on_change: SettingsCallback,
+        env_path: Path | None = None,
+        debounce: float = 0.25,
+        ignore: Callable[[Path], bool] | None = None,
+    ) -> None:
+        super().__init__()
+        self.config_dir = config_dir.resolve()
+        self.env_path = (env_path or Path(".env")).resolve()
+        self.on_change = on_change
+        self.debounce = debounce
+        self.ignore = ignore
+        self.logger = get_logger("settings-watcher")
+        self.reloads = 0
+        self._observer: Observer | None = None
+        self._timer: threading.Timer | None = None
+        self._changed: set[Path] = set()
+        self._lock = threading.Lock()
+
+    def start(self) -> None:
+        if self._observer is not None:
+            return
+        observer = Observer()
+        observer.schedule(self, str(self.config_dir), recursive=False)
+        if self.env_path.parent != self.config_dir:
+            observer.schedule(self, str(self.env_path.parent), recursive=False)
+        observer.daemon = True
+        observer.start()
+        self._observer = observer
+        self.logger.info("Watching {} and {} for settings changes", self.config_dir, self.env_path)
+
+    def stop(self) -> None:
+        with self._lock:
+            if self._timer is not None:
+                self._timer.cancel()
+                self._timer = None
+        if self._observer is not None:
+            self._observer.stop()
+            self._observer.join(timeout=2)
+            self._observer = None
+
+    def on_any_event(self, event: FileSystemEvent) -> None:
+        if event.is_directory or event.event_type in ("opened", "closed_no_write"):
+            return
+        paths = [event.src_path, getattr(event, "dest_path", "")]
+        changed = {Path(path).resolve() for path in paths if path}
+        changed = {path for path in changed if self._relevant(path)}
+        if not changed:
+            return
+        with self._lock:
+            self._changed |= changed
+            if self._timer is not None:
+                self._timer.cancel()
+            self._timer = threading.Timer(self.debounce, self._debounced)
+            self._timer.daemon = True
+            self._timer.start()
+
+    def _debounced(self) -> None:
+        with self._lock:
+            changed, self._changed = self._changed, set()
+            if self._timer is threading.current_thread():
+                self._timer = None
+        if self.ignore is not None and all(self.ignore(path) for path in changed):
+            return
+        self.reload()
+
+    def reload(self) -> None:
+        try:
+            settings = reload_settings(self.env_path)
+        except Exception as e:
+            self.logger.error("Ignoring invalid settings change: {}", e)
+            return
+        self.reloads += 1
+        self.on_change(settings)
+
+    def _relevant(self, path: Path) -> bool:
+        if self.ignore is not None and self.ignore(path):
+            return False
+        if path == self.env_path:
+            return True
+        # Skip our own cache and editor swap/backup files
+        return path.parent == self.config_dir and not path.name.startswith((".", "~"))
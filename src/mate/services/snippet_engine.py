@@ -2,63 +2,454 @@
 
 from __future__ import annotations
 
+import queue
 import threading
+import time
+from collections.abc import Iterable
 from dataclasses import dataclass
 
-import keyboard
-
 from mate.config import SnippetSettings
 from mate.core.events import EventBus
+from mate.data.snippets import GLOBAL_SCOPE, SnippetRepository
 from mate.logging import get_logger
+from mate.services.foreground import AppIdentity, ForegroundTracker
+from mate.services.input_pipeline import InputPipeline, KeyboardBackend, KeyEvent
+from mate.services.snippet_injection import InjectionRunner, build_injector, move_caret_left
+from mate.services.snippet_matcher import MatchRule, TriggerMatcher
+from mate.services.snippet_templates import Template, compile_template
 
 
 @dataclass(slots=True)
 class Snippet:
     trigger: str
-    replacement: str
+    # None for library snippets, whose body is fetched by id when they fire
+    replacement: str | None
+    snippet_id: int | None = None
+    # Lower-cased process name or window class; empty for every application
+    scope: str = GLOBAL_SCOPE
+    # Render plan, compiled on registration (library bodies: on first expansion)
+    template: Template | None = None
+
+
+class KeyRing:
+    """The last ``size`` typed characters in a fixed list, overwritten in place."""
+
+    __slots__ = ("_chars", "_end", "_len")
+
+    def __init__(self, size: int) -> None:
+        self._chars = [""] * size
+        self._end = 0
+        self._len = 0
+
+    def __len__(self) -> int:
+        return self._len
+
+    def append(self, char: str) -> None:
+        chars = self._chars
+        chars[self._end] = char
+        self._end = (self._end + 1) % len(chars)
+        if self._len < len(chars):
+            self._len += 1
+
+    def clear(self) -> None:
+        self._len = 0
+
+    def text(self) -> str:
+        chars, size = self._chars, len(self._chars)
+        return "".join(chars[(self._end - i) % size] for i in range(self._len, 0, -1))
+
+
+@dataclass(slots=True)
+class EngineStats:
+    """Time in the key handler, queue wait, and key-to-expansion latency for matches."""
+
+    keys: int = 0
+    rejected: int = 0
+    suppressed: int = 0
+    hook_total_ns: int = 0
+    hook_max_ns: int = 0
+    matches: int = 0
+    wait_total_ns: int = 0
+    wait_max_ns: int = 0
+    # From the backend receiving the trigger's last key to the expansion being injected
+    expand_total_ns: int = 0
+    expand_max_ns: int = 0
+
+    @property
+    def hook_mean_us(self) -> float:
+        return self.hook_total_ns / self.keys / 1e3 if self.keys else 0.0
+
+    @property
+    def wait_mean_ms(self) -> float:
+        return self.wait_total_ns / self.matches / 1e6 if self.matches else 0.0
+
+    @property
+    def expand_mean_ms(self) -> float:
+        return self.expand_total_ns / self.matches / 1e6 if self.matches else 0.0
 
 
 class SnippetEngine:
-    def __init__(self, settings: SnippetSettings, events: EventBus) -> None:
+    """Match triggers on typed characters and expand them on a worker thread.
+
+    Characters arrive from the shared ``InputPipeline``. The handler only feeds
+    the matcher and enqueues matches, so typing is never held up behind an
+    expansion. Keys that appear in no trigger just reset the matcher; the rest
+    are remembered in a ``KeyRing`` of ``max_buffer`` characters so the matcher
+    can be resynced after triggers change.
+
+    The global triggers live in one matcher and each scope (a process name or
+    window class) gets a small one holding only its own. Keys feed the global
+    matcher and the focused app's side by side, a scoped match taking
+    precedence, so focus changes reported by ``ForegroundTracker`` just swap
+    the scoped matcher. While the worker injects, and for
+    ``injection_grace_ms`` afterwards, keys are ignored: they may be the
+    worker's own synthetic keystrokes and must not be matched again.
+    """
+
+    def __init__(
+        self,
+        settings: SnippetSettings,
+        events: EventBus,
+        repository: SnippetRepository | None = None,
+        pipeline: InputPipeline | None = None,
+    ) -> None:
         self.settings = settings
         self.events = events
+        self.repository = repository
+        # Without a shared pipeline the engine owns one on the keyboard hook
+        self._owns_pipeline = pipeline is None
+        self.pipeline = pipeline or InputPipeline(KeyboardBackend())
         self.logger = get_logger("snippet-engine")
-        self._snippets: list[Snippet] = [
-            Snippet(**item) for item in settings.defaults
-        ]
-        self._buffer: str = ""
+        # Snippets that live outside the library: runtime registrations and packs
+        self._registered: dict[tuple[str, str], Snippet] = {}
+        self._revision = 0  # bumped whenever snippets change outside a rebuild
+        self._matchers = self._build_matchers(settings)
+        self._idle: TriggerMatcher[Snippet] = TriggerMatcher()  # no chars: rejects every key
+        self._matcher = self._matchers[GLOBAL_SCOPE]  # or _idle in excluded apps
+        self._scoped: TriggerMatcher[Snippet] | None = None  # the focused app's own triggers
+        self.foreground = ForegroundTracker(self._on_foreground)
+        self._recent = KeyRing(settings.max_buffer)
+        self.injection = InjectionRunner(build_injector(settings))
+        self.stats = EngineStats()
         self._lock = threading.RLock()
         self._listening = False
+        self._queue: queue.Queue[tuple[Snippet, int, int] | None] = queue.Queue()
+        self._worker: threading.Thread | None = None
+        self._injecting = False
+        self._suppress_until = 0
 
     def start(self) -> None:
         if not self.settings.enabled or self._listening:
             return
-        self.logger.info("Snippet engine armed with %d snippets", len(self._snippets))
-        keyboard.on_press(self._handle_key)
+        self.logger.info("Snippet engine armed with {} snippets", len(self._matcher))
+        self._start_worker()
+        self.foreground.start()
+        self.pipeline.subscribe(self._handle_key, chars_only=True)
+        self.pipeline.start()
         self._listening = True
 
     def stop(self) -> None:
-        if not self._listening:
+        if self._listening:
+            self.pipeline.unsubscribe(self._handle_key)
+            if self._owns_pipeline:
+                self.pipeline.stop()
+            self.foreground.stop()
+            self._listening = False
+        worker, self._worker = self._worker, None
+        if worker is not None:
+            self._queue.put(None)
+            worker.join(timeout=2.0)
+
+    def join(self, timeout: float = 2.0) -> bool:
+        """Wait until queued expansions have been injected; False on timeout."""
+        done = self._queue.all_tasks_done
+        with done:
+            return done.wait_for(lambda: not self._queue.unfinished_tasks, timeout)
+
+    def register(self, trigger: str, replacement: str, scope: str = GLOBAL_SCOPE) -> None:
+        """Add a snippet; with a library it is persisted and survives restarts.
+
+        ``scope`` limits it to one process name or window class.
+        """
+        scope = scope.lower()
+        if self.repository is not None:
+            snippet_id = self.repository.add(trigger, replacement, scope)
+            snippet = Snippet(trigger, None, snippet_id, scope)
+        else:
+            snippet = Snippet(trigger, replacement, scope=scope)
+            snippet.template = compile_template(replacement, self._snippet_body)
+        with self._lock:
+            if self.repository is None:
+                self._registered[(scope, trigger)] = snippet
+            self._place(snippet)
+            self._reselect()
+            self._revision += 1
+            if scope == GLOBAL_SCOPE:
+                self._forget_nested({trigger})
+
+    def update_snippets(
+        self,
+        upserts: Iterable[tuple[str, str, str]] = (),
+        removals: Iterable[tuple[str, str]] = (),
+    ) -> None:
+        """Change snippets in the live matchers without rebuilding them; nothing is persisted.
+
+        ``upserts`` are ``(trigger, replacement, scope)``, ``removals`` ``(trigger, scope)``.
+        """
+        added = [Snippet(trigger, body, scope=scope.lower()) for trigger, body, scope in upserts]
+        for snippet in added:
+            snippet.template = compile_template(snippet.replacement, self._snippet_body)
+        removed = [(trigger, scope.lower()) for trigger, scope in removals]
+        # Library/default snippets uncovered by a removal, looked up before taking the lock
+        fallbacks = {key: self._fallback(*key) for key in removed}
+        with self._lock:
+            for trigger, scope in removed:
+                if self._registered.pop((scope, trigger), None) is not None:
+                    self._unplace(trigger, scope, fallbacks[(trigger, scope)])
+            for snippet in added:
+                self._registered[(snippet.scope, snippet.trigger)] = snippet
+                self._place(snippet)
+            self._reselect()
+            self._revision += 1
+            changed = {s.trigger for s in added if s.scope == GLOBAL_SCOPE}
+            changed.update(trigger for trigger, scope in removed if scope == GLOBAL_SCOPE)
+            if changed:
+                self._forget_nested(changed)
+
+    def apply_settings(self, settings: SnippetSettings) -> None:
+        """Swap in new snippet settings, keeping snippets registered at runtime.
+
+        The matchers are rebuilt without holding the lock the key handler
+        takes; only the swap does, and a rebuild that raced with a
+        registration is simply redone.
+        """
+        while True:
+            revision = self._revision
+            matchers = self._build_matchers(settings)
+            with self._lock:
+                if revision != self._revision:
+                    continue
+                if settings.max_buffer != self.settings.max_buffer:
+                    self._recent = KeyRing(settings.max_buffer)
+                self.settings = settings
+                self._matchers = matchers
+                self._reselect()
+                self.injection.injector = build_injector(settings)
+                self._forget_nested(None)  # the defaults may have changed under any trigger
+                break
+        if settings.enabled:
+            self.start()
+        else:
+            self.stop()
+
+    def _handle_key(self, event: KeyEvent) -> None:
+        started = time.perf_counter_ns()
+        char = event.name
+        if event.event_type != "down" or len(char) != 1:
             return
-        keyboard.unhook_all()
-        self._listening = False
+        stats = self.stats
+        if self._injecting or started < self._suppress_until:
+            stats.suppressed += 1
+            return
+        scoped = self._scoped
+        if char not in self._matcher.chars and (scoped is None or char not in scoped.chars):
+            # Nothing typed so far can end in a trigger any more
+            self._reset_matchers()
+            self._recent.clear()
+            stats.rejected += 1
+        else:
+            with self._lock:
+                match = self._feed(char)
+                if match:
+                    self._reset_matchers()
+                    self._recent.clear()
+                else:
+                    self._recent.append(char)
+            if match:
+                self._queue.put((match[1], time.perf_counter_ns(), event.time_ns or started))
+                if self._worker is None:
+                    self._start_worker()
+        elapsed = time.perf_counter_ns() - started
+        stats.keys += 1
+        stats.hook_total_ns += elapsed
+        if elapsed > stats.hook_max_ns:
+            stats.hook_max_ns = elapsed
+
+    def _start_worker(self) -> None:
+        with self._lock:
+            if self._worker is not None:
+                return
+            self._worker = threading.Thread(
+                target=self._run_worker, name="mate-snippet-injector", daemon=True
+            )
+            self._worker.start()
+
+    def _run_worker(self) -> None:
+        while (job := self._queue.get()) is not None:
+            snippet, queued, pressed = job
+            waited = time.perf_counter_ns() - queued
+            stats = self.stats
+            stats.matches += 1
+            stats.wait_total_ns += waited
+            stats.wait_max_ns = max(stats.wait_max_ns, waited)
+            try:
+                self._perform_replacement(snippet)
+            except Exception:
+                self.logger.exception("Expanding snippet {} failed", snippet.trigger)
+            finally:
+                done = time.perf_counter_ns()
+                stats.expand_total_ns += done - pressed
+                stats.expand_max_ns = max(stats.expand_max_ns, done - pressed)
+                self._queue.task_done()
+        self._queue.task_done()
+
+    def _feed(self, char: str) -> tuple[str, Snippet] | None:
+        """Advance the global and the focused scope's matcher; a scoped match wins."""
+        match = self._matcher.feed(char)
+        scoped = self._scoped
+        if scoped is not None:
+            match = scoped.feed(char) or match
+        return match
+
+    def _reset_matchers(self) -> None:
+        self._matcher.reset()
+        if self._scoped is not None:
+            self._scoped.reset()
 
-    def register(self, trigger: str, replacement: str) -> None:
-        self._snippets.append(Snippet(trigger=trigger, replacement=replacement))
+    def _place(self, snippet: Snippet) -> None:
+        """Add ``snippet`` to its scope's matcher, creating an empty one for a new scope."""
+        matcher = self._matchers.get(snippet.scope)
+        if matcher is None:
+            matcher = self._matchers[snippet.scope] = self._new_matcher(())
+        matcher.add(snippet.trigger, snippet)
 
-    def _handle_key(self, event: keyboard.KeyboardEvent) -> None:
-        if event.event_type != "down" or len(event.name or "") != 1:
+    def _unplace(self, trigger: str, scope: str, fallback: Snippet | None) -> None:
+        """Drop a removed snippet from its scope, uncovering ``fallback`` if there is one."""
+        matcher = self._matchers.get(scope)
+        if matcher is None:
             return
+        if fallback is None:
+            matcher.remove(trigger)
+        else:
+            matcher.add(trigger, fallback)
+
+    def _fallback(self, trigger: str, scope: str) -> Snippet | None:
+        if self.repository is not None:
+            snippet_id = self.repository.find(trigger, scope)
+            if snippet_id is not None:
+                return Snippet(trigger, None, snippet_id, scope)
+        for item in self.settings.defaults:
+            if item["trigger"] == trigger and item.get("scope", GLOBAL_SCOPE).lower() == scope:
+                body = item["replacement"]
+                template = compile_template(body, self._snippet_body)
+                return Snippet(trigger, body, scope=scope, template=template)
+        return None
+
+    def _reselect(self) -> None:
+        self._matcher, self._scoped = self._matchers_for(self.foreground.current)
+        text = self._recent.text()
+        self._matcher.resync(text)
+        if self._scoped is not None:
+            self._scoped.resync(text)
+
+    def _on_foreground(self, identity: AppIdentity | None) -> None:
         with self._lock:
-            self._buffer = (self._buffer + event.name)[-self.settings.max_buffer :]
-            match = next((s for s in self._snippets if self._buffer.endswith(s.trigger)), None)
-            if match:
-                self._perform_replacement(match)
-                self._buffer = ""
+            matcher, scoped = self._matchers_for(identity)
+            if matcher is not self._matcher or scoped is not self._scoped:
+                self._matcher, self._scoped = matcher, scoped
+                self._reset_matchers()
+                self._recent.clear()
+
+    def _matchers_for(
+        self, identity: AppIdentity | None
+    ) -> tuple[TriggerMatcher[Snippet], TriggerMatcher[Snippet] | None]:
+        """The global (or, in excluded apps, idle) matcher and the app's scoped one."""
+        matchers = self._matchers
+        if identity is None:
+            return matchers[GLOBAL_SCOPE], None
+        excluded = {app.lower() for app in self.settings.excluded_apps}
+        if identity.process in excluded or identity.window_class in excluded:
+            return self._idle, None
+        for scope in (identity.process, identity.window_class):
+            matcher = matchers.get(scope)
+            if matcher is not None:
+                return matchers[GLOBAL_SCOPE], matcher
+        return matchers[GLOBAL_SCOPE], None
+
+    def _build_matchers(self, settings: SnippetSettings) -> dict[str, TriggerMatcher[Snippet]]:
+        """One matcher for the global snippets and one per scope holding only its own.
+
+        Global snippets are the defaults, then library triggers (bodies stay on
+        disk), then runtime registrations.
+        """
+        shared: list[Snippet] = []
+        scoped: dict[str, list[Snippet]] = {}
+        snippets = [
+            Snippet(**item, template=compile_template(item["replacement"], self._snippet_body))
+            for item in settings.defaults
+        ]
+        if self.repository is not None:
+            rows = self.repository.triggers()
+            snippets.extend(Snippet(r.trigger, None, r.id, r.scope.lower()) for r in rows)
+        snippets.extend(list(self._registered.values()))
+        for snippet in snippets:
+            if snippet.scope == GLOBAL_SCOPE:
+                shared.append(snippet)
+            else:
+                scoped.setdefault(snippet.scope.lower(), []).append(snippet)
+        rule = settings.match_rule
+        matchers = {GLOBAL_SCOPE: self._new_matcher(shared, rule)}
+        for scope, own in scoped.items():
+            matchers[scope] = self._new_matcher(own, rule)
+        return matchers
+
+    def _new_matcher(
+        self, snippets: Iterable[Snippet], rule: MatchRule | None = None
+    ) -> TriggerMatcher[Snippet]:
+        matcher: TriggerMatcher[Snippet] = TriggerMatcher(rule or self.settings.match_rule)
+        for snippet in snippets:
+            matcher.add(snippet.trigger, snippet)
+        return matcher
+
+    def _forget_nested(self, triggers: set[str] | None) -> None:
+        """Make plans that embed ``triggers`` through ``{snippet:...}`` resolve them again.
+
+        Called with the lock held, so the matchers do not change underneath.
+        """
+        for matcher in self._matchers.values():
+            for _trigger, snippet in matcher.items():
+                if snippet.template is not None:
+                    snippet.template.forget(triggers)
+
+    def _snippet_body(self, trigger: str) -> str | None:
+        """Body of a global snippet, for ``{snippet:trigger}`` references."""
+        snippet = self._matchers[GLOBAL_SCOPE].get(trigger)
+        if snippet is None:
+            return None
+        if snippet.replacement is not None or self.repository is None:
+            return snippet.replacement
+        return self.repository.body(snippet.snippet_id)
 
     def _perform_replacement(self, snippet: Snippet) -> None:
+        template = snippet.template
+        if template is None:
+            body = self.repository.body(snippet.snippet_id) if self.repository else None
+            if body is None:
+                self.logger.warning("Snippet {} is no longer in the library", snippet.trigger)
+                return
+            template = snippet.template = compile_template(body, self._snippet_body)
+        text, caret = template.render()
         self.logger.info("Expanding snippet {}", snippet.trigger)
-        for _ in range(len(snippet.trigger)):
-            keyboard.send("backspace")
-        keyboard.write(snippet.replacement, delay=0.005)
+        # typing injects real key events and {cursor} real arrows, which the hook
+        # reports back; they would otherwise be matched as if the user typed them
+        self._injecting = True
+        try:
+            self.injection.inject(len(snippet.trigger), text)
+            move_caret_left(caret)
+        finally:
+            grace = int(self.settings.injection_grace_ms * 1e6)
+            self._suppress_until = time.perf_counter_ns() + grace
+            self._injecting = False
+        if snippet.snippet_id is not None:
+            self.repository.record_use(snippet.snippet_id)
         self.events.emit("snippet.used", snippet)
@@ -0,0 +1,178 @@
+"""Strategies for replacing a typed trigger with its expansion.
+
+* ``typing`` - ``keyboard.write`` one character at a time (slow, works everywhere).
+* ``unicode`` - erase and text as Unicode ``SendInput`` events in a few batched calls.
+* ``clipboard`` - paste via ``pyperclip`` + Ctrl+V, then restore the previous clipboard.
+* ``auto`` - ``unicode`` (``typing`` off Windows) for short text, ``clipboard`` for long.
+"""
+
+from __future__ import annotations
+
+import sys
+import threading
+import time
+from dataclasses import dataclass
+from typing import Protocol
+
+from mate.config import SnippetSettings
+from mate.logging import get_logger
+
+logger = get_logger("snippet-injection")
+
+
+@dataclass(slots=True)
+class InjectionStats:
+    """End-to-end expansion latency (erase + text) for one strategy."""
+
+    count: int = 0
+    chars: int = 0
+    total_ns: int = 0
+    max_ns: int = 0
+
+    @property
+    def mean_ms(self) -> float:
+        return self.total_ns / self.count / 1e6 if self.count else 0.0
+
+    @property
+    def max_ms(self) -> float:
+        return self.max_ns / 1e6
+
+    def record(self, chars: int, elapsed_ns: int) -> None:
+        self.count += 1
+        self.chars += chars
+        self.total_ns += elapsed_ns
+        self.max_ns = max(self.max_ns, elapsed_ns)
+
+
+class Injector(Protocol):
+    name: str
+
+    def inject(self, erase: int, text: str) -> None:
+        """Delete ``erase`` characters before the caret, then insert ``text``."""
+
+
+class TypingInjector:
+    name = "typing"
+
+    def __init__(self, delay: float = 0.005) -> None:
+        self.delay = delay
+
+    def inject(self, erase: int, text: str) -> None:
+        import keyboard
+
+        for _ in range(erase):
+            keyboard.send("backspace")
+        keyboard.write(text, delay=self.delay)
+
+
+class UnicodeInjector:
+    """Whole expansion as Unicode key events in one (or a few) ``SendInput`` calls."""
+
+    name = "unicode"
+
+    def inject(self, erase: int, text: str) -> None:
+        from mate.utils import win32
+
+        erase_keys = win32.virtual_key_inputs(win32.VK_BACK, erase)
+        win32.send_inputs(erase_keys + win32.unicode_inputs(text))
+
+
+class ClipboardInjector:
+    """Paste through the clipboard, restoring the text that was there before.
+
+    The target application reads the clipboard asynchronously after Ctrl+V,
+    so restoring waits ``settle`` seconds first. ``pyperclip`` only sees text:
+    when the clipboard held nothing readable (an image, files, or nothing at
+    all) the expansion is left on it rather than "restored" to empty.
+    """
+
+    name = "clipboard"
+
+    def __init__(self, settle: float = 0.15) -> None:
+        self.settle = settle
+
+    def inject(self, erase: int, text: str) -> None:
+        import keyboard
+        import pyperclip
+
+        try:
+            previous: str | None = pyperclip.paste()
+        except pyperclip.PyperclipException:
+            previous = None
+        pyperclip.copy(text)
+        for _ in range(erase):
+            keyboard.send("backspace")
+        keyboard.send("ctrl+v")
+        if previous:
+            time.sleep(self.settle)
+            pyperclip.copy(previous)
+
+
+class AutoInjector:
+    """Pick a strategy per expansion from its length."""
+
+    name = "auto"
+
+    def __init__(self, short: Injector, long: Injector, threshold: int) -> None:
+        self.short = short
+        self.long = long
+        self.threshold = threshold
+
+    def choose(self, text: str) -> Injector:
+        return self.long if len(text) > self.threshold else self.short
+
+    def inject(self, erase: int, text: str) -> None:
+        self.choose(text).inject(erase, text)
+
+
+def move_caret_left(count: int) -> None:
+    """Move the caret back ``count`` characters, as one batched key sequence on Windows."""
+    if count <= 0:
+        return
+    if sys.platform == "win32":
+        from mate.utils import win32
+
+        win32.send_inputs(win32.virtual_key_inputs(win32.VK_LEFT, count))
+        return
+    import keyboard
+
+    for _ in range(count):
+        keyboard.send("left")
+
+
+def build_injector(settings: SnippetSettings) -> Injector:
+    typing = TypingInjector(settings.type_delay_ms / 1000)
+    if settings.injection == "typing":
+        return typing
+    if settings.injection == "clipboard":
+        return ClipboardInjector()
+    native = UnicodeInjector() if sys.platform == "win32" else typing
+    if settings.injection == "unicode":
+        if native is typing:
+            logger.warning("Unicode injection needs Windows; falling back to typing")
+        return native
+    return AutoInjector(native, ClipboardInjector(), settings.clipboard_threshold)
+
+
+class InjectionRunner:
+    """Run an injector and keep latency stats per concrete strategy."""
+
+    def __init__(self, injector: Injector) -> None:
+        self.injector = injector
+        self.stats: dict[str, InjectionStats] = {}
+        self._lock = threading.Lock()
+
+    def inject(self, erase: int, text: str) -> str:
+        """Inject and return the name of the strategy that ran."""
+        injector = self.injector
+        if isinstance(injector, AutoInjector):
+            injector = injector.choose(text)
+        started = time.perf_counter_ns()
+        injector.inject(erase, text)
+        elapsed = time.perf_counter_ns() - started
+        with self._lock:
+            self.stats.setdefault(injector.name, InjectionStats()).record(len(text), elapsed)
+        logger.debug(
+            "Injected {} chars via {} in {:.1f} ms", len(text), injector.name, elapsed / 1e6
+        )
+        return injector.name
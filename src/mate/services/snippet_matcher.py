@@ -0,0 +1,170 @@
+"""Streaming Aho-Corasick matcher for snippet triggers.
+
+Triggers live in a trie whose edges are kept in one dict keyed by
+``state << 21 | ord(char)``, which is far smaller than a dict per node when
+the library holds tens of thousands of triggers. Goto transitions, failure
+links and per-state outputs are computed lazily and memoized. Adding or
+removing a trigger only touches the trie and clears those memo tables, so the
+cost of re-deriving them is paid by the keystrokes that need them. Each fed
+character is then one memo lookup for the transition and one for the output.
+"""
+
+from __future__ import annotations
+
+from typing import Generic, Literal, TypeVar
+
+T = TypeVar("T")
+
+MatchRule = Literal["first", "longest"]
+
+_SHIFT = 21  # every code point fits below 2**21
+_MEMO_LIMIT = 1 << 20
+
+
+class TriggerMatcher(Generic[T]):
+    """Match triggers as suffixes of a character stream, one character at a time.
+
+    When several triggers end at the same character, ``rule`` picks the
+    winner deterministically: ``"first"`` prefers the earliest added trigger
+    (the order ``SnippetEngine`` has always used), ``"longest"`` the longest.
+    Adding an existing trigger replaces its value but keeps its position.
+    """
+
+    def __init__(self, rule: MatchRule = "first") -> None:
+        if rule not in ("first", "longest"):
+            raise ValueError(f"Unknown match rule {rule!r}")
+        self.rule = rule
+        self.state = 0
+        # Every character of every trigger; a key outside it cannot continue a match
+        self.chars: set[str] = set()
+        self._edges: dict[int, int] = {}
+        self._parent: list[int] = [0]
+        self._code: list[int] = [0]
+        self._depth: list[int] = [0]
+        self._terminal: dict[int, tuple[int, str, T]] = {}  # node -> (order, trigger, value)
+        self._nodes: dict[str, int] = {}  # trigger -> node
+        self._order = 0
+        self._goto: dict[int, int] = {}
+        self._fail: dict[int, int] = {}
+        self._out: dict[int, int] = {}  # node -> node of the winning trigger, or -1
+
+    def __len__(self) -> int:
+        return len(self._nodes)
+
+    def __contains__(self, trigger: str) -> bool:
+        return trigger in self._nodes
+
+    def add(self, trigger: str, value: T) -> None:
+        if not trigger:
+            raise ValueError("Trigger must not be empty")
+        node = 0
+        for char in trigger:
+            key = node << _SHIFT | ord(char)
+            child = self._edges.get(key)
+            if child is None:
+                child = len(self._parent)
+                self._edges[key] = child
+                self._parent.append(node)
+                self._code.append(ord(char))
+                self._depth.append(self._depth[node] + 1)
+            node = child
+        self.chars.update(trigger)
+        existing = self._terminal.get(node)
+        order = existing[0] if existing else self._next_order()
+        self._terminal[node] = (order, trigger, value)
+        self._nodes[trigger] = node
+        self._invalidate()
+
+    def remove(self, trigger: str) -> T | None:
+        """Forget ``trigger``; its trie nodes and ``chars`` stay as (harmless) supersets."""
+        node = self._nodes.pop(trigger, None)
+        if node is None:
+            return None
+        _order, _trigger, value = self._terminal.pop(node)
+        self._invalidate()
+        return value
+
+    def get(self, trigger: str) -> T | None:
+        node = self._nodes.get(trigger)
+        return None if node is None else self._terminal[node][2]
+
+    def items(self) -> list[tuple[str, T]]:
+        """``(trigger, value)`` pairs in the order the triggers were first added."""
+        return [(trigger, value) for _o, trigger, value in sorted(self._terminal.values())]
+
+    def reset(self) -> None:
+        self.state = 0
+
+    def feed(self, char: str) -> tuple[str, T] | None:
+        """Advance by one character and return ``(trigger, value)`` if one ends here."""
+        key = self.state << _SHIFT | ord(char)
+        state = self._goto.get(key)
+        if state is None:
+            state = self._transition(self.state, ord(char))
+        self.state = state
+        out = self._out.get(state)
+        if out is None:
+            out = self._output(state)
+        if out < 0:
+            return None
+        _order, trigger, value = self._terminal[out]
+        return trigger, value
+
+    def feed_text(self, text: str) -> tuple[str, T] | None:
+        """Feed several characters; return the match at the last one, if any."""
+        match = None
+        for char in text:
+            match = self.feed(char)
+        return match
+
+    def resync(self, text: str) -> None:
+        """Rebuild the stream state from recent text, e.g. after the trie changed."""
+        self.state = 0
+        for char in text:
+            self.state = self._transition(self.state, ord(char))
+
+    def _next_order(self) -> int:
+        self._order += 1
+        return self._order
+
+    def _invalidate(self) -> None:
+        # Memo entries may now be wrong; clearing costs no more than building them did
+        self._goto.clear()
+        self._fail.clear()
+        self._out.clear()
+
+    def _transition(self, state: int, code: int) -> int:
+        key = state << _SHIFT | code
+        target = self._goto.get(key)
+        if target is None:
+            target = self._edges.get(key)
+            if target is None:
+                target = 0 if state == 0 else self._transition(self._failure(state), code)
+            if len(self._goto) >= _MEMO_LIMIT:
+                self._goto.clear()
+            self._goto[key] = target
+        return target
+
+    def _failure(self, node: int) -> int:
+        link = self._fail.get(node)
+        if link is None:
+            parent = self._parent[node]
+            link = 0 if parent == 0 else self._transition(self._failure(parent), self._code[node])
+            self._fail[node] = link
+        return link
+
+    def _output(self, node: int) -> int:
+        out = self._out.get(node)
+        if out is not None:
+            return out
+        out = -1 if node == 0 else self._output(self._failure(node))
+        own = self._terminal.get(node)
+        if own is not None and (out < 0 or self._prefer(node, out)):
+            out = node
+        self._out[node] = out
+        return out
+
+    def _prefer(self, node: int, other: int) -> bool:
+        if self.rule == "longest":
+            return self._depth[node] > self._depth[other]
+        return self._terminal[node][0] < self._terminal[other][0]
@@ -0,0 +1,207 @@
+"""Load snippet packs from a directory and keep the engine in sync as files change.
+
+A pack is a JSON, TOML or (with PyYAML installed) YAML file::
+
+    scope = "code.exe"            # optional, applies to every snippet below
+
+    [snippets]
+    ";log" = "console.log({cursor})"
+
+``snippets`` may also be a list of ``{trigger, replacement, scope}`` tables.
+A trigger defined in several packs takes the value of the pack loaded last.
+"""
+
+from __future__ import annotations
+
+import json
+import queue
+import threading
+import time
+import tomllib
+from pathlib import Path
+from typing import TYPE_CHECKING, Any
+
+from watchdog.events import FileSystemEvent, FileSystemEventHandler
+from watchdog.observers import Observer
+
+from mate.data.snippets import GLOBAL_SCOPE
+from mate.logging import get_logger
+
+if TYPE_CHECKING:
+    from mate.services.snippet_engine import SnippetEngine
+
+PackEntries = dict[tuple[str, str], str]  # (scope, trigger) -> replacement
+
+try:
+    import yaml
+except ImportError:  # YAML packs are optional
+    yaml = None
+
+PACK_SUFFIXES = frozenset({".json", ".toml"} | ({".yaml", ".yml"} if yaml else set()))
+
+
+class PackError(ValueError):
+    pass
+
+
+def load_pack(path: Path) -> PackEntries:
+    """Parse one pack file into its snippets."""
+    suffix = path.suffix.lower()
+    if suffix not in PACK_SUFFIXES:
+        raise PackError(f"unsupported pack format {suffix}")
+    raw = path.read_bytes()
+    try:
+        if suffix == ".toml":
+            data: Any = tomllib.loads(raw.decode("utf-8"))
+        elif suffix == ".json":
+            data = json.loads(raw)
+        else:
+            data = yaml.safe_load(raw)
+    except Exception as e:  # decode errors, and yaml.YAMLError is no ValueError
+        raise PackError(str(e)) from e
+    if not isinstance(data, dict):
+        raise PackError("a pack must be a table with a 'snippets' entry")
+    default_scope = str(data.get("scope", GLOBAL_SCOPE))
+    snippets = data.get("snippets", {})
+    if isinstance(snippets, dict):
+        snippets = [{"trigger": t, "replacement": r} for t, r in snippets.items()]
+    entries: PackEntries = {}
+    for item in snippets:
+        try:
+            trigger, replacement = str(item["trigger"]), str(item["replacement"])
+        except (KeyError, TypeError) as e:
+            raise PackError(f"snippet entry without trigger/replacement: {item!r}") from e
+        if trigger:
+            entries[(str(item.get("scope", default_scope)).lower(), trigger)] = replacement
+    return entries
+
+
+class SnippetPackWatcher(FileSystemEventHandler):
+    """Watch ``directory`` and apply pack edits to ``engine`` as deltas.
+
+    Watchdog callbacks only queue paths. A worker thread parses changed files,
+    diffs them against what it loaded before, and hands the added, changed
+    and removed snippets to ``SnippetEngine.update_snippets``. Events within
+    ``debounce`` seconds are coalesced, and a pack that fails to parse keeps
+    its previous snippets.
+    """
+
+    def __init__(self, directory: Path, engine: SnippetEngine, debounce: float = 0.01) -> None:
+        super().__init__()
+        self.directory = directory.resolve()
+        self.engine = engine
+        self.debounce = debounce
+        self.logger = get_logger("snippet-packs")
+        self.applied = 0  # batches of changes handed to the engine
+        self._packs: dict[Path, PackEntries] = {}
+        self._queue: queue.Queue[Path | None] = queue.Queue()
+        self._observer: Observer | None = None
+        self._worker: threading.Thread | None = None
+
+    def start(self) -> None:
+        if self._observer is not None:
+            return
+        self.directory.mkdir(parents=True, exist_ok=True)
+        self._worker = threading.Thread(target=self._run, name="mate-snippet-packs", daemon=True)
+        self._worker.start()
+        for path in sorted(self.directory.rglob("*")):
+            if self._relevant(path):
+                self._queue.put(path)
+        observer = Observer()
+        observer.schedule(self, str(self.directory), recursive=True)
+        observer.daemon = True
+        observer.start()
+        self._observer = observer
+
+    def stop(self) -> None:
+        if self._observer is not None:
+            self._observer.stop()
+            self._observer.join(timeout=2)
+            self._observer = None
+        if self._worker is not None:
+            self._queue.put(None)
+            self._worker.join(timeout=2)
+            self._worker = None
+
+    def on_any_event(self, event: FileSystemEvent) -> None:
+        if event.is_directory:
+            # A subdirectory renamed, removed or moved in carries packs no file event reports
+            if event.event_type not in ("created", "deleted", "moved"):
+                return
+        elif event.event_type in ("opened", "closed_no_write"):
+            return
+        for path in (event.src_path, getattr(event, "dest_path", "")):
+            if path and (event.is_directory or self._relevant(Path(path))):
+                self._queue.put(Path(path).resolve())
+
+    def _relevant(self, path: Path) -> bool:
+        return path.suffix.lower() in PACK_SUFFIXES and not path.name.startswith((".", "~"))
+
+    def _run(self) -> None:
+        while (path := self._queue.get()) is not None:
+            pending = {path}
+            deadline = time.monotonic() + self.debounce
+            while (remaining := deadline - time.monotonic()) > 0:
+                try:
+                    path = self._queue.get(timeout=remaining)
+                except queue.Empty:
+                    break
+                if path is None:
+                    return
+                pending.add(path)
+            try:
+                self._reload(sorted(self._expand(pending)))
+            except Exception:
+                self.logger.exception("Applying snippet pack changes failed")
+
+    def _expand(self, paths: set[Path]) -> set[Path]:
+        """Pack files behind ``paths``: the loaded packs under a directory, and its files now."""
+        packs: set[Path] = set()
+        for path in paths:
+            if path.is_dir():
+                packs.update(p.resolve() for p in path.rglob("*") if self._relevant(p))
+            elif self._relevant(path):
+                packs.add(path)
+            packs.update(p for p in self._packs if p.is_relative_to(path))
+        return packs
+
+    def _reload(self, paths: list[Path]) -> None:
+        started = time.perf_counter()
+        before: PackEntries = {}
+        after: PackEntries = {}
+        for path in paths:
+            old = self._packs.get(path, {})
+            try:
+                new = load_pack(path) if path.is_file() else {}
+            except (OSError, PackError) as e:
+                self.logger.error("Ignoring snippet pack {}: {}", path.name, e)
+                continue
+            if new:
+                self._packs[path] = new
+            else:
+                self._packs.pop(path, None)
+            before.update(old)
+            after.update(new)
+        upserts = [
+            (trigger, body, scope)
+            for (scope, trigger), body in after.items()
+            if before.get((scope, trigger)) != body
+        ]
+        removals = []
+        for key in before.keys() - after.keys():
+            owner = next((pack for pack in self._packs.values() if key in pack), None)
+            if owner is None:
+                removals.append((key[1], key[0]))
+            else:  # still defined by another pack
+                upserts.append((key[1], owner[key], key[0]))
+        if not upserts and not removals:
+            return
+        self.engine.update_snippets(upserts, removals)
+        self.applied += 1
+        self.logger.info(
+            "Applied {} changed and {} removed snippets from {} pack(s) in {:.1f} ms",
+            len(upserts),
+            len(removals),
+            len(paths),
+            (time.perf_counter() - started) * 1000,
+        )
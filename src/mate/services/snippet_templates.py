@@ -0,0 +1,230 @@
+"""Snippet templates, compiled once into a render plan.
+
+Placeholders in a replacement:
+
+* ``{date}`` / ``{date:%d.%m.%Y}`` - the local date/time through ``strftime``.
+* ``{clipboard}`` - the clipboard text when the snippet fires.
+* ``{cursor}`` - where the caret is left after the expansion.
+* ``{snippet:trigger}`` - another global snippet's expansion.
+* ``{{`` / ``}}`` - literal braces.
+
+Any other brace text is kept as is, so code snippets need no escaping. A
+template without dynamic placeholders renders to a precomputed string. Others
+memoize their last expansion until the earliest moment a fragment can change:
+the next second, minute, hour or local midnight, depending on the finest field
+a date format shows. Nested snippets are resolved once and kept until
+``Template.forget`` is told their trigger changed, and ``{clipboard}`` is never
+memoized.
+"""
+
+from __future__ import annotations
+
+import math
+import re
+import time
+from collections.abc import Callable
+
+from mate.logging import get_logger
+
+logger = get_logger("snippet-templates")
+
+BodyResolver = Callable[[str], "str | None"]
+
+_TOKEN = re.compile(r"\{\{|\}\}|\{(date|clipboard|cursor|snippet)(?::([^{}]*))?\}")
+_DEFAULT_DATE = "%Y-%m-%d"
+_MAX_NESTING = 8
+# strftime directives -> how many leading time.localtime() fields they depend on.
+# Anything not listed counts as per-second, so memoization can only be too eager
+# to refresh, never stale.
+_DATE_FIELDS = {"S": 6, "s": 6, "T": 6, "X": 6, "c": 6, "r": 6, "M": 5, "R": 5}
+_DATE_FIELDS.update(dict.fromkeys("HIpklZz", 4))
+_DATE_FIELDS.update(dict.fromkeys("aAbBCdDeFgGhjmntuUVwWxyY%", 3))
+_DATE_DIRECTIVE = re.compile(r"%[-#]?[EO]?(.)")
+
+
+class _DatePart:
+    __slots__ = ("fmt", "fields", "expires")
+
+    def __init__(self, fmt: str) -> None:
+        self.fmt = fmt
+        directives = _DATE_DIRECTIVE.findall(fmt)
+        self.fields = max((_DATE_FIELDS.get(d, 6) for d in directives), default=3)
+        self.expires = 0.0
+
+    def render(self, now: float) -> str:
+        local = time.localtime(now)
+        second = math.floor(now)
+        if self.fields == 6:
+            self.expires = second + 1
+        elif self.fields == 5:
+            self.expires = second - local.tm_sec + 60
+        elif self.fields == 4:
+            self.expires = second - local.tm_sec - 60 * local.tm_min + 3600
+        else:  # mktime normalizes the day overflow and applies DST
+            self.expires = time.mktime(
+                (local.tm_year, local.tm_mon, local.tm_mday + 1, 0, 0, 0, 0, 0, -1)
+            )
+        return time.strftime(self.fmt, local)
+
+
+class _ClipboardPart:
+    __slots__ = ()
+    expires = 0.0
+
+    def render(self, now: float) -> str:
+        import pyperclip
+
+        try:
+            return pyperclip.paste() or ""
+        except pyperclip.PyperclipException:
+            return ""
+
+
+class _SnippetPart:
+    __slots__ = ("trigger", "resolve", "stack", "expires", "_template")
+
+    def __init__(self, trigger: str, resolve: BodyResolver | None, stack: tuple[str, ...]) -> None:
+        self.trigger = trigger
+        self.resolve = resolve
+        self.stack = stack
+        self.expires = 0.0
+        self._template: Template | None = None
+
+    def render(self, now: float) -> str:
+        template = self._template
+        if template is None:
+            body = self.resolve(self.trigger) if self.resolve else None
+            if body is None:
+                logger.warning("Template refers to unknown snippet {}", self.trigger)
+                body = f"{{snippet:{self.trigger}}}"
+                template = Template(body, [body])
+            else:
+                template = compile_template(body, self.resolve, self.stack + (self.trigger,))
+            self._template = template
+        text = template.render(now)[0]
+        self.expires = template.expires
+        return text
+
+
+_Part = _DatePart | _ClipboardPart | _SnippetPart
+
+
+class Template:
+    """A replacement split into literal strings and placeholder parts."""
+
+    __slots__ = ("source", "static", "caret", "expires", "_head", "_tail", "_memo")
+
+    def __init__(
+        self, source: str, head: list[str | _Part], tail: list[str | _Part] | None = None
+    ) -> None:
+        self.source = source
+        self._head = head
+        self._tail = tail or []
+        self.static: str | None = None
+        self.caret = 0
+        self.expires = 0.0  # when the memoized expansion may change
+        self._memo = ("", 0)
+        if all(type(part) is str for part in head + self._tail):
+            tail_text = "".join(self._tail)  # type: ignore[arg-type]
+            self.static = "".join(head) + tail_text  # type: ignore[arg-type]
+            self.caret = _caret_steps(tail_text)
+            self.expires = math.inf
+
+    def render(self, now: float | None = None) -> tuple[str, int]:
+        """Return the expansion and how many characters the caret moves back from its end."""
+        if self.static is not None:
+            return self.static, self.caret
+        if now is None:
+            now = time.time()
+        if now < self.expires:
+            return self._memo
+        parts = self._head + self._tail
+        texts = [part if type(part) is str else part.render(now) for part in parts]
+        self.expires = min(part.expires for part in parts if type(part) is not str)
+        tail = "".join(texts[len(self._head) :])
+        self._memo = ("".join(texts[: len(self._head)]) + tail, _caret_steps(tail))
+        return self._memo
+
+    def forget(self, triggers: set[str] | None = None) -> bool:
+        """Drop nested ``{snippet:...}`` plans for ``triggers`` (all when ``None``).
+
+        Nested plans are resolved once and kept, so the engine calls this when
+        snippets change. Returns whether anything was dropped, in which case
+        the memoized expansion is discarded too.
+        """
+        if self.static is not None:
+            return False
+        dropped = False
+        for part in self._head + self._tail:
+            if type(part) is not _SnippetPart or part._template is None:
+                continue
+            if triggers is None or part.trigger in triggers:
+                part._template = None
+                dropped = True
+            elif part._template.forget(triggers):
+                dropped = True
+        if dropped:
+            self.expires = 0.0
+        return dropped
+
+
+def compile_template(
+    text: str, resolve: BodyResolver | None = None, _stack: tuple[str, ...] = ()
+) -> Template:
+    """Parse ``text`` into a render plan; ``resolve`` maps a trigger to its body."""
+    head: list[str | _Part] = []
+    tail: list[str | _Part] | None = None
+    plan = head
+    literal: list[str] = []
+    position = 0
+    for token in _TOKEN.finditer(text):
+        literal.append(text[position : token.start()])
+        position = token.end()
+        name, argument = token.group(1), token.group(2)
+        if name is None:
+            literal.append(token.group()[0])  # "{{" -> "{", "}}" -> "}"
+            continue
+        if name == "cursor" and tail is None:
+            _flush(plan, literal)
+            plan = tail = []
+            continue
+        part = _placeholder(name, argument, resolve, _stack)
+        if part is None:
+            literal.append(token.group())
+            continue
+        _flush(plan, literal)
+        plan.append(part)
+    literal.append(text[position:])
+    _flush(plan, literal)
+    return Template(text, head, tail)
+
+
+def _caret_steps(text: str) -> int:
+    # Injectors send a line break as one Enter, so CRLF is a single caret step
+    return len(text) - text.count("\r\n")
+
+
+def _flush(plan: list[str | _Part], literal: list[str]) -> None:
+    chunk = "".join(literal)
+    literal.clear()
+    if not chunk:
+        return
+    if plan and type(plan[-1]) is str:
+        plan[-1] += chunk  # type: ignore[operator]
+    else:
+        plan.append(chunk)
+
+
+def _placeholder(
+    name: str, argument: str | None, resolve: BodyResolver | None, stack: tuple[str, ...]
+) -> _Part | None:
+    if name == "date":
+        return _DatePart(argument or _DEFAULT_DATE)
+    if name == "clipboard":
+        return _ClipboardPart()
+    if name == "snippet" and argument:
+        if argument in stack or len(stack) >= _MAX_NESTING:
+            logger.warning("Snippet {} refers to itself; left unexpanded", argument)
+            return None
+        return _SnippetPart(argument, resolve, stack)
+    return None  # a second {cursor}, or {snippet} without a trigger
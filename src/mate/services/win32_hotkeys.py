@@ -53,12 +53,17 @@ class Win32HotkeyService:
         self._hwnd: int | None = None
         self._running = False
         self._qt_app: QtCore.QCoreApplication | None = None
+        self._dispatch: Callable[[Callable[[], None]], None] | None = None
         self._message_processor: MessageProcessor | None = None
 
     def set_qt_app(self, app: QtCore.QCoreApplication) -> None:
         """Set the Qt application instance for thread-safe callback dispatch."""
         self._qt_app = app
 
+    def set_dispatcher(self, dispatch: Callable[[Callable[[], None]], None]) -> None:
+        """Route hotkey callbacks through ``dispatch`` (e.g. ``QtBridge.call_soon``)."""
+        self._dispatch = dispatch
+
     def start(self) -> None:
         """Start the hotkey service and create message window."""
         with self._lock:
@@ -86,7 +91,7 @@ class Win32HotkeyService:
                         self._running = True
                         logger.info("Using existing hotkey window")
                         return
-                logger.error(f"Failed to register window class: {e}, error={error_code}")
+                logger.error("Failed to register window class: {}, error={}", e, error_code)
                 raise
 
             self._hwnd = win32gui.CreateWindowEx(
@@ -172,23 +177,34 @@ class Win32HotkeyService:
                 error = ctypes.get_last_error()
                 if error == 1409:  # ERROR_HOTKEY_ALREADY_REGISTERED
                     logger.warning(
-                        f"Hotkey already registered: modifiers=0x{modifiers:02X}, vk=0x{vk_code:02X}"
+                        "Hotkey already registered: modifiers=0x{:02X}, vk=0x{:02X}",
+                        modifiers,
+                        vk_code,
                     )
                 elif error == 87:  # ERROR_INVALID_PARAMETER
                     # Some key combinations are not supported by RegisterHotKey
                     # (e.g., arrow keys with certain modifiers on some Windows versions)
                     logger.warning(
-                        f"Hotkey combination not supported by Windows: modifiers=0x{modifiers:02X}, vk=0x{vk_code:02X} (error=87)"
+                        "Hotkey combination not supported by Windows: "
+                        "modifiers=0x{:02X}, vk=0x{:02X} (error=87)",
+                        modifiers,
+                        vk_code,
                     )
                 else:
                     logger.error(
-                        f"Failed to register hotkey: error={error}, modifiers=0x{modifiers:02X}, vk=0x{vk_code:02X}"
+                        "Failed to register hotkey: error={}, modifiers=0x{:02X}, vk=0x{:02X}",
+                        error,
+                        modifiers,
+                        vk_code,
                     )
                 return None
 
             self._hotkeys[hotkey_id] = callback
             logger.debug(
-                f"Registered hotkey ID={hotkey_id}, modifiers=0x{modifiers:02X}, vk=0x{vk_code:02X}"
+                "Registered hotkey ID={}, modifiers=0x{:02X}, vk=0x{:02X}",
+                hotkey_id,
+                modifiers,
+                vk_code,
             )
             return hotkey_id
 
@@ -213,9 +229,9 @@ class Win32HotkeyService:
         result = user32.UnregisterHotKey(self._hwnd, hotkey_id)
         if result:
             del self._hotkeys[hotkey_id]
-            logger.debug(f"Unregistered hotkey ID={hotkey_id}")
+            logger.debug("Unregistered hotkey ID={}", hotkey_id)
         else:
-            logger.warning(f"Failed to unregister hotkey ID={hotkey_id}")
+            logger.warning("Failed to unregister hotkey ID={}", hotkey_id)
 
         return bool(result)
 
@@ -227,14 +243,16 @@ class Win32HotkeyService:
                 callback = self._hotkeys.get(hotkey_id)
                 if callback:
                     # Dispatch to Qt main thread if available
-                    if self._qt_app:
+                    if self._dispatch:
+                        self._dispatch(callback)
+                    elif self._qt_app:
                         QtCore.QTimer.singleShot(0, callback)
                     else:
                         # Fallback: call directly (shouldn't happen in normal operation)
                         try:
                             callback()
                         except Exception as e:
-                            logger.error(f"Error in hotkey callback: {e}", exc_info=True)
+                            logger.error("Error in hotkey callback: {}", e, exc_info=True)
             return 0
 
         return win32gui.DefWindowProc(hwnd, msg, wparam, lparam)
@@ -256,5 +274,5 @@ class Win32HotkeyService:
                     win32gui.DispatchMessage(peek_result)
                 peek_result = win32gui.PeekMessage(win32con.PM_REMOVE, self._hwnd, 0, 0)
         except Exception as e:
-            logger.debug(f"Error processing messages: {e}")
+            logger.debug("Error processing messages: {}", e)
 
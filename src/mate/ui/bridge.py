@@ -0,0 +1,130 @@
+"""Batched cross-thread delivery onto the Qt main thread."""
+
+from __future__ import annotations
+
+import threading
+import time
+from collections import deque
+from collections.abc import Callable
+from dataclasses import dataclass
+from functools import partial
+from typing import Any
+
+from PySide6 import QtCore
+
+from mate.core.events import EventBus, Subscription
+from mate.logging import get_logger
+
+_NO_PAYLOAD = object()
+
+
+@dataclass(slots=True)
+class BridgeStats:
+    """Cross-thread post -> slot latency as observed by the bridge."""
+
+    delivered: int = 0
+    unrouted: int = 0  # posts for an action without a registered slot
+    batches: int = 0
+    total_latency_ns: int = 0
+    max_latency_ns: int = 0
+
+    @property
+    def mean_latency_ms(self) -> float:
+        return self.total_latency_ns / self.delivered / 1e6 if self.delivered else 0.0
+
+    @property
+    def max_latency_ms(self) -> float:
+        return self.max_latency_ns / 1e6
+
+
+class QtBridge(QtCore.QObject):
+    """Collect calls from any thread and run them on the Qt main thread.
+
+    Posted items land in one locked queue; the first post after a drain
+    schedules a single queued ``_drain`` call, which runs everything collected
+    so far in order. Actions are looked up in a registry of named slots, so
+    callers only need the action name.
+    """
+
+    def __init__(self, parent: QtCore.QObject | None = None) -> None:
+        super().__init__(parent)
+        self.logger = get_logger("ui.bridge")
+        self._slots: dict[str, Callable[[Any], None]] = {}
+        self._posters: dict[str, Callable[[Any], None]] = {}
+        self._queue: deque[tuple[int, str | Callable[..., None], Any]] = deque()
+        self._lock = threading.Lock()
+        self._scheduled = False
+        self._stats = BridgeStats()
+
+    def register(self, action: str, slot: Callable[[Any], None]) -> None:
+        """Run ``slot(payload)`` for every :meth:`post` of ``action``."""
+        self._slots[action] = slot
+
+    def poster(self, action: str) -> Callable[[Any], None]:
+        """Callable suitable as a thread-agnostic callback that posts ``action``."""
+        return lambda payload=None: self.post(action, payload)
+
+    def post(self, action: str, payload: Any = None) -> None:
+        self._enqueue(action, payload)
+
+    def call_soon(self, callback: Callable[[], None]) -> None:
+        self._enqueue(callback, _NO_PAYLOAD)
+
+    def subscribe(self, events: EventBus, topic: str, slot: Callable[[Any], None]) -> Subscription:
+        """Subscribe to ``topic`` and deliver its payloads to ``slot`` on the main thread.
+
+        The bus holds the subscription weakly, so it ends with this bridge.
+        """
+        self.register(topic, slot)
+        poster = self._posters.setdefault(topic, self.poster(topic))
+        return events.subscribe(topic, poster, weak=True)
+
+    def stats(self) -> BridgeStats:
+        with self._lock:
+            return BridgeStats(
+                delivered=self._stats.delivered,
+                unrouted=self._stats.unrouted,
+                batches=self._stats.batches,
+                total_latency_ns=self._stats.total_latency_ns,
+                max_latency_ns=self._stats.max_latency_ns,
+            )
+
+    def _enqueue(self, target: str | Callable[..., None], payload: Any) -> None:
+        with self._lock:
+            self._queue.append((time.perf_counter_ns(), target, payload))
+            if self._scheduled:
+                return
+            self._scheduled = True
+        QtCore.QMetaObject.invokeMethod(self, "_drain", QtCore.Qt.ConnectionType.QueuedConnection)
+
+    @QtCore.Slot()
+    def _drain(self) -> None:
+        with self._lock:
+            items, self._queue = self._queue, deque()
+            self._scheduled = False
+        worst = 0
+        total = 0
+        unrouted = 0
+        for posted_ns, target, payload in items:
+            if payload is _NO_PAYLOAD:
+                callback = target
+            else:
+                slot = self._slots.get(target)
+                if slot is None:
+                    self.logger.warning("No slot registered for action {!r}", target)
+                    unrouted += 1
+                    continue
+                callback = partial(slot, payload)
+            latency = time.perf_counter_ns() - posted_ns
+            total += latency
+            worst = max(worst, latency)
+            try:
+                callback()
+            except Exception:
+                self.logger.exception("Error delivering {!r} on main thread", target)
+        with self._lock:
+            self._stats.delivered += len(items) - unrouted
+            self._stats.unrouted += unrouted
+            self._stats.batches += 1
+            self._stats.total_latency_ns += total
+            self._stats.max_latency_ns = max(self._stats.max_latency_ns, worst)
@@ -6,8 +6,9 @@ from PySide6.QtWebEngineCore import QWebEnginePage, QWebEngineSettings
 
 from mate.config import MateSettings
 from mate.core.events import EventBus
-from mate.core.state import RuntimeState
+from mate.core.state import RuntimeState, StateDiff
 from mate.logging import get_logger
+from mate.ui.bridge import QtBridge
 from mate.ui.widgets import TitleBar
 from mate.utils import win32
 
@@ -258,9 +259,9 @@ class MainWindow(QtWidgets.QWidget):
         self.state = state
         self.ctx = ctx  # Store context reference for clean shutdown
         self.logger = get_logger("ui.shell")
+        self.bridge = QtBridge(self)  # Cross-thread events and hotkey actions
         self._tabs: dict[int, TabContainer] = {}  # tab index -> tab container
         self._current_tab_index = 0
-        self._current_view_mode = "chatgpt"  # "chatgpt" or "browser"
         self._chatgpt_view: ChatGPTView | None = None
 
         self._setup_window()
@@ -323,7 +324,6 @@ class MainWindow(QtWidgets.QWidget):
 
         # Set ChatGPT view as default
         self.view_stack.setCurrentIndex(0)
-        self._current_view_mode = "chatgpt"
 
     def _build_controls(self) -> QtWidgets.QLayout:
         # Empty layout - theme toggle moved to title bar
@@ -346,11 +346,10 @@ class MainWindow(QtWidgets.QWidget):
 
         layout.addWidget(QtWidgets.QLabel("Opacity"))
         layout.addWidget(self.opacity_slider, 1)
-        opacity_label = QtWidgets.QLabel(f"{int(self.settings.ui.opacity * 100)}%")
-        opacity_label.setMinimumWidth(40)
-        opacity_label.setAlignment(QtCore.Qt.AlignmentFlag.AlignRight)
-        self.opacity_slider.valueChanged.connect(lambda v: opacity_label.setText(f"{v}%"))
-        layout.addWidget(opacity_label)
+        self.opacity_value_label = QtWidgets.QLabel(f"{int(self.settings.ui.opacity * 100)}%")
+        self.opacity_value_label.setMinimumWidth(40)
+        self.opacity_value_label.setAlignment(QtCore.Qt.AlignmentFlag.AlignRight)
+        layout.addWidget(self.opacity_value_label)
         return layout
 
     def _build_splitter(self) -> QtWidgets.QSplitter:
@@ -391,7 +390,11 @@ class MainWindow(QtWidgets.QWidget):
         return widget
 
     def _wire_events(self) -> None:
-        self.events.subscribe("snippet.used", self._on_snippet_used)
+        self.bridge.subscribe(self.events, "snippet.used", self._on_snippet_used)
+        self.bridge.subscribe(self.events, "settings.changed", self._on_settings_changed)
+        # UI state writes are applied as one diff per event-loop tick
+        self.state.ui.set_scheduler(self.bridge.call_soon)
+        self.state.ui.subscribe(self._apply_ui_state)
         if self.settings.privacy.prevent_capture:
             win32.prevent_capture(self, True)
         win32.set_taskbar_visibility(self, not self.settings.privacy.hide_from_taskbar)
@@ -677,64 +680,79 @@ class MainWindow(QtWidgets.QWidget):
     def _on_snippet_used(self, snippet) -> None:
         self.status_label.setText(f"Expanded {snippet.trigger}")
 
+    def _on_settings_changed(self, changed: set[str]) -> None:
+        """Route reloaded UI settings through state so only affected widgets update."""
+        if "ui.opacity" in changed:
+            self.state.ui.opacity = self.settings.ui.opacity
+        if "ui.theme" in changed:
+            self.state.ui.theme = self.settings.ui.theme
+        if "privacy.prevent_capture" in changed:
+            win32.prevent_capture(self, self.settings.privacy.prevent_capture)
+        if "privacy.hide_from_taskbar" in changed:
+            win32.set_taskbar_visibility(self, not self.settings.privacy.hide_from_taskbar)
+
     def _handle_opacity_change(self, value: int) -> None:
-        new_opacity = value / 100
         # Clamp to valid range [0.2, 1.0] to match settings validation
-        clamped_opacity = max(0.2, min(1.0, new_opacity))
-        self.setWindowOpacity(clamped_opacity)
-        # Update settings to persist the change
-        self.settings.ui.opacity = clamped_opacity
-        # Sync slider if value was clamped
-        if clamped_opacity != new_opacity:
-            self.opacity_slider.blockSignals(True)
-            self.opacity_slider.setValue(int(clamped_opacity * 100))
-            self.opacity_slider.blockSignals(False)
+        self.state.ui.opacity = max(0.2, min(1.0, value / 100))
+
+    def _step_opacity(self, step: float) -> None:
+        """Nudge opacity from the latest requested value, clamped to [0.2, 1.0]."""
+        self.state.ui.opacity = round(max(0.2, min(1.0, self.state.ui.opacity + step)), 2)
 
     @QtCore.Slot()
     def _increaseOpacitySafe(self) -> None:  # noqa: N802
         """Increase window opacity."""
-        current_opacity = self.windowOpacity()
-        new_opacity = min(1.0, current_opacity + 0.05)  # Increase by 5%
-        self.setWindowOpacity(new_opacity)
-        # Sync slider
-        self.opacity_slider.setValue(int(new_opacity * 100))
-        self.status_label.setText(f"Opacity: {int(new_opacity * 100)}%")
-        # Update settings to persist the change
-        self.settings.ui.opacity = new_opacity
+        self._step_opacity(0.05)  # Increase by 5%
 
     @QtCore.Slot()
     def _decreaseOpacitySafe(self) -> None:  # noqa: N802
         """Decrease window opacity."""
-        current_opacity = self.windowOpacity()
-        new_opacity = max(0.2, current_opacity - 0.05)  # Decrease by 5%, minimum 20%
-        self.setWindowOpacity(new_opacity)
-        # Sync slider
-        self.opacity_slider.setValue(int(new_opacity * 100))
-        self.status_label.setText(f"Opacity: {int(new_opacity * 100)}%")
-        # Update settings to persist the change
-        self.settings.ui.opacity = new_opacity
+        self._step_opacity(-0.05)  # Decrease by 5%, minimum 20%
 
     def _handle_theme_change(self, theme: str) -> None:
-        self.settings.ui.theme = theme
-        self._apply_styles()
-        # Update title bar theme states
-        self.title_bar.set_theme(theme)
-        if self._chatgpt_view and hasattr(self._chatgpt_view, 'title_bar'):
-            self._chatgpt_view.title_bar.set_theme(theme)
-    
+        self.state.ui.theme = theme
+
     def _handle_theme_toggle(self) -> None:
         """Handle theme toggle from title bar button."""
-        # Toggle theme
-        new_theme = "dark" if self.settings.ui.theme == "light" else "light"
-        self.settings.ui.theme = new_theme
-        
-        # Update title bar theme states
-        self.title_bar.set_theme(new_theme)
-        if self._chatgpt_view and hasattr(self._chatgpt_view, 'title_bar'):
-            self._chatgpt_view.title_bar.set_theme(new_theme)
-        
-        # Apply new styles
-        self._apply_styles()
+        self.state.ui.theme = "dark" if self.state.ui.theme == "light" else "light"
+
+    def _apply_ui_state(self, diff: StateDiff) -> None:
+        """Apply a batched UI state diff: one repaint per tick, however many writes."""
+        # A hot reload updates settings before state, so only UI edits differ here
+        edited = False
+        if "opacity" in diff:
+            opacity = diff.new("opacity")
+            percent = round(opacity * 100)
+            self.setWindowOpacity(opacity)
+            # Sync slider without feeding the change back into state
+            self.opacity_slider.blockSignals(True)
+            self.opacity_slider.setValue(percent)
+            self.opacity_slider.blockSignals(False)
+            self.opacity_value_label.setText(f"{percent}%")
+            self.status_label.setText(f"Opacity: {percent}%")
+            edited |= self.settings.ui.opacity != opacity
+            self.settings.ui.opacity = opacity
+        if "theme" in diff:
+            theme = diff.new("theme")
+            edited |= self.settings.ui.theme != theme
+            self.settings.ui.theme = theme
+            # Update title bar theme states
+            self.title_bar.set_theme(theme)
+            if self._chatgpt_view and hasattr(self._chatgpt_view, 'title_bar'):
+                self._chatgpt_view.title_bar.set_theme(theme)
+            self._apply_styles()
+        if edited and self.ctx is not None and self.ctx.settings_store:
+            # Debounced: a burst of wheel steps becomes one write once input settles
+            self.ctx.settings_store.save(self.settings)
+        if "view_mode" in diff:
+            if diff.new("view_mode") == "chatgpt":
+                self.view_stack.setCurrentIndex(0)
+                if self._chatgpt_view:
+                    QtCore.QTimer.singleShot(100, lambda: self._chatgpt_view.ensure_audio_enabled())
+                self.logger.debug("Switched to ChatGPT view")
+            else:
+                self.view_stack.setCurrentIndex(1)
+                self.logger.debug("Switched to browser view")
 
     def _toggle_max_restore(self) -> None:
         if self.isMaximized():
@@ -755,9 +773,10 @@ class MainWindow(QtWidgets.QWidget):
     def _hideWindowSafe(self) -> None:  # noqa: N802
         """Hide the window (thread-safe)."""
         # Switch to ChatGPT view first, then hide after view change is complete
-        if self._current_view_mode != "chatgpt":
+        if self.state.ui.view_mode != "chatgpt":
             self._switch_to_chatgpt_view()
-            # Process events to ensure view change is rendered before hiding
+            # Apply the view change now and render it before hiding
+            self.state.ui.flush()
             QtWidgets.QApplication.processEvents()
         self.hide()
 
@@ -875,24 +894,16 @@ class MainWindow(QtWidgets.QWidget):
 
     def _switch_to_chatgpt_view(self) -> None:
         """Switch to ChatGPT-only view."""
-        if self._current_view_mode != "chatgpt":
-            self.view_stack.setCurrentIndex(0)
-            self._current_view_mode = "chatgpt"
-            if self._chatgpt_view:
-                QtCore.QTimer.singleShot(100, lambda: self._chatgpt_view.ensure_audio_enabled())
-            self.logger.debug("Switched to ChatGPT view")
-    
+        self.state.ui.view_mode = "chatgpt"
+
     def _switch_to_browser_view(self) -> None:
         """Switch to full browser view."""
-        if self._current_view_mode != "browser":
-            self.view_stack.setCurrentIndex(1)
-            self._current_view_mode = "browser"
-            self.logger.debug("Switched to browser view")
-    
+        self.state.ui.view_mode = "browser"
+
     @QtCore.Slot()
     def _toggleViewSafe(self) -> None:  # noqa: N802
         """Toggle between ChatGPT view and browser view."""
-        if self._current_view_mode == "chatgpt":
+        if self.state.ui.view_mode == "chatgpt":
             self._switch_to_browser_view()
         else:
             self._switch_to_chatgpt_view()
@@ -930,27 +941,9 @@ class MainWindow(QtWidgets.QWidget):
             modifiers = wheel_event.modifiers()
             # Check if Ctrl+Shift is pressed
             if modifiers & QtCore.Qt.KeyboardModifier.ControlModifier and modifiers & QtCore.Qt.KeyboardModifier.ShiftModifier:
-                # Get current opacity
-                current_opacity = self.windowOpacity()
-                # Get scroll delta (positive = scroll up, negative = scroll down)
+                # Scroll up = increase, scroll down = decrease opacity (5% per step)
                 delta = wheel_event.angleDelta().y()
-                # Adjust opacity based on scroll direction (5% per scroll step)
-                step = 0.05
-                if delta > 0:
-                    # Scroll up = increase opacity
-                    new_opacity = min(1.0, current_opacity + step)
-                else:
-                    # Scroll down = decrease opacity (minimum 20% to match settings validation)
-                    new_opacity = max(0.2, current_opacity - step)
-                
-                # Apply new opacity
-                self.setWindowOpacity(new_opacity)
-                # Sync slider
-                self.opacity_slider.setValue(int(new_opacity * 100))
-                # Update status label
-                self.status_label.setText(f"Opacity: {int(new_opacity * 100)}%")
-                # Update settings
-                self.settings.ui.opacity = new_opacity
+                self._step_opacity(0.05 if delta > 0 else -0.05)
                 # Return True to indicate we handled the event
                 return True
         
@@ -962,27 +955,9 @@ class MainWindow(QtWidgets.QWidget):
         modifiers = event.modifiers()
         # Check if Ctrl+Shift is pressed
         if modifiers & QtCore.Qt.KeyboardModifier.ControlModifier and modifiers & QtCore.Qt.KeyboardModifier.ShiftModifier:
-            # Get current opacity
-            current_opacity = self.windowOpacity()
-            # Get scroll delta (positive = scroll up, negative = scroll down)
+            # Scroll up = increase, scroll down = decrease opacity (5% per step)
             delta = event.angleDelta().y()
-            # Adjust opacity based on scroll direction (5% per scroll step)
-            step = 0.05
-            if delta > 0:
-                # Scroll up = increase opacity
-                new_opacity = min(1.0, current_opacity + step)
-            else:
-                # Scroll down = decrease opacity (minimum 20% to match settings validation)
-                new_opacity = max(0.2, current_opacity - step)
-            
-            # Apply new opacity
-            self.setWindowOpacity(new_opacity)
-            # Sync slider
-            self.opacity_slider.setValue(int(new_opacity * 100))
-            # Update status label
-            self.status_label.setText(f"Opacity: {int(new_opacity * 100)}%")
-            # Update settings
-            self.settings.ui.opacity = new_opacity
+            self._step_opacity(0.05 if delta > 0 else -0.05)
             # Accept the event to prevent default handling
             event.accept()
             return
@@ -1036,7 +1011,7 @@ class MainWindow(QtWidgets.QWidget):
         # Switch to new tab (this will trigger currentChanged signal which calls _on_tab_changed)
         self.tab_widget.setCurrentIndex(tab_index)
         
-        self.logger.debug(f"Created new tab {tab_index} with URL: {initial_url}")
+        self.logger.debug("Created new tab {} with URL: {}", tab_index, initial_url)
 
     def _close_tab(self, index: int) -> None:
         """Close a browser tab."""
@@ -1070,7 +1045,7 @@ class MainWindow(QtWidgets.QWidget):
         if current_index >= 0:
             self._on_tab_changed(current_index)
         
-        self.logger.debug(f"Closed tab {index}")
+        self.logger.debug("Closed tab {}", index)
 
     def _on_tab_changed(self, index: int) -> None:
         """Handle tab change - sync state."""
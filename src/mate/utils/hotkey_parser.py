@@ -188,3 +188,23 @@ def parse_hotkey(shortcut: str) -> ParsedHotkey:
 
     return ParsedHotkey(modifiers, vk_code)
 
+
+# Names the ``keyboard`` hook reports where they differ from the first VK_CODES alias
+_HOOK_KEY_NAMES = {0x1B: "esc", 0x2E: "delete", 0x21: "page up", 0x22: "page down"}
+# With Shift held the hook reports the character typed (US layout), e.g. "!" for shift+1
+_SHIFTED_NAMES = dict(zip("1234567890", "!@#$%^&*()"))
+
+
+def parse_chord(shortcut: str) -> tuple[int, str]:
+    """Parse a shortcut into ``(modifiers, key name)`` as the keyboard hook reports keys.
+
+    Raises:
+        ValueError: If the shortcut cannot be parsed or contains invalid keys
+    """
+    parsed = parse_hotkey(shortcut)
+    name = _HOOK_KEY_NAMES.get(parsed.vk_code)
+    if name is None:
+        name = next(key for key, code in VK_CODES.items() if code == parsed.vk_code)
+    if parsed.modifiers & MOD_SHIFT:
+        name = _SHIFTED_NAMES.get(name, name)
+    return parsed.modifiers, name
@@ -0,0 +1,194 @@
+"""Startup profiling: per-phase timings and the ``-X importtime`` module tree.
+
+Profiling runs in a fresh interpreter so modules already imported by the CLI
+do not hide their cost. The child prints phase timings as JSON on stdout while
+CPython writes import times to stderr. Its ``MATE_HOME`` is a temporary
+directory, so a profile starts from default settings and leaves ``~/.mate``
+untouched.
+"""
+
+from __future__ import annotations
+
+import json
+import os
+import subprocess
+import sys
+import tempfile
+import time
+from collections.abc import Callable
+from dataclasses import dataclass, field
+from typing import Any, TypeVar
+
+T = TypeVar("T")
+
+_IMPORTTIME_PREFIX = "import time:"
+
+
+@dataclass(slots=True)
+class StartupPhase:
+    name: str
+    ms: float
+
+
+@dataclass(slots=True)
+class ImportNode:
+    module: str
+    self_us: int
+    cumulative_us: int
+    children: list[ImportNode] = field(default_factory=list)
+
+
+@dataclass(slots=True)
+class StartupProfile:
+    phases: list[StartupPhase]
+    imports: list[ImportNode]
+    error: str | None = None
+
+
+def parse_importtime(stderr: str) -> list[ImportNode]:
+    """Build the import tree from ``-X importtime`` output.
+
+    CPython reports a module after everything it imported, indenting nested
+    imports by two spaces per level, so children are collected per depth
+    until their parent line arrives.
+    """
+    pending: dict[int, list[ImportNode]] = {}
+    for line in stderr.splitlines():
+        if not line.startswith(_IMPORTTIME_PREFIX):
+            continue
+        try:
+            self_us, cumulative_us, name = line[len(_IMPORTTIME_PREFIX) :].split("|", 2)
+            node = ImportNode(name.strip(), int(self_us), int(cumulative_us))
+        except ValueError:
+            continue  # the "self [us] | cumulative | imported package" header
+        depth = (len(name) - len(name.lstrip()) - 1) // 2
+        node.children = pending.pop(depth + 1, [])
+        pending.setdefault(depth, []).append(node)
+    return pending.get(0, [])
+
+
+def format_import_tree(
+    nodes: list[ImportNode], min_ms: float = 5.0, max_depth: int = 4
+) -> list[str]:
+    """Render nodes whose cumulative time is at least ``min_ms``, slowest first."""
+    lines: list[str] = []
+
+    def walk(level: list[ImportNode], depth: int) -> None:
+        for node in sorted(level, key=lambda n: n.cumulative_us, reverse=True):
+            if node.cumulative_us < min_ms * 1000:
+                break
+            lines.append(
+                f"{node.cumulative_us / 1000:8.1f} ms {node.self_us / 1000:7.1f} ms  "
+                f"{'  ' * depth}{node.module}"
+            )
+            if depth + 1 < max_depth:
+                walk(node.children, depth + 1)
+
+    walk(nodes, 0)
+    return lines
+
+
+def profile_startup(gui: bool = True, timeout: float = 120.0) -> StartupProfile:
+    """Profile a cold start in a child interpreter.
+
+    With ``gui=False`` only the settings/logging/context phases run, which is
+    what non-GUI CLI commands pay.
+    """
+    code = f"from mate.utils.startup_profile import _child_main; _child_main({gui!r})"
+    with tempfile.TemporaryDirectory(prefix="mate-profile-") as home:
+        result = subprocess.run(
+            [sys.executable, "-X", "importtime", "-c", code],
+            capture_output=True,
+            text=True,
+            timeout=timeout,
+            env={**os.environ, "MATE_HOME": home},
+        )
+    phases: list[StartupPhase] = []
+    error: str | None = None
+    try:
+        report = json.loads(result.stdout.strip().splitlines()[-1])
+        phases = [StartupPhase(**phase) for phase in report["phases"]]
+        error = report.get("error")
+    except (IndexError, ValueError, KeyError, TypeError):
+        lines = result.stderr.splitlines()
+        tail = [line for line in lines if not line.startswith(_IMPORTTIME_PREFIX)]
+        error = "\n".join(tail[-5:]) or f"profiler exited with status {result.returncode}"
+    return StartupProfile(phases=phases, imports=parse_importtime(result.stderr), error=error)
+
+
+def measure_phases(
+    gui: bool = True, phases: list[StartupPhase] | None = None
+) -> list[StartupPhase]:
+    """Time each startup phase in this interpreter, in the order ``mate.main`` runs them.
+
+    Phases are appended to ``phases`` as they finish, so a caller keeps the
+    timings gathered before a failing phase.
+    """
+    phases = [] if phases is None else phases
+
+    def timed(name: str, step: Callable[[], T]) -> T:
+        started = time.perf_counter()
+        value = step()
+        phases.append(StartupPhase(name, (time.perf_counter() - started) * 1000))
+        return value
+
+    from mate.config import load_settings
+
+    settings = timed("settings", load_settings)
+
+    from mate.logging import configure_logging
+
+    timed("logging", lambda: configure_logging(settings))
+    if not gui:
+        from mate.core.app import build_context
+
+        timed("build_context", lambda: build_context(settings)).stop()
+        return phases
+
+    # mate.main sets the QtWebEngine environment before Qt is imported
+    timed("import mate.main", lambda: __import__("mate.main"))
+    from PySide6 import QtWidgets
+
+    from mate.core.app import build_context
+    from mate.ui.shell import MainWindow
+
+    app = timed(
+        "QApplication", lambda: QtWidgets.QApplication.instance() or QtWidgets.QApplication([])
+    )
+    ctx = timed("build_context", lambda: build_context(settings))
+    window = timed("MainWindow", lambda: MainWindow(settings, ctx.events, ctx.state, ctx))
+    timed("first paint", lambda: _wait_for_first_paint(app, window))
+    ctx.stop()
+    return phases
+
+
+def _wait_for_first_paint(app: Any, window: Any, timeout: float = 10.0) -> None:
+    from PySide6 import QtCore
+
+    class PaintProbe(QtCore.QObject):
+        painted = False
+
+        def eventFilter(self, obj: QtCore.QObject, event: QtCore.QEvent) -> bool:  # noqa: N802
+            if event.type() == QtCore.QEvent.Type.Paint:
+                self.painted = True
+            return False
+
+    probe = PaintProbe()
+    window.installEventFilter(probe)
+    window.show()
+    deadline = time.perf_counter() + timeout
+    while not probe.painted and time.perf_counter() < deadline:
+        app.processEvents(QtCore.QEventLoop.ProcessEventsFlag.AllEvents, 10)
+    window.removeEventFilter(probe)
+
+
+def _child_main(gui: bool) -> None:
+    phases: list[StartupPhase] = []
+    error: str | None = None
+    try:
+        measure_phases(gui, phases)
+    except Exception as e:
+        error = f"{type(e).__name__}: {e}"
+    report = {"phases": [{"name": p.name, "ms": p.ms} for p in phases], "error": error}
+    sys.stdout.write("\n" + json.dumps(report) + "\n")
+    sys.stdout.flush()
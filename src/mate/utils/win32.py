@@ -3,6 +3,7 @@
 from __future__ import annotations
 
 import ctypes
+from ctypes import wintypes
 
 from PySide6 import QtWidgets
 
@@ -17,6 +18,74 @@ WS_EX_APPWINDOW = 0x00040000
 WDA_NONE = 0x0
 WDA_EXCLUDEFROMCAPTURE = 0x11
 
+INPUT_KEYBOARD = 1
+KEYEVENTF_KEYUP = 0x0002
+KEYEVENTF_UNICODE = 0x0004
+VK_BACK = 0x08
+VK_RETURN = 0x0D
+VK_LEFT = 0x25
+_SEND_INPUT_BATCH = 4096
+
+EVENT_SYSTEM_FOREGROUND = 0x0003
+WINEVENT_OUTOFCONTEXT = 0x0000
+WM_QUIT = 0x0012
+
+
+class KEYBDINPUT(ctypes.Structure):
+    _fields_ = [
+        ("wVk", wintypes.WORD),
+        ("wScan", wintypes.WORD),
+        ("dwFlags", wintypes.DWORD),
+        ("time", wintypes.DWORD),
+        ("dwExtraInfo", ctypes.c_size_t),
+    ]
+
+
+class MOUSEINPUT(ctypes.Structure):
+    _fields_ = [
+        ("dx", wintypes.LONG),
+        ("dy", wintypes.LONG),
+        ("mouseData", wintypes.DWORD),
+        ("dwFlags", wintypes.DWORD),
+        ("time", wintypes.DWORD),
+        ("dwExtraInfo", ctypes.c_size_t),
+    ]
+
+
+class _INPUTUNION(ctypes.Union):
+    # MOUSEINPUT is the largest member and fixes sizeof(INPUT)
+    _fields_ = [("ki", KEYBDINPUT), ("mi", MOUSEINPUT)]
+
+
+class INPUT(ctypes.Structure):
+    _fields_ = [("type", wintypes.DWORD), ("union", _INPUTUNION)]
+
+
+WinEventProc = ctypes.WINFUNCTYPE(
+    None,
+    wintypes.HANDLE,
+    wintypes.DWORD,
+    wintypes.HWND,
+    wintypes.LONG,
+    wintypes.LONG,
+    wintypes.DWORD,
+    wintypes.DWORD,
+)
+# Handles are pointer-sized; without a restype ctypes truncates them to a C int on x64
+user32.SetWinEventHook.restype = wintypes.HANDLE
+user32.SetWinEventHook.argtypes = [
+    wintypes.DWORD,
+    wintypes.DWORD,
+    wintypes.HMODULE,
+    WinEventProc,
+    wintypes.DWORD,
+    wintypes.DWORD,
+    wintypes.DWORD,
+]
+user32.UnhookWinEvent.restype = wintypes.BOOL
+user32.UnhookWinEvent.argtypes = [wintypes.HANDLE]
+user32.GetForegroundWindow.restype = wintypes.HWND
+
 
 def _hwnd(widget: QtWidgets.QWidget) -> int:
     return int(widget.winId())
@@ -35,3 +104,51 @@ def set_taskbar_visibility(widget: QtWidgets.QWidget, visible: bool) -> None:
     else:
         style = (style | WS_EX_TOOLWINDOW) & ~WS_EX_APPWINDOW
     SetWindowLong(hwnd, GWL_EXSTYLE, style)
+
+
+def _key(vk: int, scan: int, flags: int) -> INPUT:
+    return INPUT(INPUT_KEYBOARD, _INPUTUNION(ki=KEYBDINPUT(vk, scan, flags, 0, 0)))
+
+
+def send_inputs(inputs: list[INPUT]) -> int:
+    """Send key events in as few ``SendInput`` calls as possible; return how many were sent."""
+    sent = 0
+    for start in range(0, len(inputs), _SEND_INPUT_BATCH):
+        chunk = inputs[start : start + _SEND_INPUT_BATCH]
+        array = (INPUT * len(chunk))(*chunk)
+        sent += user32.SendInput(len(chunk), array, ctypes.sizeof(INPUT))
+    return sent
+
+
+def virtual_key_inputs(vk: int, count: int = 1) -> list[INPUT]:
+    """Down/up pairs for ``vk`` pressed ``count`` times."""
+    return [_key(vk, 0, flags) for _ in range(count) for flags in (0, KEYEVENTF_KEYUP)]
+
+
+def unicode_inputs(text: str) -> list[INPUT]:
+    """Down/up pairs typing ``text`` as UTF-16 code units, independent of keyboard layout.
+
+    Line breaks are sent as Enter, which is what editors expect.
+    """
+    inputs: list[INPUT] = []
+    for line_no, line in enumerate(text.replace("\r\n", "\n").split("\n")):
+        if line_no:
+            inputs.extend(virtual_key_inputs(VK_RETURN))
+        data = line.encode("utf-16-le")
+        for i in range(0, len(data), 2):
+            unit = int.from_bytes(data[i : i + 2], "little")
+            inputs.append(_key(0, unit, KEYEVENTF_UNICODE))
+            inputs.append(_key(0, unit, KEYEVENTF_UNICODE | KEYEVENTF_KEYUP))
+    return inputs
+
+
+def window_process_id(hwnd: int) -> int:
+    pid = wintypes.DWORD()
+    user32.GetWindowThreadProcessId(wintypes.HWND(hwnd), ctypes.byref(pid))
+    return pid.value
+
+
+def window_class(hwnd: int) -> str:
+    buffer = ctypes.create_unicode_buffer(256)
+    user32.GetClassNameW(wintypes.HWND(hwnd), buffer, len(buffer))
+    return buffer.value
@@ -0,0 +1,49 @@
+import threading
+
+from mate.core.events import EventBus
+from mate.ui.bridge import QtBridge
+
+
+def test_bridge_batches_cross_thread_posts_onto_main_thread(qtbot):
+    bridge = QtBridge()
+    main_thread = threading.current_thread()
+    received = []
+    bridge.register(
+        "action", lambda payload: received.append((payload, threading.current_thread()))
+    )
+
+    events = EventBus()
+    bridge.subscribe(events, "snippet.used", lambda payload: received.append((payload, None)))
+
+    def produce():
+        for value in range(5):
+            bridge.post("action", value)
+        events.emit("snippet.used", "sig")
+
+    worker = threading.Thread(target=produce)
+    worker.start()
+    worker.join()
+
+    qtbot.waitUntil(lambda: len(received) == 6)
+    assert [payload for payload, _ in received] == [0, 1, 2, 3, 4, "sig"]
+    assert all(thread in (main_thread, None) for _, thread in received)
+    stats = bridge.stats()
+    assert stats.delivered == 6
+    assert stats.batches == 1
+
+
+def test_bridge_counts_unrouted_posts_and_survives_failing_slots(qtbot):
+    bridge = QtBridge()
+    received = []
+
+    def broken(payload):
+        raise RuntimeError("boom")
+
+    bridge.register("broken", broken)
+    bridge.register("action", received.append)
+    bridge.post("missing", 1)
+    bridge.post("broken", 2)
+    bridge.post("action", 3)
+    qtbot.waitUntil(lambda: received == [3])
+    stats = bridge.stats()
+    assert (stats.delivered, stats.unrouted) == (2, 1)
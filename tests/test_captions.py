@@ -0,0 +1,25 @@
+from mate.core.captions import CaptionHistory, CaptionSource
+
+
+def test_history_evicts_oldest_frames_within_budget():
+    history = CaptionHistory(max_frames=4, text_bytes=32)
+    for second in range(10):
+        history.append(f"line {second} héllo", timestamp=float(second))
+    assert len(history) == 2  # 16-byte frames, 32-byte arena
+    assert [frame.text for frame in history.between(0.0)] == ["line 8 héllo", "line 9 héllo"]
+    assert [frame.seq for frame in history.search("héllo")] == [8, 9]
+
+
+def test_history_time_slicing_and_search():
+    history = CaptionHistory()
+    history.append("hello team", 10.0)
+    history.append("quarterly numbers look good", 20.0, CaptionSource.SPEAKER, 0.8)
+    history.append("hello again, numbers please", 30.0)
+
+    assert [f.text for f in history.between(15.0, 30.0)] == ["quarterly numbers look good"]
+    assert [f.seq for f in history.search("numbers")] == [1, 2]
+    assert [f.seq for f in history.search("numbers hello", since=25.0)] == [2]
+    assert [f.seq for f in history.find("ARTERLY num")] == [1]
+    speaker = history.frame(1)
+    assert speaker.source is CaptionSource.SPEAKER
+    assert round(speaker.confidence, 2) == 0.8
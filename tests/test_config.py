@@ -1,3 +1,5 @@
+import os
+
 from mate.config import MateSettings, load_settings
 
 
@@ -13,3 +15,102 @@ def test_ui_defaults():
     settings = MateSettings()
     assert settings.ui.opacity == 0.5
     assert settings.ui.theme == "light"
+
+
+def test_load_settings_reuses_cached_snapshot(tmp_path, monkeypatch):
+    from mate import config
+
+    monkeypatch.setenv("MATE_HOME", str(tmp_path / "mate-home"))
+    monkeypatch.setenv("MATE_THEME", "dark")
+    first = load_settings()
+    assert (tmp_path / "mate-home" / "cache" / "settings.pickle").exists()
+
+    def rebuild():
+        raise AssertionError("cache miss")
+
+    original = config._build_settings
+    monkeypatch.setattr(config, "_build_settings", rebuild)
+    assert load_settings() == first
+
+    monkeypatch.setattr(config, "_build_settings", original)
+    monkeypatch.setenv("MATE_THEME", "light")
+    assert load_settings().ui.theme == "light"
+
+
+def test_diff_settings_reports_changed_paths():
+    from mate.config import diff_settings
+
+    old = MateSettings()
+    new = MateSettings(ui={"theme": "dark"})
+    new.hotkeys.bindings[0].shortcut = "ctrl+alt+h"
+    assert diff_settings(old, new) == {"ui.theme", "hotkeys.bindings"}
+    assert diff_settings(old, MateSettings()) == set()
+
+
+def test_load_settings_rebuilds_incomplete_snapshot(tmp_path, monkeypatch):
+    import pickle
+
+    from mate import config
+
+    monkeypatch.setenv("MATE_HOME", str(tmp_path / "mate-home"))
+    load_settings()
+    cache = tmp_path / "mate-home" / "cache" / "settings.pickle"
+    key, settings = pickle.loads(cache.read_bytes())
+    del settings.__dict__["logging"]  # as pickled by a release without that section
+    cache.write_bytes(pickle.dumps((key, settings)))
+    assert config._read_settings_cache(cache, key) is None
+    assert load_settings().logging == MateSettings().logging
+
+
+def test_load_settings_ignores_snapshot_of_missing_module(tmp_path, monkeypatch):
+    monkeypatch.setenv("MATE_HOME", str(tmp_path / "mate-home"))
+    cache = tmp_path / "mate-home" / "cache" / "settings.pickle"
+    cache.parent.mkdir(parents=True)
+    # A pickled global from a module that no longer exists, as left by an older release
+    cache.write_bytes(b"cmate_removed_module\nSettings\n.")
+    assert isinstance(load_settings(), MateSettings)
+
+
+def test_load_settings_applies_dotenv_on_cache_hit(tmp_path, monkeypatch):
+    from mate import config
+
+    monkeypatch.setenv("MATE_HOME", str(tmp_path / "mate-home"))
+    monkeypatch.setenv("MATE_EXTRA_FLAG", "")  # so teardown removes what .env adds
+    monkeypatch.delenv("MATE_EXTRA_FLAG")
+    env_file = tmp_path / ".env"
+    env_file.write_text("MATE_EXTRA_FLAG=1\n", encoding="utf-8")
+    monkeypatch.setattr(config, "_DOTENV_INJECTED", set())
+    load_settings(env_file)
+    os.environ.pop("MATE_EXTRA_FLAG")  # a fresh process
+    config._DOTENV_INJECTED.clear()
+
+    def rebuild():
+        raise AssertionError("cache miss")
+
+    monkeypatch.setattr(config, "_build_settings", rebuild)
+    load_settings(env_file)
+    assert os.environ["MATE_EXTRA_FLAG"] == "1"
+
+
+def test_coalesce_policy_needs_a_window_and_an_edge():
+    import pytest
+    from pydantic import ValidationError
+
+    from mate.config import EventSettings
+
+    for policy in ({}, {"window_ms": 50, "leading": False, "trailing": False}):
+        with pytest.raises(ValidationError):
+            EventSettings(coalesce={"caption.partial": policy})
+    assert EventSettings(coalesce={"caption.partial": {"max_rate_hz": 30}}).coalesce
+
+
+def test_settings_cache_follows_mate_home_from_dotenv(tmp_path, monkeypatch):
+    from mate import config
+
+    monkeypatch.setenv("MATE_HOME", "")  # so teardown restores or removes it
+    monkeypatch.delenv("MATE_HOME")
+    monkeypatch.setattr(config, "_DOTENV_INJECTED", set())
+    env_file = tmp_path / ".env"
+    env_file.write_text(f"MATE_HOME={tmp_path / 'from-env'}\n", encoding="utf-8")
+    load_settings(env_file)
+    assert (tmp_path / "from-env" / "cache" / "settings.pickle").exists()
@@ -1,3 +1,7 @@
+import gc
+import threading
+import time
+
 from mate.core.events import EventBus
 
 
@@ -7,3 +11,143 @@ def test_event_bus_invokes_subscribers():
     bus.subscribe("topic", lambda payload: received.append(payload))
     bus.emit("topic", 42)
     assert received == [42]
+
+
+def test_async_topic_delivers_on_worker_thread():
+    bus = EventBus()
+    bus.configure_topic("slow")
+    threads = []
+    done = threading.Event()
+
+    def handler(payload):
+        threads.append(threading.current_thread())
+        done.set()
+
+    bus.subscribe("slow", handler)
+    bus.emit("slow", 1)
+    assert done.wait(1.0)
+    assert threads[0] is not threading.current_thread()
+    bus.close()
+    assert bus.stats() == {}
+
+
+def test_async_topic_drop_policies_count_drops():
+    for overflow, expected in (("drop_newest", [0, 1]), ("drop_oldest", [0, 3])):
+        bus = EventBus()
+        gate = threading.Event()
+        received = []
+
+        def handler(payload, received=received, gate=gate):
+            gate.wait(1.0)
+            received.append(payload)
+
+        bus.subscribe("burst", handler)
+        bus.configure_topic("burst", maxsize=1, overflow=overflow)
+        bus.emit("burst", 0)
+        deadline = time.monotonic() + 1.0
+        while bus.stats()["burst"].depth:  # wait until the worker holds event 0
+            assert time.monotonic() < deadline, "worker never picked up the first event"
+            time.sleep(0.001)
+        for payload in (1, 2, 3):
+            bus.emit("burst", payload)
+        stats = bus.stats()["burst"]
+        assert stats.depth == 1
+        assert stats.dropped == 2
+        gate.set()
+        bus.close()
+        assert received == expected
+
+
+def test_unsubscribe_during_emit_keeps_current_snapshot():
+    bus = EventBus()
+    received = []
+
+    def first(payload):
+        received.append(("first", payload))
+        bus.unsubscribe("topic", second)
+
+    def second(payload):
+        received.append(("second", payload))
+
+    bus.subscribe("topic", first)
+    bus.subscribe("topic", second)
+    bus.emit("topic", 1)
+    bus.emit("topic", 2)
+    assert received == [("first", 1), ("second", 1), ("first", 2)]
+
+
+def test_wildcard_subscriptions_match_namespaces():
+    bus = EventBus()
+    received = []
+    bus.subscribe("hotkey.*", lambda payload: received.append(("star", payload)))
+    bus.subscribe("caption.#", lambda payload: received.append(("hash", payload)))
+    bus.emit("hotkey.triggered", 1)
+    bus.emit("hotkey.triggered.late", 2)
+    bus.emit("caption", 3)
+    bus.emit("caption.partial.mic", 4)
+    assert received == [("star", 1), ("hash", 3), ("hash", 4)]
+
+
+def test_route_cache_invalidated_on_subscription_change():
+    bus = EventBus()
+    received = []
+
+    def handler(payload):
+        received.append(payload)
+
+    bus.subscribe("snippet.used", handler)
+    bus.subscribe("snippet.*", handler)
+    bus.emit("snippet.used", 1)
+    bus.unsubscribe("snippet.used", handler)
+    bus.unsubscribe("snippet.*", handler)
+    bus.emit("snippet.used", 2)
+    assert received == [1]
+
+
+def test_coalesced_topic_delivers_leading_and_latest_trailing():
+    bus = EventBus()
+    received = []
+    delivered = threading.Event()
+
+    def handler(payload):
+        received.append(payload)
+        if payload == 9:
+            delivered.set()
+
+    bus.subscribe("ui.opacity", handler)
+    bus.coalesce("ui.opacity", window=0.05, leading=True)
+    for value in range(10):
+        bus.emit("ui.opacity", value)
+    assert received == [0]
+    assert delivered.wait(1.0)
+    assert received == [0, 9]
+    assert bus.coalesced_counts() == {"ui.opacity": 8}
+    bus.close()
+
+
+def test_weak_subscription_is_pruned_when_owner_is_collected():
+    class Widget:
+        def __init__(self):
+            self.received = []
+
+        def on_event(self, payload):
+            self.received.append(payload)
+
+    bus = EventBus()
+    widget = Widget()
+    bus.subscribe("snippet.used", widget.on_event, weak=True)
+    bus.emit("snippet.used", 1)
+    assert widget.received == [1]
+
+    del widget
+    gc.collect()
+    assert bus.handlers_for("snippet.used") == ()
+
+
+def test_subscription_handle_unsubscribes_on_exit():
+    bus = EventBus()
+    received = []
+    with bus.subscribe("topic", received.append):
+        bus.emit("topic", 1)
+    bus.emit("topic", 2)
+    assert received == [1]
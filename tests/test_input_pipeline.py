@@ -0,0 +1,98 @@
+import threading
+
+from mate.config import HotkeyBinding, HotkeySettings, SnippetSettings
+from mate.core.events import EventBus
+from mate.services.hotkeys import HotkeyManager
+from mate.services.input_pipeline import InputPipeline, SyntheticBackend
+from mate.services.snippet_engine import SnippetEngine
+
+
+class Recorder:
+    name = "typing"
+
+    def __init__(self):
+        self.calls = []
+
+    def inject(self, erase, text):
+        self.calls.append((erase, text))
+
+
+def test_one_pipeline_feeds_snippets_and_hotkey_chords():
+    backend = SyntheticBackend()
+    pipeline = InputPipeline(backend)
+    events = EventBus()
+    settings = SnippetSettings(defaults=[{"trigger": "::sig", "replacement": "Regards"}])
+    engine = SnippetEngine(settings, events, pipeline=pipeline)
+    engine.injection.injector = injector = Recorder()
+    bindings = [HotkeyBinding(name="Hide", shortcut="ctrl+shift+z", action="hide_window")]
+    hotkeys = HotkeyManager(HotkeySettings(backend="hook", bindings=bindings), events, pipeline)
+    fired = threading.Event()
+    hotkeys.register_callback("hide_window", lambda binding: fired.set())
+    engine.start()
+    hotkeys.start()
+    try:
+        backend.chord("ctrl+shift+z")
+        assert fired.is_set()
+        backend.chord("ctrl+s")  # no binding, and not text for the snippet engine
+        backend.type_text("x ::sig")
+        assert engine.join()
+        assert injector.calls == [(5, "Regards")]
+        assert engine.stats.keys == 7  # only printable key-downs reach the engine
+        assert pipeline.stats.chords == 1 and pipeline.stats.events == 6 + 4 + 14
+        assert engine.stats.expand_max_ns >= engine.stats.wait_max_ns > 0
+
+        hotkeys.apply_settings(HotkeySettings(backend="hook", bindings=[]))
+        fired.clear()
+        backend.chord("ctrl+shift+z")
+        assert not fired.is_set()
+    finally:
+        hotkeys.stop()
+        engine.stop()
+        pipeline.stop()
+
+
+def test_altgr_text_reaches_char_consumers_and_stale_modifiers_are_dropped():
+    backend = SyntheticBackend()
+    pipeline = InputPipeline(backend)
+    chars = []
+    pipeline.subscribe(lambda event: chars.append(event.name), chars_only=True)
+    pipeline.start()
+    backend.send("alt gr")
+    backend.tap("@")  # AltGr+Q on a German layout
+    backend.send("alt gr", "up")
+    backend.send("ctrl")
+    backend.tap("c")
+    backend.pressed.discard("ctrl")  # the key-up never reached the hook
+    backend.tap("x")
+    assert chars == ["@", "x"]
+
+
+def test_failing_consumer_does_not_starve_the_others():
+    backend = SyntheticBackend()
+    pipeline = InputPipeline(backend)
+    seen = []
+
+    def broken(event):
+        raise RuntimeError("boom")
+
+    pipeline.subscribe(broken)
+    pipeline.subscribe(lambda event: seen.append(event.name))
+    pipeline.subscribe(broken, chars_only=True)
+    pipeline.subscribe(lambda event: seen.append(event.name.upper()), chars_only=True)
+    pipeline.start()
+    backend.send("a")
+    assert seen == ["a", "A"]
+
+
+def test_shifted_digit_chord_matches_the_reported_symbol():
+    from mate.utils.hotkey_parser import parse_chord
+
+    backend = SyntheticBackend()
+    pipeline = InputPipeline(backend)
+    fired = []
+    pipeline.bind_chord(parse_chord("ctrl+shift+1"), lambda: fired.append(True))
+    pipeline.start()
+    backend.send("ctrl")
+    backend.send("shift")
+    backend.tap("!")  # what the hook reports for shift+1
+    assert fired == [True]
@@ -0,0 +1,54 @@
+from mate.core.events import EventBus
+from mate.core.journal import EventJournal, read_segment, replay, segments
+
+
+def test_journal_records_and_replays_events(tmp_path):
+    bus = EventBus()
+    journal = EventJournal(tmp_path)
+    journal.attach(bus)
+    bus.emit("snippet.used", {"trigger": "::sig"})
+    bus.emit("hotkey.triggered", "hide_window")
+    journal.close()
+
+    (segment,) = segments(tmp_path)
+    assert [(r.topic, r.payload) for r in read_segment(segment)] == [
+        ("snippet.used", {"trigger": "::sig"}),
+        ("hotkey.triggered", "hide_window"),
+    ]
+
+    target = EventBus()
+    received = []
+    target.subscribe("#", received.append)
+    assert replay(target, segment, speed=None) == 2
+    assert received == [{"trigger": "::sig"}, "hide_window"]
+
+
+def test_journal_rotates_and_prunes_segments(tmp_path):
+    bus = EventBus()
+    journal = EventJournal(tmp_path, segment_bytes=64, max_segments=2)
+    journal.attach(bus)
+    for value in range(10):
+        bus.emit("tick", value)
+    journal.close()
+
+    kept = segments(tmp_path)
+    assert len(kept) == 2
+    payloads = [record.payload for segment in kept for record in read_segment(segment)]
+    assert 0 < len(payloads) < 10
+    assert payloads == list(range(10))[-len(payloads) :]
+
+
+def test_journal_writes_off_the_emitting_thread_and_skips_unpicklable(tmp_path):
+    import threading
+
+    bus = EventBus()
+    journal = EventJournal(tmp_path)
+    journal.attach(bus)
+    bus.emit("tick", 1)
+    bus.emit("tick", threading.Lock())  # not picklable
+    bus.emit("tick", 2)
+    journal.flush()
+    assert (journal.recorded, journal.skipped, journal.dropped) == (2, 1, 0)
+    journal.close()
+    (segment,) = segments(tmp_path)
+    assert [record.payload for record in read_segment(segment)] == [1, 2]
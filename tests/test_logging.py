@@ -0,0 +1,87 @@
+import io
+import json
+
+from loguru import logger
+
+from mate.config import LogSettings
+from mate.logging import LogPipeline
+
+
+def _pipeline(tmp_path, **overrides):
+    settings = LogSettings(json_lines=True, **overrides)
+    console = io.StringIO()
+    pipeline = LogPipeline(settings, tmp_path, console=console)
+    handler = logger.add(pipeline.sink, level="DEBUG", format="{message}", filter=pipeline.filter)
+    return pipeline, console, handler
+
+
+def test_queued_pipeline_writes_text_json_and_console(tmp_path):
+    pipeline, console, handler = _pipeline(tmp_path)
+    try:
+        logger.bind(context="hotkeys").debug("registered")
+        logger.bind(context="hotkeys").info("ready")
+    finally:
+        logger.remove(handler)
+        pipeline.close()
+    assert pipeline.written == 2
+    assert "hotkeys | registered" in (tmp_path / "mate.log").read_text()
+    entries = [json.loads(line) for line in (tmp_path / "mate.jsonl").read_text().splitlines()]
+    assert [(e["ctx"], e["level"], e["msg"]) for e in entries] == [
+        ("hotkeys", "DEBUG", "registered"),
+        ("hotkeys", "INFO", "ready"),
+    ]
+    # Console keeps the configured INFO level
+    assert "registered" not in console.getvalue() and "ready" in console.getvalue()
+
+
+def test_rate_limit_suppresses_chatty_context_but_keeps_warnings(tmp_path):
+    pipeline, _console, handler = _pipeline(tmp_path, rate_limits={"win32_hotkeys": 5})
+    try:
+        chatty = logger.bind(context="win32_hotkeys")
+        for i in range(100):
+            chatty.debug(f"message {i}")
+        chatty.warning("still visible")
+        logger.bind(context="ui").debug("unlimited")
+    finally:
+        logger.remove(handler)
+        pipeline.close()
+    text = (tmp_path / "mate.log").read_text()
+    assert "still visible" in text and "unlimited" in text
+    assert pipeline.limiter.suppressed["win32_hotkeys"] >= 90
+    assert len(pipeline.recent) == pipeline.written
+
+
+def test_dump_recent_writes_ring(tmp_path):
+    pipeline, _console, handler = _pipeline(tmp_path, ring_size=3)
+    try:
+        for i in range(10):
+            logger.info(f"record {i}")
+    finally:
+        logger.remove(handler)
+        pipeline.close()
+    dumped = pipeline.dump_recent(tmp_path / "crash.log").read_text().splitlines()
+    assert [line.rsplit(" ", 1)[-1] for line in dumped] == ["7", "8", "9"]
+
+
+def test_context_logger_levels_resolve_per_context_and_change_at_runtime(tmp_path):
+    from mate.logging import get_logger, set_log_level, set_log_levels
+
+    pipeline, _console, handler = _pipeline(tmp_path)
+    hot = get_logger("test-hot")
+    assert get_logger("test-hot") is hot
+    try:
+        set_log_levels({"test-hot": "WARNING"})
+
+        class Exploding:
+            def __format__(self, spec):
+                raise AssertionError("disabled call formatted its arguments")
+
+        hot.debug("value={}", Exploding())
+        set_log_level("test-hot", "DEBUG")
+        hot.debug("value={}", 42)
+    finally:
+        set_log_levels({})
+        logger.remove(handler)
+        pipeline.close()
+    assert "test-hot | value=42" in (tmp_path / "mate.log").read_text()
+    assert pipeline.written == 1
@@ -0,0 +1,73 @@
+import json
+import time
+
+from mate.config import MateSettings, load_settings
+from mate.data.settings_store import SettingsStore
+
+
+def test_rapid_saves_coalesce_into_one_atomic_write(tmp_path):
+    path = tmp_path / "config" / "settings.json"
+    store = SettingsStore(path, delay=0.05)
+    settings = MateSettings()
+    for step in range(20):
+        settings.ui.opacity = round(0.5 + step * 0.01, 2)
+        store.save(settings)
+    deadline = time.monotonic() + 5
+    while store.writes == 0 and time.monotonic() < deadline:
+        time.sleep(0.01)
+    store.close()
+    assert store.requests == 20
+    assert store.writes == 1
+    assert json.loads(path.read_text()) == {"ui": {"opacity": 0.69}}
+    assert store.wrote(path)
+    assert not list(path.parent.glob(".*.tmp"))
+
+
+def test_load_settings_reads_file_under_env_overrides(tmp_path, monkeypatch):
+    monkeypatch.setenv("MATE_HOME", str(tmp_path))
+    monkeypatch.setenv("MATE_THEME", "light")
+    config = tmp_path / "config"
+    config.mkdir()
+    (config / "settings.json").write_text(json.dumps({"ui": {"opacity": 0.8, "theme": "dark"}}))
+    settings = load_settings(tmp_path / "missing.env", use_cache=False)
+    assert settings.ui.opacity == 0.8
+    assert settings.ui.theme == "light"
+
+
+def test_save_keeps_env_overrides_out_of_the_file(tmp_path, monkeypatch):
+    monkeypatch.setenv("MATE_HOME", str(tmp_path))
+    monkeypatch.setenv("MATE_THEME", "dark")
+    monkeypatch.setenv("MATE_START_URL", "https://example.test/")
+    path = tmp_path / "config" / "settings.json"
+    path.parent.mkdir()
+    path.write_text(json.dumps({"ui": {"theme": "light", "opacity": 0.8}}))
+    settings = load_settings(tmp_path / "missing.env", use_cache=False)
+    assert settings.ui.theme == "dark"
+    settings.ui.opacity = 0.7
+    store = SettingsStore(path, delay=0)
+    store.save(settings)
+    store.close()
+    assert json.loads(path.read_text()) == {"ui": {"opacity": 0.7, "theme": "light"}}
+
+
+def test_invalid_section_is_dropped_alone_and_the_file_is_not_overwritten(tmp_path, monkeypatch):
+    monkeypatch.setenv("MATE_HOME", str(tmp_path))
+    path = tmp_path / "config" / "settings.json"
+    path.parent.mkdir()
+    original = {
+        "ui": {"opacity": 0.9, "theme": "dark"},
+        "hotkeys": {"enabled": False},
+        "snippets": {"max_buffer": 5},  # below the allowed minimum
+    }
+    path.write_text(json.dumps(original))
+    settings = load_settings(tmp_path / "missing.env", use_cache=False)
+    assert (settings.ui.opacity, settings.ui.theme) == (0.9, "dark")
+    assert settings.hotkeys.enabled is False
+    assert settings.snippets == MateSettings().snippets
+
+    settings.ui.opacity = 0.6
+    store = SettingsStore(path, delay=0)
+    store.save(settings)
+    store.close()
+    assert json.loads(path.read_text()) == original
+    assert store.writes == 0
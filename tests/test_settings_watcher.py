@@ -0,0 +1,91 @@
+import threading
+
+from mate.services.settings_watcher import SettingsWatcher
+
+
+def test_env_edit_triggers_debounced_reload(tmp_path, monkeypatch):
+    monkeypatch.setenv("MATE_HOME", str(tmp_path / "mate-home"))
+    monkeypatch.delenv("MATE_THEME", raising=False)
+    env_file = tmp_path / ".env"
+    env_file.write_text("MATE_THEME=light\n")
+    config_dir = tmp_path / "config"
+    config_dir.mkdir()
+    seen = []
+    done = threading.Event()
+
+    def on_change(settings):
+        seen.append(settings.ui.theme)
+        done.set()
+
+    watcher = SettingsWatcher(config_dir, on_change, env_path=env_file, debounce=0.05)
+    watcher.start()
+    try:
+        for _ in range(3):
+            env_file.write_text("MATE_THEME=dark\n")
+        assert done.wait(5)
+    finally:
+        watcher.stop()
+        monkeypatch.delenv("MATE_THEME", raising=False)
+    assert seen == ["dark"]
+
+
+def test_invalid_edit_keeps_the_running_settings(tmp_path, monkeypatch):
+    import json
+
+    monkeypatch.setenv("MATE_HOME", str(tmp_path / "mate-home"))
+    config_dir = tmp_path / "mate-home" / "config"
+    config_dir.mkdir(parents=True)
+    settings_file = config_dir / "settings.json"
+    settings_file.write_text(json.dumps({"ui": {"theme": "dark"}}))
+    seen = []
+    watcher = SettingsWatcher(config_dir, seen.append, env_path=tmp_path / ".env")
+
+    settings_file.write_text(json.dumps({"ui": {"theme": "dark", "opacity": 7}}))
+    watcher.reload()
+    settings_file.write_text("{not json")
+    watcher.reload()
+    assert seen == [] and watcher.reloads == 0
+
+    settings_file.write_text(json.dumps({"ui": {"theme": "light"}}))
+    watcher.reload()
+    assert [settings.ui.theme for settings in seen] == ["light"]
+
+
+def test_own_saves_are_not_reloaded(tmp_path, monkeypatch):
+    import json
+    import time
+
+    from mate.config import MateSettings
+    from mate.data.settings_store import SettingsStore
+
+    monkeypatch.setenv("MATE_HOME", str(tmp_path / "mate-home"))
+    config_dir = tmp_path / "mate-home" / "config"
+    config_dir.mkdir(parents=True)
+    settings_file = config_dir / "settings.json"
+    store = SettingsStore(settings_file, delay=0.01)
+    seen = []
+    changed = threading.Event()
+
+    def on_change(settings):
+        seen.append(settings.ui.theme)
+        changed.set()
+
+    watcher = SettingsWatcher(
+        config_dir, on_change, env_path=tmp_path / ".env", debounce=0.05, ignore=store.wrote
+    )
+    watcher.start()
+    try:
+        settings = MateSettings()
+        for step in range(5):
+            settings.ui.opacity = round(0.5 + step * 0.1, 1)
+            store.save(settings)
+            store.flush()
+        time.sleep(0.3)  # several debounce windows
+        assert store.writes == 5 and seen == [] and watcher.reloads == 0
+
+        settings_file.write_text(json.dumps({"ui": {"theme": "dark"}}))  # a real edit
+        assert changed.wait(5)
+    finally:
+        watcher.stop()
+        store.close()
+    assert seen == ["dark"]
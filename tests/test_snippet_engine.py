@@ -0,0 +1,184 @@
+import threading
+import time
+
+from mate.config import SnippetSettings
+from mate.core.events import EventBus
+from mate.data.snippets import SnippetRepository
+from mate.services.foreground import AppIdentity
+from mate.services.input_pipeline import KeyEvent
+from mate.services.snippet_engine import SnippetEngine
+
+
+class BlockingInjector:
+    name = "typing"
+
+    def __init__(self):
+        self.release = threading.Event()
+        self.calls = []
+
+    def inject(self, erase, text):
+        self.release.wait(2.0)
+        self.calls.append((erase, text))
+
+
+def type_text(engine, text):
+    for char in text:
+        engine._handle_key(KeyEvent(char, "down"))
+
+
+def test_hook_hands_matches_to_worker_and_ignores_its_keystrokes():
+    settings = SnippetSettings(defaults=[{"trigger": "::sig", "replacement": "Regards"}])
+    engine = SnippetEngine(settings, EventBus())
+    injector = BlockingInjector()
+    engine.injection.injector = injector
+    used = []
+    engine.events.subscribe("snippet.used", used.append)
+
+    type_text(engine, "hi ::sig")
+    # The hook returned while the worker is still blocked in inject()
+    assert engine.stats.keys == 8 and not injector.calls
+    deadline = time.monotonic() + 2.0
+    while not engine._injecting and time.monotonic() < deadline:
+        time.sleep(0.001)
+    type_text(engine, "Regards")  # synthetic echo while injecting
+    injector.release.set()
+    assert engine.join()
+    assert injector.calls == [(5, "Regards")]
+    assert [s.trigger for s in used] == ["::sig"]
+    assert engine.stats.suppressed == 7 and engine.stats.matches == 1
+    assert engine.stats.hook_max_ns > 0 and engine.stats.wait_mean_ms >= 0
+    engine.stop()
+
+
+class EchoInjector:
+    """Types through the hook like keyboard.write, whose key events are reported back."""
+
+    name = "typing"
+
+    def __init__(self, engine):
+        self.engine = engine
+        self.calls = []
+
+    def inject(self, erase, text):
+        self.calls.append((erase, text))
+        type_text(self.engine, text)
+
+
+def test_replacement_containing_its_trigger_expands_once():
+    defaults = [{"trigger": "::sig", "replacement": "::sig -- Mate"}]
+    engine = SnippetEngine(SnippetSettings(defaults=defaults), EventBus())
+    injector = engine.injection.injector = EchoInjector(engine)
+
+    type_text(engine, "::sig")
+    assert engine.join()
+    assert injector.calls == [(5, "::sig -- Mate")]
+    assert engine.stats.matches == 1 and engine.stats.suppressed == len("::sig -- Mate")
+    engine.stop()
+
+
+def test_unrelated_keys_reset_and_history_resyncs_after_changes():
+    engine = SnippetEngine(SnippetSettings(defaults=[]), EventBus())
+    engine.register("::sx", "x")
+    type_text(engine, "ab::s")
+    assert engine.stats.rejected == 2 and engine._recent.text() == "::s"
+
+    # A trigger added mid-word still fires: the matcher is resynced from history
+    new = SnippetSettings(enabled=False, defaults=[{"trigger": "::sig", "replacement": "R"}])
+    engine.apply_settings(new)  # disabled, so no real keyboard hook is installed
+    type_text(engine, "i")
+    assert engine._matcher.state != 0
+    type_text(engine, " g")  # the space resets, so "g" cannot complete the trigger
+    assert engine._matcher.state == 0 and engine._recent.text() == "g"
+    assert engine.stats.matches == 0
+    engine.stop()
+
+
+def test_apply_settings_rebuilds_matchers_without_holding_the_hook_lock():
+    engine = SnippetEngine(SnippetSettings(defaults=[]), EventBus())
+    build = engine._build_matchers
+    lock_free = []
+
+    def take_lock():
+        if engine._lock.acquire(timeout=1):
+            lock_free.append(True)
+            engine._lock.release()
+
+    def probe(settings):
+        # The key handler's thread must be able to take the lock mid-rebuild
+        thread = threading.Thread(target=take_lock)
+        thread.start()
+        thread.join()
+        return build(settings)
+
+    engine._build_matchers = probe
+    settings = SnippetSettings(enabled=False, defaults=[{"trigger": "::a", "replacement": "A"}])
+    engine.apply_settings(settings)
+    assert lock_free == [True]
+    assert engine._matcher.get("::a").replacement == "A"
+
+
+def test_foreground_app_selects_scoped_matcher(tmp_path):
+    repo = SnippetRepository(tmp_path / "snippets.db")
+    repo.add_many([(";log", "print()", ""), (";log", "console.log()", "Code.exe")])
+    settings = SnippetSettings(defaults=[], excluded_apps=["WindowsTerminal.exe"])
+    engine = SnippetEngine(settings, EventBus(), repo)
+    engine.register(";todo", "TODO", scope="cascadia_hostingwindowclass")
+
+    def match(text):
+        hit = None
+        for char in text:
+            hit = engine._feed(char)
+        engine._reset_matchers()
+        return hit and hit[1]
+
+    assert match(";log").scope == "" and match(";todo") is None
+    assert len(engine._matchers["code.exe"]) == 1  # scopes hold only their own triggers
+    engine.foreground.update(AppIdentity("code.exe", "chrome_widgetwin_1"))
+    assert match(";log").scope == "code.exe"
+    engine.foreground.update(AppIdentity("pwsh.exe", "cascadia_hostingwindowclass"))
+    assert match(";todo").replacement is None and match(";log").scope == ""
+    engine.foreground.update(AppIdentity("windowsterminal.exe", "cascadia_hostingwindowclass"))
+    type_text(engine, ";log")
+    assert engine.stats.rejected == 4
+    repo.close()
+
+
+def test_templates_compile_on_registration_and_place_the_caret(monkeypatch):
+    moves = []
+    monkeypatch.setattr("mate.services.snippet_engine.move_caret_left", moves.append)
+    engine = SnippetEngine(SnippetSettings(defaults=[]), EventBus())
+    injector = BlockingInjector()
+    injector.release.set()
+    engine.injection.injector = injector
+    engine.register(";sig", "Mate")
+    engine.register(";p", "<p>{cursor}</p> -- {snippet:;sig}")
+    assert engine._matcher.get(";p").template is not None
+
+    type_text(engine, ";p")
+    assert engine.join()
+    assert injector.calls == [(2, "<p></p> -- Mate")] and moves == [12]
+    engine.stop()
+
+
+def test_nested_snippets_follow_updates_to_the_referenced_trigger():
+    settings = SnippetSettings(defaults=[], injection_grace_ms=0)
+    engine = SnippetEngine(settings, EventBus())
+    injector = BlockingInjector()
+    injector.release.set()
+    engine.injection.injector = injector
+    engine.update_snippets([(";sig", "Mate", ""), (";p", "-- {snippet:;sig}", "")])
+
+    type_text(engine, ";p")
+    assert engine.join()
+    engine.update_snippets([(";sig", "Mate team", "")])  # e.g. a pack edit
+    type_text(engine, ";p")
+    assert engine.join()
+    engine.update_snippets(removals=[(";sig", "")])
+    type_text(engine, ";p")
+    assert engine.join()
+    assert [text for _erase, text in injector.calls] == [
+        "-- Mate",
+        "-- Mate team",
+        "-- {snippet:;sig}",
+    ]
+    engine.stop()
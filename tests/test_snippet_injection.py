@@ -0,0 +1,52 @@
+from mate.config import SnippetSettings
+from mate.services.snippet_injection import (
+    AutoInjector,
+    ClipboardInjector,
+    InjectionRunner,
+    TypingInjector,
+    build_injector,
+)
+
+
+class Recorder:
+    def __init__(self, name):
+        self.name = name
+        self.calls = []
+
+    def inject(self, erase, text):
+        self.calls.append((erase, text))
+
+
+def test_auto_picks_strategy_by_length_and_records_stats_per_strategy():
+    short, long = Recorder("unicode"), Recorder("clipboard")
+    runner = InjectionRunner(AutoInjector(short, long, threshold=10))
+    assert runner.inject(5, "hi") == "unicode"
+    assert runner.inject(5, "x" * 2000) == "clipboard"
+    assert short.calls == [(5, "hi")] and long.calls == [(5, "x" * 2000)]
+    assert runner.stats["unicode"].count == 1
+    assert runner.stats["clipboard"].chars == 2000
+    assert runner.stats["clipboard"].mean_ms >= 0
+
+
+def test_build_injector_honours_settings():
+    assert isinstance(build_injector(SnippetSettings(injection="typing")), TypingInjector)
+    auto = build_injector(SnippetSettings(clipboard_threshold=50))
+    assert isinstance(auto, AutoInjector) and auto.threshold == 50
+    assert auto.long.name == "clipboard"
+
+
+def test_clipboard_injector_leaves_non_text_clipboard_alone(monkeypatch):
+    import keyboard
+    import pyperclip
+
+    clipboard = [""]  # what pyperclip reports for an image or file list
+    monkeypatch.setattr(pyperclip, "paste", lambda: clipboard[-1])
+    monkeypatch.setattr(pyperclip, "copy", clipboard.append)
+    monkeypatch.setattr(keyboard, "send", lambda keys: None)
+    injector = ClipboardInjector(settle=0)
+    injector.inject(3, "expanded")
+    assert clipboard == ["", "expanded"]
+
+    clipboard[:] = ["copied text"]
+    injector.inject(3, "expanded")
+    assert clipboard == ["copied text", "expanded", "copied text"]
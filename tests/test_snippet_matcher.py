@@ -0,0 +1,47 @@
+import pytest
+
+from mate.services.snippet_matcher import TriggerMatcher
+
+
+def _matches(matcher, text):
+    found = []
+    for index, char in enumerate(text):
+        hit = matcher.feed(char)
+        if hit:
+            found.append((index, hit[0]))
+    return found
+
+
+def test_overlapping_triggers_match_at_their_last_character():
+    matcher = TriggerMatcher("longest")
+    for trigger in ("he", "she", "hers", "his"):
+        matcher.add(trigger, trigger.upper())
+    assert _matches(matcher, "ushers his") == [(3, "she"), (5, "hers"), (9, "his")]
+
+
+@pytest.mark.parametrize(("rule", "expected"), [("first", "ig"), ("longest", "::sig")])
+def test_match_rule_breaks_ties_deterministically(rule, expected):
+    matcher = TriggerMatcher(rule)
+    matcher.add("ig", 1)
+    matcher.add("::sig", 2)
+    assert matcher.feed_text("x::sig")[0] == expected
+
+
+def test_add_and_remove_take_effect_between_keystrokes():
+    matcher = TriggerMatcher()
+    matcher.add("//mate", "Mate is alive")
+    assert matcher.feed_text("//ma") is None
+    matcher.add("ate", "late")
+    # Both end here; "first" keeps the earlier trigger
+    assert matcher.feed_text("te") == ("//mate", "Mate is alive")
+    assert matcher.remove("//mate") == "Mate is alive"
+    matcher.reset()
+    assert matcher.feed_text("//mate") == ("ate", "late")
+    assert "//mate" not in matcher and len(matcher) == 1
+
+
+def test_resync_restores_state_from_recent_text():
+    matcher = TriggerMatcher()
+    matcher.add("abc", 1)
+    matcher.resync("xxab")
+    assert matcher.feed("c") == ("abc", 1)
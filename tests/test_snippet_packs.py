@@ -0,0 +1,76 @@
+import json
+import time
+
+import pytest
+
+from mate.config import SnippetSettings
+from mate.core.events import EventBus
+from mate.services.snippet_engine import SnippetEngine
+from mate.services.snippet_packs import PackError, SnippetPackWatcher, load_pack
+
+
+def wait_for(condition, timeout=5.0):
+    deadline = time.monotonic() + timeout
+    while not condition():
+        assert time.monotonic() < deadline, "timed out"
+        time.sleep(0.005)
+
+
+def test_load_pack_formats(tmp_path):
+    toml = tmp_path / "code.toml"
+    toml.write_text('scope = "Code.exe"\n[snippets]\n";log" = "console.log()"\n')
+    assert load_pack(toml) == {("code.exe", ";log"): "console.log()"}
+    listed = tmp_path / "mail.json"
+    listed.write_text(json.dumps({"snippets": [{"trigger": ";hi", "replacement": "Hello"}]}))
+    assert load_pack(listed) == {("", ";hi"): "Hello"}
+    listed.write_text("{not json")
+    with pytest.raises(PackError):
+        load_pack(listed)
+
+
+def test_pack_edits_apply_as_deltas(tmp_path):
+    engine = SnippetEngine(
+        SnippetSettings(defaults=[{"trigger": ";hi", "replacement": "Hi"}]), EventBus()
+    )
+    pack = tmp_path / "mail.json"
+    pack.write_text(json.dumps({"snippets": {";hi": "Hello", ";bye": "Goodbye"}}))
+    watcher = SnippetPackWatcher(tmp_path, engine)
+    watcher.start()
+    try:
+        wait_for(lambda: engine._matcher.get(";bye") is not None)
+        assert engine._matcher.get(";hi").replacement == "Hello"
+
+        pack.write_text(json.dumps({"snippets": {";bye": "Cheers"}}))
+        wait_for(lambda: engine._matcher.get(";bye").replacement == "Cheers")
+        assert engine._matcher.get(";hi").replacement == "Hi"  # the default is back
+
+        pack.unlink()
+        wait_for(lambda: ";bye" not in engine._matcher)
+    finally:
+        watcher.stop()
+
+
+def test_renamed_and_removed_pack_directories(tmp_path):
+    import shutil
+
+    engine = SnippetEngine(SnippetSettings(defaults=[]), EventBus())
+    packs = tmp_path / "packs"
+    (packs / "work").mkdir(parents=True)
+    (packs / "work" / "mail.json").write_text(json.dumps({"snippets": {";bye": "Cheers"}}))
+    watcher = SnippetPackWatcher(packs, engine)
+    watcher.start()
+    try:
+        wait_for(lambda: ";bye" in engine._matcher)
+        (packs / "work").rename(packs / "office")
+        wait_for(lambda: any(p.parent.name == "office" for p in watcher._packs))
+        assert engine._matcher.get(";bye").replacement == "Cheers"
+
+        (packs / "office").rename(tmp_path / "archived")  # moved out of the watched tree
+        wait_for(lambda: ";bye" not in engine._matcher)
+
+        (tmp_path / "archived").rename(packs / "back")  # and in again
+        wait_for(lambda: ";bye" in engine._matcher)
+        shutil.rmtree(packs / "back")
+        wait_for(lambda: ";bye" not in engine._matcher and not watcher._packs)
+    finally:
+        watcher.stop()
@@ -0,0 +1,39 @@
+import sqlite3
+
+from mate.config import SnippetSettings
+from mate.core.events import EventBus
+from mate.data.snippets import SnippetRepository
+from mate.services.snippet_engine import SnippetEngine
+
+
+def test_repository_loads_triggers_without_bodies(tmp_path):
+    repo = SnippetRepository(tmp_path / "snippets.db", body_cache_size=1)
+    first, second = repo.add_many([("::a", "Alpha", ""), ("::b", "Beta", "code.exe")])
+    assert repo.add("::a", "Alpha v2") == first  # upsert keeps the id
+    assert [(r.trigger, r.scope) for r in repo.triggers()] == [("::a", ""), ("::b", "code.exe")]
+    assert [r.id for r in repo.triggers("code.exe")] == [second]
+
+    assert repo.body(first) == "Alpha v2"
+    assert repo.body(first) == "Alpha v2"
+    assert (repo.body_hits, repo.body_misses) == (1, 1)
+    repo.record_use(first)
+    assert repo.usage(first) == 1
+    assert repo.remove("::a") == first and repo.body(first) is None
+    repo.close()
+
+    with sqlite3.connect(tmp_path / "snippets.db") as connection:
+        assert connection.execute("PRAGMA journal_mode").fetchone()[0] == "wal"
+
+
+def test_registered_snippets_persist_across_engines(tmp_path):
+    settings = SnippetSettings(defaults=[])
+    repo = SnippetRepository(tmp_path / "snippets.db")
+    SnippetEngine(settings, EventBus(), repo).register("::sig", "Best regards")
+
+    engine = SnippetEngine(settings, EventBus(), repo)
+    hit = engine._matcher.feed_text("x::sig")
+    assert hit is not None
+    snippet = hit[1]
+    assert snippet.replacement is None
+    assert repo.body(snippet.snippet_id) == "Best regards"
+    repo.close()
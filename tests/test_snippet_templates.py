@@ -0,0 +1,71 @@
+import time
+
+from mate.services.snippet_templates import compile_template
+
+
+def test_static_text_and_escapes_render_precomputed():
+    template = compile_template("if (x) { y } {{date}} {unknown}")
+    assert template.static == "if (x) { y } {date} {unknown}"
+    assert template.render() == (template.static, 0)
+
+
+def test_cursor_and_nested_snippets():
+    bodies = {";name": "Mate", ";loop": "{snippet:;loop}!"}
+    calls = []
+
+    def resolve(trigger):
+        calls.append(trigger)
+        return bodies.get(trigger)
+
+    template = compile_template("Hi {snippet:;name}, ({cursor}) {snippet:;loop}", resolve)
+    assert template.static is None and not calls  # nested bodies resolve lazily
+    assert template.render() == ("Hi Mate, () {snippet:;loop}!", 18)
+    template.render()
+    assert calls == [";name", ";loop"]  # memoized for the session
+
+
+def test_expansion_is_memoized_until_a_date_field_changes(monkeypatch):
+    template = compile_template("{date:%Y-%m-%d}|{date}|{date:%H:%M}")
+    now = [time.mktime((2026, 10, 16, 23, 58, 30, 0, 0, -1))]
+    calls = []
+    real_strftime = time.strftime
+
+    def strftime(fmt, value):
+        calls.append(fmt)
+        return real_strftime(fmt, value)
+
+    monkeypatch.setattr(time, "time", lambda: now[0])
+    monkeypatch.setattr(time, "strftime", strftime)
+    assert template.render() == ("2026-10-16|2026-10-16|23:58", 0)
+    now[0] += 20
+    template.render()
+    assert len(calls) == 3  # still 23:58
+    now[0] += 100
+    assert template.render() == ("2026-10-17|2026-10-17|00:00", 0)
+
+
+def test_date_granularity_follows_the_finest_directive():
+    from mate.services.snippet_templates import _DatePart
+
+    assert _DatePart("%d.%m.%Y").fields == 3
+    assert _DatePart("%OH").fields == 4
+    assert _DatePart("%r").fields == 6
+    assert _DatePart("%Ec").fields == 6
+    assert _DatePart("%Y %Q").fields == 6  # unknown directives refresh every second
+
+
+def test_caret_counts_crlf_as_one_step():
+    assert compile_template("a{cursor}\r\nb\nc").render() == ("a\r\nb\nc", 4)
+    template = compile_template("{snippet:;x}{cursor}\r\n!", lambda trigger: "x")
+    assert template.render() == ("x\r\n!", 2)
+
+
+def test_forget_drops_nested_plans_for_changed_triggers():
+    bodies = {";a": "A{snippet:;b}", ";b": "B"}
+    template = compile_template("[{snippet:;a}]", bodies.get)
+    assert template.render()[0] == "[AB]"
+    bodies[";b"] = "b2"
+    assert template.render()[0] == "[AB]"  # memoized until told otherwise
+    assert not template.forget({";other"})
+    assert template.forget({";b"})  # reached through the nested ;a plan
+    assert template.render()[0] == "[Ab2]"
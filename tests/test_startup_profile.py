@@ -0,0 +1,43 @@
+import subprocess
+import sys
+from pathlib import Path
+
+from mate.utils.startup_profile import format_import_tree, parse_importtime
+
+SRC = Path(__file__).resolve().parents[1] / "src"
+
+IMPORTTIME = """\
+import time: self [us] | cumulative | imported package
+import time:       100 |        100 |     leaf
+import time:       200 |        300 |   child
+import time:      5000 |       5000 |   sibling
+import time:      1000 |       6300 | parent
+import time:        50 |         50 | other
+"""
+
+
+def test_parse_importtime_builds_tree():
+    roots = parse_importtime(IMPORTTIME)
+    assert [r.module for r in roots] == ["parent", "other"]
+    parent = roots[0]
+    assert (parent.self_us, parent.cumulative_us) == (1000, 6300)
+    assert [c.module for c in parent.children] == ["child", "sibling"]
+    assert parent.children[0].children[0].module == "leaf"
+    lines = format_import_tree(roots, min_ms=1.0)
+    assert [line.split()[-1] for line in lines] == ["parent", "sibling"]
+
+
+def test_cli_import_does_not_load_gui_modules():
+    code = (
+        "import sys, mate.cli; "
+        "print(sorted(m for m in ('PySide6', 'keyboard', 'mate.main', 'mate.core.app') "
+        "if m in sys.modules))"
+    )
+    result = subprocess.run(
+        [sys.executable, "-c", code],
+        capture_output=True,
+        text=True,
+        env={"PYTHONPATH": str(SRC), "PATH": ""},
+        check=True,
+    )
+    assert result.stdout.strip() == "[]"
@@ -0,0 +1,27 @@
+from mate.core.state import RuntimeState, UIState
+
+
+def test_ui_state_batches_writes_into_one_diff_per_flush():
+    scheduled = []
+    diffs = []
+    ui = UIState(opacity=0.5)
+    ui.set_scheduler(scheduled.append)
+    ui.subscribe(diffs.append)
+
+    for step in range(5):
+        ui.opacity = 0.55 + step * 0.05
+    ui.theme = "dark"
+    assert len(scheduled) == 1
+    assert diffs == []
+
+    scheduled[0]()
+    assert len(diffs) == 1
+    assert diffs[0].changes == {"opacity": (0.5, 0.75), "theme": ("light", "dark")}
+    assert (ui.version, ui.writes, ui.flushes) == (1, 6, 1)
+
+
+def test_reverted_writes_cancel_out():
+    ui = RuntimeState().ui
+    ui.view_mode = "browser"
+    ui.view_mode = "chatgpt"
+    assert ui.flush() is None
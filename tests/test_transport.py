@@ -0,0 +1,72 @@
+import threading
+import time
+
+from mate.core.events import EventBus
+from mate.core.transport import RemoteHub, connect_bus, read_connection_file
+
+
+def test_remote_link_forwards_marked_topics_both_ways(tmp_path):
+    main_bus = EventBus()
+    worker_bus = EventBus()
+    connection_file = tmp_path / "data" / "remote.json"
+    hub = RemoteHub(
+        main_bus,
+        ["audio.#"],
+        address=str(tmp_path / "events.sock"),
+        connection_file=connection_file,
+    )
+    assert connection_file.stat().st_mode & 0o777 == 0o600
+    address, authkey = read_connection_file(connection_file)
+    assert (address, authkey) == (hub.address, hub.authkey)
+    link = connect_bus(worker_bus, address, authkey, outbound=["caption.*"])
+
+    frames = []
+    captions = []
+    got_frame = threading.Event()
+    got_caption = threading.Event()
+    worker_bus.subscribe("audio.frame", lambda p: (frames.append(p), got_frame.set()))
+    main_bus.subscribe("caption.partial", lambda p: (captions.append(p), got_caption.set()))
+
+    frame = bytearray(b"\x01" * (256 * 1024))  # above the out-of-band threshold
+    deadline = time.monotonic() + 2.0
+    while not hub.links and time.monotonic() < deadline:
+        time.sleep(0.01)
+    main_bus.emit("audio.frame", frame)
+    main_bus.emit("ui.opacity", 0.5)  # not marked remote
+    assert got_frame.wait(2.0)
+    assert bytes(frames[0]) == bytes(frame)
+
+    worker_bus.emit("caption.partial", "hello")
+    assert got_caption.wait(2.0)
+    assert captions == ["hello"]
+    assert link.received == 1
+    deadline = time.monotonic() + 2.0
+    while hub.links[0].sent < 1 and time.monotonic() < deadline:
+        time.sleep(0.01)  # sent is counted on the link's sender thread
+    assert hub.links[0].sent == 1
+
+    link.close()
+    hub.close()
+    assert not connection_file.exists()
+
+
+def test_hub_drops_links_whose_worker_disconnected(tmp_path):
+    main_bus = EventBus()
+    hub = RemoteHub(main_bus, ["audio.#"], address=str(tmp_path / "events.sock"))
+    link = connect_bus(EventBus(), hub.address, hub.authkey, outbound=[])
+    deadline = time.monotonic() + 2.0
+    while not hub.links and time.monotonic() < deadline:
+        time.sleep(0.01)
+    (remote,) = hub.links
+
+    link.close()
+    deadline = time.monotonic() + 2.0
+    while hub.links and time.monotonic() < deadline:
+        time.sleep(0.01)
+    assert hub.links == []
+    remote._thread.join(2.0)
+    remote._sender.join(2.0)
+    assert not remote._thread.is_alive() and not remote._sender.is_alive()
+    main_bus.emit("audio.frame", b"x")  # no longer forwarded anywhere
+    assert remote._outgoing.empty()
+    hub.close()